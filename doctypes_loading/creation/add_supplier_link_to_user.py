@@ -12,6 +12,53 @@ Usage:
 
 import frappe
 
+SUPPLIER_LINK_FIELD = {
+    "doctype": "Custom Field",
+    "dt": "User",
+    "fieldname": "supplier_link",
+    "label": "Supplier Link",
+    "fieldtype": "Link",
+    "options": "Supplier",
+    "insert_after": "username",  # Place after username field
+    "allow_in_quick_entry": 0,
+    "bold": 0,
+    "collapsible": 0,
+    "columns": 0,
+    "default": None,
+    "depends_on": None,
+    "description": "Link to Supplier record for portal access control",
+    "fetch_from": None,
+    "fetch_if_empty": 0,
+    "hidden": 0,
+    "hide_border": 0,
+    "hide_days": 0,
+    "hide_seconds": 0,
+    "ignore_user_permissions": 0,
+    "ignore_xss_filter": 0,
+    "in_global_search": 0,
+    "in_list_view": 0,
+    "in_preview": 0,
+    "in_standard_filter": 1,  # Enable filtering by this field
+    "length": 0,
+    "mandatory_depends_on": None,
+    "no_copy": 0,
+    "non_negative": 0,
+    "permlevel": 0,
+    "precision": "",
+    "print_hide": 1,  # Hide from print
+    "print_hide_if_no_value": 0,
+    "print_width": None,
+    "read_only": 0,
+    "read_only_depends_on": None,
+    "report_hide": 0,
+    "reqd": 0,  # Not required for all users, only portal users
+    "search_index": 0,
+    "show_dashboard": 0,
+    "translatable": 0,
+    "unique": 0,
+    "width": None,
+}
+
 
 @frappe.whitelist()
 def add_supplier_link_custom_field():
@@ -25,8 +72,8 @@ def add_supplier_link_custom_field():
     frappe.init(site='development.localhost')
     frappe.connect()
 
-    field_name = "supplier_link"
-    doctype = "User"
+    field_name = SUPPLIER_LINK_FIELD["fieldname"]
+    doctype = SUPPLIER_LINK_FIELD["dt"]
 
     # Check if custom field already exists
     if frappe.db.exists("Custom Field", {"dt": doctype, "fieldname": field_name}):
@@ -41,47 +88,7 @@ def add_supplier_link_custom_field():
         })
 
     # Set field properties
-    custom_field.label = "Supplier Link"
-    custom_field.fieldtype = "Link"
-    custom_field.options = "Supplier"
-    custom_field.insert_after = "username"  # Place after username field
-    custom_field.allow_in_quick_entry = 0
-    custom_field.bold = 0
-    custom_field.collapsible = 0
-    custom_field.columns = 0
-    custom_field.default = None
-    custom_field.depends_on = None
-    custom_field.description = "Link to Supplier record for portal access control"
-    custom_field.fetch_from = None
-    custom_field.fetch_if_empty = 0
-    custom_field.hidden = 0
-    custom_field.hide_border = 0
-    custom_field.hide_days = 0
-    custom_field.hide_seconds = 0
-    custom_field.ignore_user_permissions = 0
-    custom_field.ignore_xss_filter = 0
-    custom_field.in_global_search = 0
-    custom_field.in_list_view = 0
-    custom_field.in_preview = 0
-    custom_field.in_standard_filter = 1  # Enable filtering by this field
-    custom_field.length = 0
-    custom_field.mandatory_depends_on = None
-    custom_field.no_copy = 0
-    custom_field.non_negative = 0
-    custom_field.permlevel = 0
-    custom_field.precision = ""
-    custom_field.print_hide = 1  # Hide from print
-    custom_field.print_hide_if_no_value = 0
-    custom_field.print_width = None
-    custom_field.read_only = 0
-    custom_field.read_only_depends_on = None
-    custom_field.report_hide = 0
-    custom_field.reqd = 0  # Not required for all users, only portal users
-    custom_field.search_index = 0
-    custom_field.show_dashboard = 0
-    custom_field.translatable = 0
-    custom_field.unique = 0
-    custom_field.width = None
+    custom_field.update(SUPPLIER_LINK_FIELD)
 
     # Save the custom field
     if frappe.db.exists("Custom Field", {"dt": doctype, "fieldname": field_name}):
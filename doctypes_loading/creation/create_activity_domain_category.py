@@ -1,5 +1,40 @@
+import copy
+
 import frappe
 
+ACTIVITY_DOMAIN_CATEGORY_DOCTYPE = {
+    "doctype": "DocType",
+    "name": "Activity Domain Category",
+    "module": "Siud",
+    "autoname": "field:category_code",
+    "naming_rule": "By fieldname",
+    "fields": [
+        {
+            "fieldname": "category_code",
+            "fieldtype": "Data",
+            "label": "קוד קטגוריה",
+            "reqd": 1,
+            "unique": 1
+        },
+        {
+            "fieldname": "category_name",
+            "fieldtype": "Data",
+            "label": "שם קטגוריה",
+            "reqd": 1
+        }
+    ],
+    "permissions": [
+        {
+            "role": "System Manager",
+            "read": 1,
+            "write": 1,
+            "create": 1,
+            "delete": 1
+        }
+    ]
+}
+
+
 @frappe.whitelist()
 def create_activity_domain_category_doctype():
     """Create Activity Domain Category (קטגוריות תחומי פעילות) DocType"""
@@ -7,37 +42,7 @@ def create_activity_domain_category_doctype():
         frappe.msgprint("Activity Domain Category DocType already exists")
         return
 
-    dt = frappe.get_doc({
-        "doctype": "DocType",
-        "name": "Activity Domain Category",
-        "module": "Siud",
-        "autoname": "field:category_code",
-        "naming_rule": "By fieldname",
-        "fields": [
-            {
-                "fieldname": "category_code",
-                "fieldtype": "Data",
-                "label": "קוד קטגוריה",
-                "reqd": 1,
-                "unique": 1
-            },
-            {
-                "fieldname": "category_name",
-                "fieldtype": "Data",
-                "label": "שם קטגוריה",
-                "reqd": 1
-            }
-        ],
-        "permissions": [
-            {
-                "role": "System Manager",
-                "read": 1,
-                "write": 1,
-                "create": 1,
-                "delete": 1
-            }
-        ]
-    })
+    dt = frappe.get_doc(copy.deepcopy(ACTIVITY_DOMAIN_CATEGORY_DOCTYPE))
     dt.insert(ignore_permissions=True)
     frappe.db.commit()
     frappe.clear_cache()
@@ -1,5 +1,26 @@
+import copy
+
 import frappe
 
+DELEGATED_SUPPLIER_SCOPE_DOCTYPE = {
+    "doctype": "DocType",
+    "name": "Delegated Supplier Scope",
+    "module": "Siud",
+    "istable": 1,
+    "editable_grid": 1,
+    "fields": [
+        {
+            "fieldname": "activity_domain_category",
+            "fieldtype": "Link",
+            "label": "קטגורית תחום פעילות",
+            "options": "Activity Domain Category",
+            "in_list_view": 1,
+            "reqd": 1
+        }
+    ]
+}
+
+
 @frappe.whitelist()
 def create_delegated_supplier_scope_child():
     """Create child table for Delegated Supplier Scope (היקף האצלה)"""
@@ -7,29 +28,103 @@ def create_delegated_supplier_scope_child():
         frappe.msgprint("Delegated Supplier Scope DocType already exists")
         return
 
-    dt = frappe.get_doc({
-        "doctype": "DocType",
-        "name": "Delegated Supplier Scope",
-        "module": "Siud",
-        "istable": 1,
-        "editable_grid": 1,
-        "fields": [
-            {
-                "fieldname": "activity_domain_category",
-                "fieldtype": "Link",
-                "label": "קטגורית תחום פעילות",
-                "options": "Activity Domain Category",
-                "in_list_view": 1,
-                "reqd": 1
-            }
-        ]
-    })
+    dt = frappe.get_doc(copy.deepcopy(DELEGATED_SUPPLIER_SCOPE_DOCTYPE))
     dt.insert(ignore_permissions=True)
     frappe.db.commit()
     frappe.clear_cache()
     frappe.msgprint("Delegated Supplier Scope child table created successfully")
 
 
+DELEGATED_SUPPLIER_DOCTYPE = {
+    "doctype": "DocType",
+    "name": "Delegated Supplier",
+    "module": "Siud",
+    "autoname": "format:DS-{#####}",
+    "fields": [
+        {
+            "fieldname": "delegating_supplier",
+            "fieldtype": "Link",
+            "label": "ספק מאציל",
+            "options": "Supplier",
+            "reqd": 1,
+            "in_list_view": 1,
+            "in_standard_filter": 1
+        },
+        {
+            "fieldname": "delegated_supplier",
+            "fieldtype": "Link",
+            "label": "ספק מואצל",
+            "options": "Supplier",
+            "reqd": 1,
+            "in_list_view": 1,
+            "in_standard_filter": 1
+        },
+        {
+            "fieldname": "delegation_status",
+            "fieldtype": "Select",
+            "label": "סטטוס האצלה",
+            "options": "פעיל\nמושהה\nבוטל",
+            "default": "פעיל",
+            "in_list_view": 1,
+            "in_standard_filter": 1
+        },
+        {
+            "fieldname": "dates_section",
+            "fieldtype": "Section Break",
+            "label": "תקופת תוקף"
+        },
+        {
+            "fieldname": "valid_from",
+            "fieldtype": "Date",
+            "label": "תקף מתאריך",
+            "reqd": 1
+        },
+        {
+            "fieldname": "column_break_dates",
+            "fieldtype": "Column Break"
+        },
+        {
+            "fieldname": "valid_until",
+            "fieldtype": "Date",
+            "label": "תקף עד תאריך",
+            "description": "השאר ריק להאצלה ללא הגבלת זמן"
+        },
+        {
+            "fieldname": "scope_section",
+            "fieldtype": "Section Break",
+            "label": "היקף האצלה"
+        },
+        {
+            "fieldname": "delegation_scope",
+            "fieldtype": "Table",
+            "label": "היקף האצלה",
+            "options": "Delegated Supplier Scope",
+            "description": "תחומי הפעילות שהספק המואצל מורשה לבצע"
+        },
+        {
+            "fieldname": "notes_section",
+            "fieldtype": "Section Break",
+            "label": "הערות"
+        },
+        {
+            "fieldname": "notes",
+            "fieldtype": "Text",
+            "label": "הערות",
+            "description": "הערות או תנאים נוספים להאצלה"
+        }
+    ],
+    "permissions": [
+        {
+            "role": "System Manager",
+            "read": 1,
+            "write": 1,
+            "create": 1,
+            "delete": 1
+        }
+    ]
+}
+
+
 @frappe.whitelist()
 def create_delegated_supplier_doctype():
     """Create Delegated Supplier (ספק מואצל) DocType"""
@@ -37,94 +132,7 @@ def create_delegated_supplier_doctype():
         frappe.msgprint("Delegated Supplier DocType already exists")
         return
 
-    dt = frappe.get_doc({
-        "doctype": "DocType",
-        "name": "Delegated Supplier",
-        "module": "Siud",
-        "autoname": "format:DS-{#####}",
-        "fields": [
-            {
-                "fieldname": "delegating_supplier",
-                "fieldtype": "Link",
-                "label": "ספק מאציל",
-                "options": "Supplier",
-                "reqd": 1,
-                "in_list_view": 1,
-                "in_standard_filter": 1
-            },
-            {
-                "fieldname": "delegated_supplier",
-                "fieldtype": "Link",
-                "label": "ספק מואצל",
-                "options": "Supplier",
-                "reqd": 1,
-                "in_list_view": 1,
-                "in_standard_filter": 1
-            },
-            {
-                "fieldname": "delegation_status",
-                "fieldtype": "Select",
-                "label": "סטטוס האצלה",
-                "options": "פעיל\nמושהה\nבוטל",
-                "default": "פעיל",
-                "in_list_view": 1,
-                "in_standard_filter": 1
-            },
-            {
-                "fieldname": "dates_section",
-                "fieldtype": "Section Break",
-                "label": "תקופת תוקף"
-            },
-            {
-                "fieldname": "valid_from",
-                "fieldtype": "Date",
-                "label": "תקף מתאריך",
-                "reqd": 1
-            },
-            {
-                "fieldname": "column_break_dates",
-                "fieldtype": "Column Break"
-            },
-            {
-                "fieldname": "valid_until",
-                "fieldtype": "Date",
-                "label": "תקף עד תאריך",
-                "description": "השאר ריק להאצלה ללא הגבלת זמן"
-            },
-            {
-                "fieldname": "scope_section",
-                "fieldtype": "Section Break",
-                "label": "היקף האצלה"
-            },
-            {
-                "fieldname": "delegation_scope",
-                "fieldtype": "Table",
-                "label": "היקף האצלה",
-                "options": "Delegated Supplier Scope",
-                "description": "תחומי הפעילות שהספק המואצל מורשה לבצע"
-            },
-            {
-                "fieldname": "notes_section",
-                "fieldtype": "Section Break",
-                "label": "הערות"
-            },
-            {
-                "fieldname": "notes",
-                "fieldtype": "Text",
-                "label": "הערות",
-                "description": "הערות או תנאים נוספים להאצלה"
-            }
-        ],
-        "permissions": [
-            {
-                "role": "System Manager",
-                "read": 1,
-                "write": 1,
-                "create": 1,
-                "delete": 1
-            }
-        ]
-    })
+    dt = frappe.get_doc(copy.deepcopy(DELEGATED_SUPPLIER_DOCTYPE))
     dt.insert(ignore_permissions=True)
     frappe.db.commit()
     frappe.clear_cache()
@@ -1,5 +1,47 @@
+import copy
+
 import frappe
 
+INQUIRY_TOPIC_CATEGORY_DOCTYPE = {
+    "doctype": "DocType",
+    "name": "Inquiry Topic Category",
+    "module": "Siud",
+    "autoname": "field:category_code",
+    "naming_rule": "By fieldname",
+    "is_tree": 1,
+    "fields": [
+        {
+            "fieldname": "category_code",
+            "fieldtype": "Data",
+            "label": "קוד קטגוריה",
+            "reqd": 1,
+            "unique": 1
+        },
+        {
+            "fieldname": "category_name",
+            "fieldtype": "Data",
+            "label": "שם קטגוריה",
+            "reqd": 1
+        },
+        {
+            "fieldname": "parent_category",
+            "fieldtype": "Link",
+            "label": "קטגוריית אב",
+            "options": "Inquiry Topic Category"
+        }
+    ],
+    "permissions": [
+        {
+            "role": "System Manager",
+            "read": 1,
+            "write": 1,
+            "create": 1,
+            "delete": 1
+        }
+    ]
+}
+
+
 @frappe.whitelist()
 def create_inquiry_topic_category_doctype():
     """Create Inquiry Topic Category (קטגוריות של נושאי פנייה) DocType
@@ -10,44 +52,7 @@ def create_inquiry_topic_category_doctype():
         frappe.msgprint("Inquiry Topic Category DocType already exists")
         return
 
-    dt = frappe.get_doc({
-        "doctype": "DocType",
-        "name": "Inquiry Topic Category",
-        "module": "Siud",
-        "autoname": "field:category_code",
-        "naming_rule": "By fieldname",
-        "is_tree": 1,
-        "fields": [
-            {
-                "fieldname": "category_code",
-                "fieldtype": "Data",
-                "label": "קוד קטגוריה",
-                "reqd": 1,
-                "unique": 1
-            },
-            {
-                "fieldname": "category_name",
-                "fieldtype": "Data",
-                "label": "שם קטגוריה",
-                "reqd": 1
-            },
-            {
-                "fieldname": "parent_category",
-                "fieldtype": "Link",
-                "label": "קטגוריית אב",
-                "options": "Inquiry Topic Category"
-            }
-        ],
-        "permissions": [
-            {
-                "role": "System Manager",
-                "read": 1,
-                "write": 1,
-                "create": 1,
-                "delete": 1
-            }
-        ]
-    })
+    dt = frappe.get_doc(copy.deepcopy(INQUIRY_TOPIC_CATEGORY_DOCTYPE))
     dt.insert(ignore_permissions=True)
     frappe.db.commit()
     frappe.clear_cache()
@@ -11,6 +11,13 @@ Usage:
 
 import frappe
 
+PORTAL_ROLE = {
+    "doctype": "Role",
+    "role_name": "Supplier Portal User",
+    "desk_access": 0,  # Critical: disable desk access
+    "disabled": 0,
+}
+
 
 @frappe.whitelist()
 def create_portal_roles():
@@ -23,7 +30,7 @@ def create_portal_roles():
     frappe.init(site='development.localhost')
     frappe.connect()
 
-    role_name = "Supplier Portal User"
+    role_name = PORTAL_ROLE["role_name"]
 
     # Check if role already exists
     if frappe.db.exists("Role", role_name):
@@ -37,8 +44,8 @@ def create_portal_roles():
         })
 
     # Set portal-specific properties
-    role.desk_access = 0  # Critical: disable desk access
-    role.disabled = 0
+    role.desk_access = PORTAL_ROLE["desk_access"]
+    role.disabled = PORTAL_ROLE["disabled"]
 
     # Save the role
     if frappe.db.exists("Role", role_name):
@@ -1,5 +1,40 @@
+import copy
+
 import frappe
 
+SUPPLIER_ROLE_DOCTYPE = {
+    "doctype": "DocType",
+    "name": "Supplier Role",
+    "module": "Siud",
+    "autoname": "field:role_name",
+    "naming_rule": "By fieldname",
+    "fields": [
+        {
+            "fieldname": "role_name",
+            "fieldtype": "Data",
+            "label": "שם תפקיד",
+            "reqd": 1,
+            "unique": 1
+        },
+        {
+            "fieldname": "role_title_he",
+            "fieldtype": "Data",
+            "label": "כותרת בעברית",
+            "reqd": 1
+        }
+    ],
+    "permissions": [
+        {
+            "role": "System Manager",
+            "read": 1,
+            "write": 1,
+            "create": 1,
+            "delete": 1
+        }
+    ]
+}
+
+
 @frappe.whitelist()
 def create_supplier_role_doctype():
     """Create Supplier Role (תפקיד ספק) DocType
@@ -10,37 +45,7 @@ def create_supplier_role_doctype():
         frappe.msgprint("Supplier Role DocType already exists")
         return
 
-    dt = frappe.get_doc({
-        "doctype": "DocType",
-        "name": "Supplier Role",
-        "module": "Siud",
-        "autoname": "field:role_name",
-        "naming_rule": "By fieldname",
-        "fields": [
-            {
-                "fieldname": "role_name",
-                "fieldtype": "Data",
-                "label": "שם תפקיד",
-                "reqd": 1,
-                "unique": 1
-            },
-            {
-                "fieldname": "role_title_he",
-                "fieldtype": "Data",
-                "label": "כותרת בעברית",
-                "reqd": 1
-            }
-        ],
-        "permissions": [
-            {
-                "role": "System Manager",
-                "read": 1,
-                "write": 1,
-                "create": 1,
-                "delete": 1
-            }
-        ]
-    })
+    dt = frappe.get_doc(copy.deepcopy(SUPPLIER_ROLE_DOCTYPE))
     dt.insert(ignore_permissions=True)
     frappe.db.commit()
     frappe.clear_cache()
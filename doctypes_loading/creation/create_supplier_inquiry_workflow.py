@@ -11,6 +11,8 @@ This script creates:
 import frappe
 from frappe import _
 
+from siud.siud.doctype.supplier_inquiry.inquiry_status import STATUSES, get_label
+
 
 @frappe.whitelist()
 def create_supplier_inquiry_doctype():
@@ -55,8 +57,8 @@ def create_supplier_inquiry_doctype():
                 'fieldname': 'inquiry_status',
                 'fieldtype': 'Select',
                 'label': 'סטטוס פנייה',
-                'options': '\nפנייה חדשה התקבלה\nמיון וניתוב\nבטיפול\nדורש השלמות / המתנה\nנסגר – ניתן מענה\nסגור',
-                'default': 'פנייה חדשה התקבלה',
+                'options': '\n' + '\n'.join(get_label(code) for code in STATUSES),
+                'default': get_label('new'),
                 'in_list_view': 1,
                 'in_standard_filter': 1,
                 'read_only': 1,
@@ -283,37 +285,37 @@ def create_supplier_inquiry_workflow():
         # Workflow States
         'states': [
             {
-                'state': 'פנייה חדשה התקבלה',
+                'state': get_label('new'),
                 'doc_status': '0',
                 'allow_edit': 'Service Provider User',
                 'message': 'הפנייה התקבלה ממתינה למיון',
             },
             {
-                'state': 'מיון וניתוב',
+                'state': get_label('triage'),
                 'doc_status': '0',
                 'allow_edit': 'Sorting Clerk',
                 'message': 'הפנייה בתהליך מיון והקצאה לגורם מטפל',
             },
             {
-                'state': 'בטיפול',
+                'state': get_label('in_progress'),
                 'doc_status': '0',
                 'allow_edit': 'Handling Clerk',
                 'message': 'הפנייה בטיפול פעיל',
             },
             {
-                'state': 'דורש השלמות / המתנה',
+                'state': get_label('pending'),
                 'doc_status': '0',
                 'allow_edit': 'Handling Clerk',
                 'message': 'הפנייה ממתינה למידע נוסף או תגובה חיצונית',
             },
             {
-                'state': 'נסגר – ניתן מענה',
+                'state': get_label('answered'),
                 'doc_status': '0',
                 'allow_edit': 'Handling Clerk',
                 'message': 'הפנייה נסגרה ונמסר מענה לספק',
             },
             {
-                'state': 'סגור',
+                'state': get_label('closed'),
                 'doc_status': '1',
                 'allow_edit': '',
                 'message': 'הפנייה בארכיון',
@@ -324,18 +326,18 @@ def create_supplier_inquiry_workflow():
         'transitions': [
             # From: פנייה חדשה התקבלה
             {
-                'state': 'פנייה חדשה התקבלה',
+                'state': get_label('new'),
                 'action': 'העבר למיון',
-                'next_state': 'מיון וניתוב',
+                'next_state': get_label('triage'),
                 'allowed': 'Sorting Clerk',
                 'allow_self_approval': 0,
             },
 
             # From: מיון וניתוב
             {
-                'state': 'מיון וניתוב',
+                'state': get_label('triage'),
                 'action': 'הקצה לטיפול',
-                'next_state': 'בטיפול',
+                'next_state': get_label('in_progress'),
                 'allowed': 'Sorting Clerk',
                 'allow_self_approval': 0,
                 'condition': 'doc.handling_clerk',
@@ -343,16 +345,16 @@ def create_supplier_inquiry_workflow():
 
             # From: בטיפול
             {
-                'state': 'בטיפול',
+                'state': get_label('in_progress'),
                 'action': 'דרוש השלמות',
-                'next_state': 'דורש השלמות / המתנה',
+                'next_state': get_label('pending'),
                 'allowed': 'Handling Clerk',
                 'allow_self_approval': 1,
             },
             {
-                'state': 'בטיפול',
+                'state': get_label('in_progress'),
                 'action': 'סגור עם מענה',
-                'next_state': 'נסגר – ניתן מענה',
+                'next_state': get_label('answered'),
                 'allowed': 'Handling Clerk',
                 'allow_self_approval': 1,
                 'condition': 'doc.response_text',
@@ -360,16 +362,16 @@ def create_supplier_inquiry_workflow():
 
             # From: דורש השלמות / המתנה
             {
-                'state': 'דורש השלמות / המתנה',
+                'state': get_label('pending'),
                 'action': 'חזור לטיפול',
-                'next_state': 'בטיפול',
+                'next_state': get_label('in_progress'),
                 'allowed': 'Handling Clerk',
                 'allow_self_approval': 1,
             },
             {
-                'state': 'דורש השלמות / המתנה',
+                'state': get_label('pending'),
                 'action': 'סגור עם מענה',
-                'next_state': 'נסגר – ניתן מענה',
+                'next_state': get_label('answered'),
                 'allowed': 'Handling Clerk',
                 'allow_self_approval': 1,
                 'condition': 'doc.response_text',
@@ -377,16 +379,16 @@ def create_supplier_inquiry_workflow():
 
             # From: נסגר – ניתן מענה
             {
-                'state': 'נסגר – ניתן מענה',
+                'state': get_label('answered'),
                 'action': 'העבר לארכיון',
-                'next_state': 'סגור',
+                'next_state': get_label('closed'),
                 'allowed': 'System Manager',
                 'allow_self_approval': 1,
             },
             {
-                'state': 'נסגר – ניתן מענה',
+                'state': get_label('answered'),
                 'action': 'פתח מחדש',
-                'next_state': 'בטיפול',
+                'next_state': get_label('in_progress'),
                 'allowed': 'Handling Clerk',
                 'allow_self_approval': 1,
             },
@@ -400,28 +402,29 @@ def create_supplier_inquiry_workflow():
     return {"success": True, "workflow": "Supplier Inquiry Workflow"}
 
 
+WORKFLOW_ROLES = [
+    {
+        'role_name': 'Service Provider User',
+        'desk_access': 0,  # Portal access only
+    },
+    {
+        'role_name': 'Sorting Clerk',
+        'desk_access': 1,
+    },
+    {
+        'role_name': 'Handling Clerk',
+        'desk_access': 1,
+    },
+]
+
+
 @frappe.whitelist()
 def create_required_roles():
     """Create roles required for the workflow"""
 
-    roles = [
-        {
-            'role_name': 'Service Provider User',
-            'desk_access': 0,  # Portal access only
-        },
-        {
-            'role_name': 'Sorting Clerk',
-            'desk_access': 1,
-        },
-        {
-            'role_name': 'Handling Clerk',
-            'desk_access': 1,
-        },
-    ]
-
     created_roles = []
 
-    for role_data in roles:
+    for role_data in WORKFLOW_ROLES:
         if not frappe.db.exists("Role", role_data['role_name']):
             role = frappe.get_doc({
                 'doctype': 'Role',
@@ -1,20 +1,26 @@
 """Create Workflow States and Actions for Supplier Inquiry Workflow"""
 import frappe
 
+from siud.siud.doctype.supplier_inquiry.inquiry_status import STATUSES, get_label
+
+WORKFLOW_STATES = [get_label(code) for code in STATUSES]
+
+WORKFLOW_ACTIONS = [
+    'העבר למיון',
+    'הקצה לטיפול',
+    'דרוש השלמות',
+    'סגור עם מענה',
+    'חזור לטיפול',
+    'העבר לארכיון',
+    'פתח מחדש'
+]
+
+
 @frappe.whitelist()
 def create_workflow_states():
     """Create all workflow states needed for Supplier Inquiry workflow"""
     
-    states = [
-        'פנייה חדשה התקבלה',
-        'מיון וניתוב', 
-        'בטיפול',
-        'דורש השלמות / המתנה',
-        'נסגר – ניתן מענה',
-        'סגור'
-    ]
-    
-    for state in states:
+    for state in WORKFLOW_STATES:
         if not frappe.db.exists('Workflow State', state):
             doc = frappe.get_doc({'doctype': 'Workflow State', 'workflow_state_name': state})
             doc.insert()
@@ -29,17 +35,7 @@ def create_workflow_states():
 def create_workflow_actions():
     """Create all workflow actions needed for Supplier Inquiry workflow"""
     
-    actions = [
-        'העבר למיון',
-        'הקצה לטיפול',
-        'דרוש השלמות',
-        'סגור עם מענה',
-        'חזור לטיפול',
-        'העבר לארכיון',
-        'פתח מחדש'
-    ]
-    
-    for action in actions:
+    for action in WORKFLOW_ACTIONS:
         if not frappe.db.exists('Workflow Action Master', action):
             doc = frappe.get_doc({'doctype': 'Workflow Action Master', 'workflow_action_name': action})
             doc.insert()
@@ -1,6 +1,110 @@
 """Create Supplier Inquiry Workflow - Fixed for Frappe v16"""
+import copy
+
 import frappe
 
+from siud.siud.doctype.supplier_inquiry.inquiry_status import get_label
+
+SUPPLIER_INQUIRY_WORKFLOW = {
+    'doctype': 'Workflow',
+    'workflow_name': 'Supplier Inquiry Workflow',
+    'document_type': 'Supplier Inquiry',
+    'is_active': 1,
+    'workflow_state_field': 'inquiry_status',
+    'send_email_alert': 0,
+    'states': [
+        {
+            'state': get_label('new'),
+            'doc_status': '0',
+            'allow_edit': 'System Manager',
+        },
+        {
+            'state': get_label('triage'),
+            'doc_status': '0',
+            'allow_edit': 'Sorting Clerk',
+        },
+        {
+            'state': get_label('in_progress'),
+            'doc_status': '0',
+            'allow_edit': 'Handling Clerk',
+        },
+        {
+            'state': get_label('pending'),
+            'doc_status': '0',
+            'allow_edit': 'Handling Clerk',
+        },
+        {
+            'state': get_label('answered'),
+            'doc_status': '0',
+            'allow_edit': 'Handling Clerk',
+        },
+        {
+            'state': get_label('closed'),
+            'doc_status': '0',
+            'allow_edit': 'System Manager',
+        },
+    ],
+    'transitions': [
+        {
+            'state': get_label('new'),
+            'action': 'העבר למיון',
+            'next_state': get_label('triage'),
+            'allowed': 'Sorting Clerk',
+            'allow_self_approval': 0,
+        },
+        {
+            'state': get_label('triage'),
+            'action': 'הקצה לטיפול',
+            'next_state': get_label('in_progress'),
+            'allowed': 'Sorting Clerk',
+            'allow_self_approval': 0,
+        },
+        {
+            'state': get_label('in_progress'),
+            'action': 'דרוש השלמות',
+            'next_state': get_label('pending'),
+            'allowed': 'Handling Clerk',
+            'allow_self_approval': 1,
+        },
+        {
+            'state': get_label('in_progress'),
+            'action': 'סגור עם מענה',
+            'next_state': get_label('answered'),
+            'allowed': 'Handling Clerk',
+            'allow_self_approval': 1,
+        },
+        {
+            'state': get_label('pending'),
+            'action': 'חזור לטיפול',
+            'next_state': get_label('in_progress'),
+            'allowed': 'Handling Clerk',
+            'allow_self_approval': 1,
+        },
+        {
+            'state': get_label('pending'),
+            'action': 'סגור עם מענה',
+            'next_state': get_label('answered'),
+            'allowed': 'Handling Clerk',
+            'allow_self_approval': 1,
+        },
+        {
+            'state': get_label('answered'),
+            'action': 'העבר לארכיון',
+            'next_state': get_label('closed'),
+            'allowed': 'System Manager',
+            'allow_self_approval': 1,
+        },
+        {
+            'state': get_label('answered'),
+            'action': 'פתח מחדש',
+            'next_state': get_label('in_progress'),
+            'allowed': 'Handling Clerk',
+            'allow_self_approval': 1,
+        },
+    ]
+}
+
+
 @frappe.whitelist()
 def create_workflow():
     """Create the workflow for Supplier Inquiry - Fixed for v16"""
@@ -9,104 +113,7 @@ def create_workflow():
         frappe.msgprint("⚠ Supplier Inquiry Workflow already exists. Skipping.")
         return {"success": False, "message": "Already exists"}
 
-    workflow = frappe.get_doc({
-        'doctype': 'Workflow',
-        'workflow_name': 'Supplier Inquiry Workflow',
-        'document_type': 'Supplier Inquiry',
-        'is_active': 1,
-        'workflow_state_field': 'inquiry_status',
-        'send_email_alert': 0,
-        'states': [
-            {
-                'state': 'פנייה חדשה התקבלה',
-                'doc_status': '0',
-                'allow_edit': 'System Manager',
-            },
-            {
-                'state': 'מיון וניתוב',
-                'doc_status': '0',
-                'allow_edit': 'Sorting Clerk',
-            },
-            {
-                'state': 'בטיפול',
-                'doc_status': '0',
-                'allow_edit': 'Handling Clerk',
-            },
-            {
-                'state': 'דורש השלמות / המתנה',
-                'doc_status': '0',
-                'allow_edit': 'Handling Clerk',
-            },
-            {
-                'state': 'נסגר – ניתן מענה',
-                'doc_status': '0',
-                'allow_edit': 'Handling Clerk',
-            },
-            {
-                'state': 'סגור',
-                'doc_status': '0',
-                'allow_edit': 'System Manager',
-            },
-        ],
-        'transitions': [
-            {
-                'state': 'פנייה חדשה התקבלה',
-                'action': 'העבר למיון',
-                'next_state': 'מיון וניתוב',
-                'allowed': 'Sorting Clerk',
-                'allow_self_approval': 0,
-            },
-            {
-                'state': 'מיון וניתוב',
-                'action': 'הקצה לטיפול',
-                'next_state': 'בטיפול',
-                'allowed': 'Sorting Clerk',
-                'allow_self_approval': 0,
-            },
-            {
-                'state': 'בטיפול',
-                'action': 'דרוש השלמות',
-                'next_state': 'דורש השלמות / המתנה',
-                'allowed': 'Handling Clerk',
-                'allow_self_approval': 1,
-            },
-            {
-                'state': 'בטיפול',
-                'action': 'סגור עם מענה',
-                'next_state': 'נסגר – ניתן מענה',
-                'allowed': 'Handling Clerk',
-                'allow_self_approval': 1,
-            },
-            {
-                'state': 'דורש השלמות / המתנה',
-                'action': 'חזור לטיפול',
-                'next_state': 'בטיפול',
-                'allowed': 'Handling Clerk',
-                'allow_self_approval': 1,
-            },
-            {
-                'state': 'דורש השלמות / המתנה',
-                'action': 'סגור עם מענה',
-                'next_state': 'נסגר – ניתן מענה',
-                'allowed': 'Handling Clerk',
-                'allow_self_approval': 1,
-            },
-            {
-                'state': 'נסגר – ניתן מענה',
-                'action': 'העבר לארכיון',
-                'next_state': 'סגור',
-                'allowed': 'System Manager',
-                'allow_self_approval': 1,
-            },
-            {
-                'state': 'נסגר – ניתן מענה',
-                'action': 'פתח מחדש',
-                'next_state': 'בטיפול',
-                'allowed': 'Handling Clerk',
-                'allow_self_approval': 1,
-            },
-        ]
-    })
+    workflow = frappe.get_doc(copy.deepcopy(SUPPLIER_INQUIRY_WORKFLOW))
 
     workflow.insert()
     frappe.db.commit()
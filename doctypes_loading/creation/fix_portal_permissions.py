@@ -4,8 +4,30 @@ Fix portal permissions by removing 'if_owner' flag
 The has_website_permission function provides proper security checking via supplier_link
 """
 
+import copy
+
 import frappe
 
+SUPPLIER_INQUIRY_PORTAL_PERMISSION = {
+    "doctype": "Custom DocPerm",
+    "parent": "Supplier Inquiry",
+    "parenttype": "DocType",
+    "parentfield": "permissions",
+    "role": "Supplier Portal User",
+    "permlevel": 0,
+    "read": 1,
+    "write": 1,
+    "create": 1,
+    "delete": 0,
+    "submit": 0,
+    "cancel": 0,
+    "amend": 0,
+    "email": 1,
+    "print": 1,
+    "if_owner": 0,  # Remove the if_owner restriction
+}
+
+
 def fix_portal_permissions():
     """Remove if_owner flag from Supplier Portal User permissions"""
 
@@ -27,24 +49,7 @@ def fix_portal_permissions():
         frappe.db.commit()
 
         # Add new permission without if_owner flag
-        perm = frappe.get_doc({
-            "doctype": "Custom DocPerm",
-            "parent": "Supplier Inquiry",
-            "parenttype": "DocType",
-            "parentfield": "permissions",
-            "role": "Supplier Portal User",
-            "permlevel": 0,
-            "read": 1,
-            "write": 1,
-            "create": 1,
-            "delete": 0,
-            "submit": 0,
-            "cancel": 0,
-            "amend": 0,
-            "email": 1,
-            "print": 1,
-            "if_owner": 0,  # Remove the if_owner restriction
-        })
+        perm = frappe.get_doc(copy.deepcopy(SUPPLIER_INQUIRY_PORTAL_PERMISSION))
 
         perm.insert()
         frappe.db.commit()
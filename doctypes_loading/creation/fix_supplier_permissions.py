@@ -3,8 +3,30 @@
 Fix Supplier DocType permissions by removing 'if_owner' flag
 """
 
+import copy
+
 import frappe
 
+SUPPLIER_PORTAL_PERMISSION = {
+    "doctype": "Custom DocPerm",
+    "parent": "Supplier",
+    "parenttype": "DocType",
+    "parentfield": "permissions",
+    "role": "Supplier Portal User",
+    "permlevel": 0,
+    "read": 1,
+    "write": 1,
+    "create": 0,
+    "delete": 0,
+    "submit": 0,
+    "cancel": 0,
+    "amend": 0,
+    "email": 0,
+    "print": 0,
+    "if_owner": 0,  # Remove the if_owner restriction
+}
+
+
 def fix_supplier_permissions():
     """Remove if_owner flag from Supplier Portal User permissions for Supplier DocType"""
 
@@ -26,24 +48,7 @@ def fix_supplier_permissions():
         frappe.db.commit()
 
         # Add new permission without if_owner flag
-        perm = frappe.get_doc({
-            "doctype": "Custom DocPerm",
-            "parent": "Supplier",
-            "parenttype": "DocType",
-            "parentfield": "permissions",
-            "role": "Supplier Portal User",
-            "permlevel": 0,
-            "read": 1,
-            "write": 1,
-            "create": 0,
-            "delete": 0,
-            "submit": 0,
-            "cancel": 0,
-            "amend": 0,
-            "email": 0,
-            "print": 0,
-            "if_owner": 0,  # Remove the if_owner restriction
-        })
+        perm = frappe.get_doc(copy.deepcopy(SUPPLIER_PORTAL_PERMISSION))
 
         perm.insert()
         frappe.db.commit()
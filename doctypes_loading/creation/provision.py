@@ -0,0 +1,214 @@
+"""
+Declarative Provisioning
+
+Applies every DocType, Role, Workflow, Custom Field, permission and Web Form
+spec defined by the creation scripts in one pass, in dependency order (the
+order create_all_entities.py uses for DocTypes, followed by what depends on
+them).
+
+Each spec's content hash (sha256 of its canonical JSON) is stored as a global
+default once applied; specs whose hash and target document are unchanged are
+skipped, so a no-change run on pod start does one read per spec and no writes.
+Caches are cleared once at the end, and only if something was applied.
+
+Modes:
+    create - insert if missing, never modify (DocTypes: once created, the app's
+             JSON files are the source of truth and `bench migrate` syncs them)
+    upsert - insert if missing, otherwise update the existing document in place
+
+Usage:
+    From host: ./run_doctype_script.sh creation.provision.provision
+    From container: bench --site development.localhost execute siud.doctypes_loading.creation.provision.provision
+    Force all specs: bench --site development.localhost execute siud.doctypes_loading.creation.provision.provision --kwargs "{'force': 1}"
+"""
+
+import copy
+import hashlib
+import json
+import time
+
+import frappe
+from frappe.utils import cint
+
+from .add_supplier_link_to_user import SUPPLIER_LINK_FIELD
+from .create_activity_domain_category import ACTIVITY_DOMAIN_CATEGORY_DOCTYPE
+from .create_contact_person import CONTACT_PERSON_DOCTYPE, CONTACT_PERSON_ROLE_DOCTYPE
+from .create_delegated_supplier import DELEGATED_SUPPLIER_DOCTYPE, DELEGATED_SUPPLIER_SCOPE_DOCTYPE
+from .create_inquiry_topic_category import INQUIRY_TOPIC_CATEGORY_DOCTYPE
+from .create_portal_roles import PORTAL_ROLE
+from .create_role import SUPPLIER_ROLE_DOCTYPE
+from .create_supplier import SUPPLIER_ACTIVITY_DOMAIN_DOCTYPE, SUPPLIER_DOCTYPE
+from .create_supplier_inquiry import SUPPLIER_INQUIRY_DOCTYPE
+from .create_supplier_inquiry_webform import SUPPLIER_INQUIRY_WEBFORM, WEBFORM_CLIENT_SCRIPT
+from .create_supplier_inquiry_workflow import WORKFLOW_ROLES
+from .create_workflow_states import WORKFLOW_ACTIONS, WORKFLOW_STATES
+from .create_workflow_v16 import SUPPLIER_INQUIRY_WORKFLOW
+from .fix_portal_permissions import SUPPLIER_INQUIRY_PORTAL_PERMISSION
+from .fix_supplier_permissions import SUPPLIER_PORTAL_PERMISSION
+
+HASH_PREFIX = "siud_provision|"
+
+
+def spec(doc, key, mode="upsert"):
+    """
+    Build a provisioning spec.
+
+    Args:
+        doc: The document dict to insert (or to update the existing document with)
+        key: Filters identifying the existing document
+        mode: "create" or "upsert"
+    """
+    return {
+        "id": HASH_PREFIX + doc["doctype"] + "|" + "|".join(str(value) for value in key.values()),
+        "doctype": doc["doctype"],
+        "key": key,
+        "doc": doc,
+        "mode": mode,
+    }
+
+
+def doctype_spec(doc):
+    return spec(doc, {"name": doc["name"]}, mode="create")
+
+
+def get_specs():
+    """All specs in dependency order."""
+    specs = [
+        # Independent masters, then child tables, then parents (see create_all_entities.py)
+        doctype_spec(SUPPLIER_ROLE_DOCTYPE),
+        doctype_spec(ACTIVITY_DOMAIN_CATEGORY_DOCTYPE),
+        doctype_spec(INQUIRY_TOPIC_CATEGORY_DOCTYPE),
+        doctype_spec(SUPPLIER_ACTIVITY_DOMAIN_DOCTYPE),
+        doctype_spec(CONTACT_PERSON_ROLE_DOCTYPE),
+        doctype_spec(SUPPLIER_DOCTYPE),
+        doctype_spec(CONTACT_PERSON_DOCTYPE),
+        doctype_spec(SUPPLIER_INQUIRY_DOCTYPE),
+        doctype_spec(DELEGATED_SUPPLIER_SCOPE_DOCTYPE),
+        doctype_spec(DELEGATED_SUPPLIER_DOCTYPE),
+    ]
+
+    # Roles (workflow roles are only created; the portal role's desk_access is enforced)
+    for role in WORKFLOW_ROLES:
+        specs.append(spec({"doctype": "Role", **role}, {"name": role["role_name"]}, mode="create"))
+    specs.append(spec(PORTAL_ROLE, {"name": PORTAL_ROLE["role_name"]}))
+
+    # Workflow (states and actions must exist before the workflow links to them)
+    for state in WORKFLOW_STATES:
+        specs.append(spec({"doctype": "Workflow State", "workflow_state_name": state}, {"name": state}, mode="create"))
+    for action in WORKFLOW_ACTIONS:
+        specs.append(spec({"doctype": "Workflow Action Master", "workflow_action_name": action}, {"name": action}, mode="create"))
+    specs.append(spec(SUPPLIER_INQUIRY_WORKFLOW, {"name": SUPPLIER_INQUIRY_WORKFLOW["workflow_name"]}))
+
+    # User.supplier_link and portal permissions
+    specs.append(spec(SUPPLIER_LINK_FIELD, {"dt": SUPPLIER_LINK_FIELD["dt"], "fieldname": SUPPLIER_LINK_FIELD["fieldname"]}))
+    for permission in (SUPPLIER_INQUIRY_PORTAL_PERMISSION, SUPPLIER_PORTAL_PERMISSION):
+        specs.append(spec(permission, {key: permission[key] for key in ("parent", "role", "permlevel")}))
+
+    # Portal web form and its client script
+    specs.append(spec(SUPPLIER_INQUIRY_WEBFORM, {"route": SUPPLIER_INQUIRY_WEBFORM["route"]}))
+    client_script_name = SUPPLIER_INQUIRY_WEBFORM["route"] + "-auto-populate"
+    specs.append(spec(
+        {
+            "doctype": "Client Script",
+            "name": client_script_name,
+            "dt": SUPPLIER_INQUIRY_WEBFORM["doc_type"],
+            "view": "Form",
+            "enabled": 1,
+            "script": WEBFORM_CLIENT_SCRIPT,
+        },
+        {"name": client_script_name},
+    ))
+
+    return specs
+
+
+def get_spec_hash(spec_def):
+    canonical = json.dumps([spec_def["mode"], spec_def["doc"]], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def get_stored_hashes():
+    """All stored spec hashes in one query."""
+    return dict(frappe.get_all(
+        "DefaultValue",
+        filters={"parent": "__global", "defkey": ["like", HASH_PREFIX + "%"]},
+        fields=["defkey", "defvalue"],
+        as_list=True,
+    ))
+
+
+def apply_spec(spec_def):
+    """
+    Insert or update the spec's document.
+
+    Returns:
+        str: "created", "updated" or "exists" (create-mode spec already present)
+    """
+    existing = frappe.db.get_value(spec_def["doctype"], spec_def["key"], "name")
+
+    if not existing:
+        frappe.get_doc(copy.deepcopy(spec_def["doc"])).insert(ignore_permissions=True)
+        return "created"
+
+    if spec_def["mode"] == "create":
+        return "exists"
+
+    doc = frappe.get_doc(spec_def["doctype"], existing)
+    values = copy.deepcopy(spec_def["doc"])
+    values.pop("name", None)
+    doc.update(values)
+    doc.save(ignore_permissions=True)
+    return "updated"
+
+
+@frappe.whitelist()
+def provision(force=False, dry_run=False):
+    """
+    Apply all changed specs.
+
+    Args:
+        force: Apply every spec regardless of its stored hash
+        dry_run: Only report which specs would be applied
+
+    Returns:
+        dict: {"success": bool, "applied": [...], "skipped": int, "duration": float}
+    """
+    start = time.monotonic()
+    force = cint(force)
+    dry_run = cint(dry_run)
+    stored_hashes = {} if force else get_stored_hashes()
+
+    applied = []
+    skipped = 0
+
+    for spec_def in get_specs():
+        spec_hash = get_spec_hash(spec_def)
+        if stored_hashes.get(spec_def["id"]) == spec_hash and frappe.db.exists(spec_def["doctype"], spec_def["key"]):
+            skipped += 1
+            continue
+
+        if dry_run:
+            applied.append({"spec": spec_def["id"], "result": "pending"})
+            print(f"• Would apply {spec_def['id']}")
+            continue
+
+        try:
+            result = apply_spec(spec_def)
+            frappe.db.set_global(spec_def["id"], spec_hash)
+            frappe.db.commit()
+        except Exception:
+            frappe.db.rollback()
+            frappe.log_error(frappe.get_traceback(), f"Provisioning failed: {spec_def['id']}")
+            print(f"✗ Failed to apply {spec_def['id']}")
+            raise
+
+        applied.append({"spec": spec_def["id"], "result": result})
+        print(f"✓ {spec_def['id']}: {result}")
+
+    if applied and not dry_run:
+        frappe.clear_cache()
+
+    duration = round(time.monotonic() - start, 2)
+    print(f"\nProvisioning {'dry run ' if dry_run else ''}complete: {len(applied)} applied, {skipped} unchanged ({duration}s)")
+
+    return {"success": True, "applied": applied, "skipped": skipped, "duration": duration}
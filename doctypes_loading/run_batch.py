@@ -0,0 +1,173 @@
+"""
+Batch Runner for doctypes_loading Scripts
+
+Runs many doctypes_loading functions in one process, so the site init, imports
+and DB connect are paid once instead of once per `bench execute`.
+
+Steps are dotted paths relative to siud.doctypes_loading (or absolute siud.*
+paths). A step that is a list runs its entries concurrently, each in its own
+thread with its own site init and DB connection; declare only independent
+scripts that way.
+
+Usage:
+    # A named plan (see PLANS)
+    bench --site development.localhost execute siud.doctypes_loading.run_batch.run --kwargs "{'plan': 'provision'}"
+
+    # Explicit steps: provision, then two read-only checks in parallel
+    bench --site development.localhost execute siud.doctypes_loading.run_batch.run \\
+        --kwargs "{'steps': ['creation.provision.provision', ['temp.check_workflow.check', 'creation.verify_all.verify']]}"
+
+    # Every argument-less function starting with 'check' in temp/, in parallel
+    bench --site development.localhost execute siud.doctypes_loading.run_batch.run \\
+        --kwargs "{'directory': 'temp', 'prefix': 'check', 'parallel': 1}"
+
+If any step fails the summary is printed and the run raises, so `bench
+execute` exits non-zero (the k8s init job relies on that).
+"""
+
+import importlib
+import inspect
+import pkgutil
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+import frappe
+from frappe.utils import cint
+
+PACKAGE = "siud.doctypes_loading"
+
+PLANS = {
+    # Pod start / init job: everything needed for a working site
+    "provision": ["creation.provision.provision"],
+    # Read-only diagnostics, independent of each other
+    "verify": [["creation.verify_all.verify", "temp.check_workflow.check", "temp.verify_workflow.verify"]],
+}
+
+
+def resolve(path):
+    return path if path.startswith("siud.") else f"{PACKAGE}.{path}"
+
+
+def discover(directory, prefix=""):
+    """
+    List the public, argument-less functions defined in a doctypes_loading directory.
+
+    Args:
+        directory: Sub-package, e.g. "temp" or "creation"
+        prefix: Only functions whose name starts with this
+
+    Returns:
+        list: Dotted paths, sorted by module and function name
+    """
+    package = importlib.import_module(resolve(directory))
+    paths = []
+    for module_info in sorted(pkgutil.iter_modules(package.__path__), key=lambda info: info.name):
+        module = importlib.import_module(f"{package.__name__}.{module_info.name}")
+        for name, fn in inspect.getmembers(module, inspect.isfunction):
+            if fn.__module__ != module.__name__ or name.startswith("_") or not name.startswith(prefix):
+                continue
+            if any(param.default is param.empty for param in inspect.signature(fn).parameters.values()):
+                continue
+            paths.append(f"{module.__name__}.{name}")
+    return paths
+
+
+@frappe.whitelist()
+def run(steps=None, plan=None, directory=None, prefix="", parallel=False, workers=4, stop_on_error=True):
+    """
+    Run a list of doctypes_loading functions in this process.
+
+    Args:
+        steps: List of paths; a nested list is run concurrently
+        plan: Name of a plan in PLANS (instead of steps)
+        directory: Run all argument-less functions of this directory (instead of steps)
+        prefix: With directory, only functions starting with this
+        parallel: With directory, run the discovered functions concurrently
+        workers: Max threads per concurrent step
+        stop_on_error: Do not start further steps after a failure
+
+    Returns:
+        dict: {"success": bool, "results": [{"step", "status", "duration", "error"}], "duration": float}
+    """
+    start = time.monotonic()
+
+    if plan:
+        steps = PLANS[plan]
+    elif directory:
+        found = discover(directory, prefix)
+        steps = [found] if cint(parallel) else found
+    else:
+        steps = frappe.parse_json(steps) if isinstance(steps, str) else steps
+
+    if not steps:
+        frappe.throw("Nothing to run: pass steps, plan or directory")
+
+    results = []
+    for step in steps:
+        if isinstance(step, (list, tuple)):
+            results.extend(run_concurrently(step, cint(workers)))
+        else:
+            results.append(run_step(step))
+
+        if cint(stop_on_error) and any(result["status"] == "failed" for result in results):
+            break
+
+    duration = round(time.monotonic() - start, 2)
+    print_summary(results, duration)
+
+    failed = [result["step"] for result in results if result["status"] == "failed"]
+    if failed:
+        frappe.throw(f"Batch run failed: {', '.join(failed)}")
+
+    return {"success": True, "results": results, "duration": duration}
+
+
+def run_step(path):
+    """Run one function in the current site context and commit its work."""
+    start = time.monotonic()
+    status, error = "ok", None
+    try:
+        result = frappe.get_attr(resolve(path))()
+        frappe.db.commit()
+        # Several scripts catch their own errors and report them in the result
+        if isinstance(result, dict) and result.get("success") is False:
+            status, error = "failed", result.get("error") or result.get("message")
+    except Exception:
+        frappe.db.rollback()
+        status, error = "failed", traceback.format_exc()
+
+    return {"step": path, "status": status, "duration": round(time.monotonic() - start, 2), "error": error}
+
+
+def run_concurrently(paths, workers):
+    """Run independent steps in threads, each with its own site init and connection."""
+    site = frappe.local.site
+    sites_path = frappe.local.sites_path
+
+    def run_in_thread(path):
+        frappe.init(site=site, sites_path=sites_path)
+        try:
+            frappe.connect()
+            return run_step(path)
+        finally:
+            frappe.destroy()
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(paths))), thread_name_prefix="siud-batch") as pool:
+        return list(pool.map(run_in_thread, paths))
+
+
+def print_summary(results, duration):
+    width = max([len(result["step"]) for result in results] + [4])
+    print("\n" + "=" * (width + 20))
+    print(f"{'Step':<{width}}  {'Status':<8}  {'Time':>6}")
+    print("-" * (width + 20))
+    for result in results:
+        mark = "✓" if result["status"] == "ok" else "✗"
+        print(f"{result['step']:<{width}}  {mark} {result['status']:<6}  {result['duration']:>5}s")
+    print("=" * (width + 20))
+
+    failed = [result for result in results if result["status"] == "failed"]
+    print(f"{len(results) - len(failed)} succeeded, {len(failed)} failed, {duration}s total")
+    for result in failed:
+        print(f"\n✗ {result['step']}:\n{result['error']}")
@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+"""
+Parallel Streaming Restore of bench Backups
+
+Restores a `bench backup --with-files` set (database .sql.gz plus public and
+private file tarballs) much faster than `bench restore`:
+
+- The .sql.gz is decompressed as a stream (nothing is written to disk) and split
+  per table on the mariadb-dump section headers.
+- Tables are loaded in parallel, one `mariadb` client process per table, up to
+  --jobs at a time. The reader never waits for a table to finish loading; it
+  only blocks when --buffer-mb of parsed SQL is queued and not yet consumed.
+- Secondary indexes (KEY / UNIQUE KEY / FULLTEXT KEY) are removed from each
+  CREATE TABLE and added with one ALTER TABLE after the table's data is loaded.
+- The file tarballs are extracted concurrently with the database load.
+- Per-table and overall throughput is reported at the end.
+
+Standard library only; needs the `mariadb` (or `mysql`) client on PATH.
+
+Usage:
+    # Credentials from the target site's config (db user = db name, as bench creates it)
+    python3 scripts/parallel_restore.py \\
+        v16_migration_backup/db_backup/20260115_145837-siud_local-database.sql.gz \\
+        --site-config /home/frappe/frappe-bench/sites/siud.local/site_config.json \\
+        --sites-path /home/frappe/frappe-bench/sites --site siud.local --jobs 8
+
+    # Explicit credentials (password from MYSQL_PWD)
+    MYSQL_PWD=... python3 scripts/parallel_restore.py dump.sql.gz --host mariadb --user root --database _c4f1248614b841ff
+
+    # Parse only: list tables, sizes and deferred indexes
+    python3 scripts/parallel_restore.py dump.sql.gz --dry-run
+
+The file tarballs are found next to the dump (<prefix>-files.tar and
+<prefix>-private-files.tar) unless --files / --private-files are given.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import queue
+import re
+import shutil
+import subprocess
+import sys
+import tarfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+SECTION_HEADER = re.compile(
+    rb"^-- (Table structure for table|Sequence structure for|Temporary view structure for view"
+    rb"|Final view structure for view|Dumping routines|Dumping events)\b(?: `(.*)`)?"
+)
+INDEX_DEFINITION = re.compile(rb"^\s+(?:UNIQUE |FULLTEXT |SPATIAL )?KEY ")
+BLOCK_SIZE = 1024 * 1024
+MB = 1024 * 1024
+
+
+# =============================================================================
+# Memory Budget
+# =============================================================================
+
+
+class MemoryBudget:
+    """Bounds the parsed-but-not-yet-loaded SQL held in memory."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.used = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, size):
+        with self._condition:
+            # A single block larger than the budget is let through when nothing else is queued
+            while self.used and self.used + size > self.limit:
+                self._condition.wait()
+            self.used += size
+
+    def release(self, size):
+        with self._condition:
+            self.used -= size
+            self._condition.notify_all()
+
+
+# =============================================================================
+# Table Jobs
+# =============================================================================
+
+
+class TableJob:
+    """One table's SQL, streamed from the reader to a loader thread in blocks."""
+
+    def __init__(self, name):
+        self.name = name
+        self.blocks = queue.Queue()
+        self.buffer = []
+        self.buffered = 0
+        self.sql_bytes = 0
+        self.deferred_indexes = []
+        self.create_lines = None
+        self.duration = 0.0
+        self.error = None
+
+
+def defer_secondary_indexes(create_lines):
+    """
+    Split a CREATE TABLE statement into the statement without secondary indexes
+    and the index definitions to add after the data load.
+
+    Args:
+        create_lines: The statement's lines (bytes), header to ") ENGINE=...;"
+
+    Returns:
+        tuple: (create statement bytes, [index definition bytes])
+    """
+    if len(create_lines) < 3:
+        return b"".join(create_lines), []
+
+    header, body, footer = create_lines[0], create_lines[1:-1], create_lines[-1]
+    kept, deferred = [], []
+    for line in body:
+        definition = line.rstrip().rstrip(b",")
+        if INDEX_DEFINITION.match(line):
+            deferred.append(definition.strip())
+        else:
+            kept.append(definition)
+
+    return header + b",\n".join(kept) + b"\n" + footer, deferred
+
+
+def build_alter(table, index_definitions):
+    additions = b", ".join(b"ADD " + definition for definition in index_definitions)
+    return b"ALTER TABLE `" + table + b"` " + additions + b";\n"
+
+
+# =============================================================================
+# Restore
+# =============================================================================
+
+
+class Restore:
+    def __init__(self, args):
+        self.args = args
+        self.client = build_client_command(args)
+        self.env = dict(os.environ, MYSQL_PWD=args.password) if args.password else dict(os.environ)
+        self.budget = MemoryBudget(args.buffer_mb * MB)
+        self.preamble = []
+        self.sequences = []
+        self.trailing_sections = []
+        self.jobs = []
+        self.pool = ThreadPoolExecutor(max_workers=args.jobs, thread_name_prefix="restore")
+        self.futures = []
+        self.failed = threading.Event()
+        self.compressed_bytes = 0
+        self.sql_bytes = 0
+
+    # -------------------------------------------------------------------------
+    # Reader
+    # -------------------------------------------------------------------------
+
+    def run(self):
+        """Stream the dump, dispatching each table to the loader pool."""
+        section, job = None, None
+        with open(self.args.dump, "rb") as raw, gzip.GzipFile(fileobj=raw) as dump:
+            for line in dump:
+                self.sql_bytes += len(line)
+                if self.failed.is_set():
+                    break
+
+                header = SECTION_HEADER.match(line) if line.startswith(b"-- ") else None
+                if header:
+                    self.finish_table(job)
+                    job = None
+                    kind = header.group(1)
+                    if kind == b"Table structure for table":
+                        self.run_sequences()
+                        section = "table"
+                        job = self.start_table(header.group(2))
+                    elif kind == b"Sequence structure for":
+                        section = "sequence"
+                        self.sequences.append(line)
+                    else:
+                        # Views, routines and events depend on the tables: run them last
+                        section = "trailing"
+                        self.trailing_sections.append(line)
+                    continue
+
+                if section is None:
+                    self.preamble.append(line)
+                elif section == "sequence":
+                    self.sequences.append(line)
+                elif section == "trailing":
+                    self.trailing_sections.append(line)
+                else:
+                    self.table_line(job, line)
+
+            self.finish_table(job)
+            self.compressed_bytes = raw.tell()
+
+        self.run_sequences()
+        self.pool.shutdown(wait=True)
+        for future in self.futures:
+            future.result()
+
+        if self.trailing_sections and not self.failed.is_set():
+            self.run_statements(b"".join(self.trailing_sections), "views/routines/events")
+
+        return not self.failed.is_set()
+
+    def start_table(self, name):
+        job = TableJob(name)
+        self.jobs.append(job)
+        if not self.args.dry_run:
+            self.futures.append(self.pool.submit(self.load_table, job))
+        return job
+
+    def table_line(self, job, line):
+        if job.create_lines is not None:
+            job.create_lines.append(line)
+            if line.rstrip().endswith(b";"):
+                create, job.deferred_indexes = defer_secondary_indexes(job.create_lines)
+                job.create_lines = None
+                self.emit(job, create)
+            return
+
+        if line.startswith(b"CREATE TABLE"):
+            job.create_lines = [line]
+            if line.rstrip().endswith(b";"):
+                job.create_lines = None
+                self.emit(job, line)
+            return
+
+        self.emit(job, line)
+
+    def emit(self, job, data):
+        job.sql_bytes += len(data)
+        if self.args.dry_run:
+            return
+        job.buffer.append(data)
+        job.buffered += len(data)
+        if job.buffered >= BLOCK_SIZE:
+            self.flush(job)
+
+    def flush(self, job):
+        if not job.buffer:
+            return
+        block = b"".join(job.buffer)
+        job.buffer, job.buffered = [], 0
+        self.budget.acquire(len(block))
+        job.blocks.put(block)
+
+    def finish_table(self, job):
+        if job is None:
+            return
+        if self.args.dry_run:
+            print(f"  {job.name.decode()}: {job.sql_bytes / MB:.1f} MB, {len(job.deferred_indexes)} deferred indexes")
+            return
+        self.flush(job)
+        job.blocks.put(None)
+
+    # -------------------------------------------------------------------------
+    # Loaders
+    # -------------------------------------------------------------------------
+
+    def load_table(self, job):
+        """Loader thread: pipe one table into its own client session."""
+        start = time.monotonic()
+        process = subprocess.Popen(
+            self.client, stdin=subprocess.PIPE, stderr=subprocess.PIPE, env=self.env
+        )
+        try:
+            process.stdin.write(b"".join(self.preamble))
+            while True:
+                block = job.blocks.get()
+                if block is None:
+                    break
+                self.budget.release(len(block))
+                if not self.failed.is_set():
+                    process.stdin.write(block)
+
+            if job.deferred_indexes and not self.failed.is_set():
+                process.stdin.write(build_alter(job.name, job.deferred_indexes))
+            process.stdin.close()
+        except BrokenPipeError:
+            # The client exited early; its stderr explains why
+            self.drain(job)
+
+        stderr = process.stderr.read().decode(errors="replace")
+        returncode = process.wait()
+        job.duration = time.monotonic() - start
+
+        if returncode != 0:
+            job.error = stderr.strip() or f"client exited with {returncode}"
+            self.failed.set()
+            print(f"✗ {job.name.decode()}: {job.error}", file=sys.stderr)
+        elif self.args.verbose:
+            print(f"✓ {job.name.decode()} ({job.sql_bytes / MB:.1f} MB, {job.duration:.1f}s)")
+
+    def drain(self, job):
+        """Release the budget held by a failed table's remaining blocks."""
+        self.failed.set()
+        while True:
+            block = job.blocks.get()
+            if block is None:
+                return
+            self.budget.release(len(block))
+
+    def run_sequences(self):
+        if self.sequences and not self.args.dry_run:
+            self.run_statements(b"".join(self.sequences), "sequences")
+        self.sequences = []
+
+    def run_statements(self, sql, label):
+        """Run SQL synchronously in one session (sequences before tables, views after)."""
+        result = subprocess.run(
+            self.client, input=b"".join(self.preamble) + sql, stderr=subprocess.PIPE, env=self.env
+        )
+        if result.returncode != 0:
+            self.failed.set()
+            print(f"✗ {label}: {result.stderr.decode(errors='replace').strip()}", file=sys.stderr)
+
+
+# =============================================================================
+# Files
+# =============================================================================
+
+
+def extract_tarball(path, sites_path, site=None):
+    """
+    Extract a bench files tarball (members are ./<site>/public|private/files/...).
+
+    Args:
+        path: The tarball
+        sites_path: The bench sites directory
+        site: Restore into this site directory instead of the one in the backup
+
+    Returns:
+        tuple: (files extracted, bytes, seconds)
+    """
+    start = time.monotonic()
+    count = size = 0
+    with tarfile.open(path, "r:*") as tar:
+        for member in tar:
+            if site:
+                parts = member.name.lstrip("./").split("/", 1)
+                member.name = "/".join([site, *parts[1:]])
+            if hasattr(tarfile, "data_filter"):
+                tar.extract(member, sites_path, filter="data")
+            else:
+                target = os.path.realpath(os.path.join(sites_path, member.name))
+                if not target.startswith(os.path.realpath(sites_path) + os.sep):
+                    raise ValueError(f"Refusing to extract outside {sites_path}: {member.name}")
+                tar.extract(member, sites_path)
+            if member.isfile():
+                count += 1
+                size += member.size
+    return count, size, time.monotonic() - start
+
+
+def find_tarballs(args):
+    prefix = args.dump[: -len("-database.sql.gz")] if args.dump.endswith("-database.sql.gz") else None
+    tarballs = []
+    for given, suffix in ((args.files, "-files.tar"), (args.private_files, "-private-files.tar")):
+        path = given or (prefix and prefix + suffix)
+        if path and os.path.exists(path):
+            tarballs.append(path)
+    return tarballs
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+
+def build_client_command(args):
+    client = shutil.which("mariadb") or shutil.which("mysql") or "mariadb"
+    return [
+        client,
+        f"--host={args.host}",
+        f"--port={args.port}",
+        f"--user={args.user}",
+        "--default-character-set=utf8mb4",
+        "--max-allowed-packet=1G",
+        args.database,
+    ]
+
+
+def load_site_config(args):
+    """Fill missing connection options from site_config.json (and common_site_config.json)."""
+    if not args.site_config:
+        return
+    with open(args.site_config) as f:
+        config = json.load(f)
+    common_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(args.site_config))), "common_site_config.json")
+    if os.path.exists(common_path):
+        with open(common_path) as f:
+            config = {**json.load(f), **config}
+
+    args.database = args.database or config.get("db_name")
+    args.user = args.user or config.get("db_user") or config.get("db_name")
+    args.password = args.password or config.get("db_password")
+    args.host = args.host or config.get("db_host")
+    args.port = args.port or config.get("db_port")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Parallel streaming restore of a bench backup")
+    parser.add_argument("dump", help="The *-database.sql.gz file")
+    parser.add_argument("--site-config", help="Target site_config.json to read credentials from")
+    parser.add_argument("--host")
+    parser.add_argument("--port", type=int)
+    parser.add_argument("--user")
+    parser.add_argument("--database")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 4, help="Tables loaded in parallel")
+    parser.add_argument("--buffer-mb", type=int, default=512, help="Max parsed SQL queued in memory")
+    parser.add_argument("--files", help="Public files tarball")
+    parser.add_argument("--private-files", help="Private files tarball")
+    parser.add_argument("--sites-path", help="Bench sites directory to extract files into")
+    parser.add_argument("--site", help="Extract files into this site (default: the backup's site)")
+    parser.add_argument("--dry-run", action="store_true", help="Only parse and list tables")
+    parser.add_argument("--verbose", action="store_true", help="Print each table as it finishes")
+    args = parser.parse_args(argv)
+
+    args.password = os.environ.get("MYSQL_PWD")
+    load_site_config(args)
+    args.host = args.host or "localhost"
+    args.port = args.port or 3306
+    args.user = args.user or "root"
+    if not args.dry_run and not args.database:
+        parser.error("--database (or --site-config) is required")
+    return args
+
+
+def print_report(restore, tarball_results, elapsed):
+    loaded = [job for job in restore.jobs if job.error is None]
+    print("\n" + "=" * 70)
+    if restore.args.dry_run:
+        print(f"Tables: {len(restore.jobs)} parsed (dry run)")
+    else:
+        print(f"Tables: {len(loaded)}/{len(restore.jobs)} loaded with --jobs {restore.args.jobs}")
+    print(
+        f"SQL:    {restore.compressed_bytes / MB:.1f} MB compressed, {restore.sql_bytes / MB:.1f} MB uncompressed"
+        f" -> {restore.sql_bytes / MB / max(elapsed, 0.001):.1f} MB/s"
+    )
+    for path, (count, size, seconds) in tarball_results.items():
+        print(f"Files:  {os.path.basename(path)}: {count} files, {size / MB:.1f} MB in {seconds:.1f}s")
+    print(f"Total:  {elapsed:.1f}s")
+
+    slowest = sorted(restore.jobs, key=lambda job: job.duration, reverse=True)[:10]
+    if slowest and slowest[0].duration:
+        print("\nSlowest tables:")
+        for job in slowest:
+            rate = job.sql_bytes / MB / max(job.duration, 0.001)
+            print(f"  {job.name.decode():<50} {job.sql_bytes / MB:>8.1f} MB {job.duration:>7.1f}s {rate:>7.1f} MB/s")
+    print("=" * 70)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    start = time.monotonic()
+
+    tarballs = [] if args.dry_run or not args.sites_path else find_tarballs(args)
+    with ThreadPoolExecutor(max_workers=max(1, len(tarballs)), thread_name_prefix="files") as file_pool:
+        file_futures = {path: file_pool.submit(extract_tarball, path, args.sites_path, args.site) for path in tarballs}
+
+        restore = Restore(args)
+        ok = restore.run()
+        tarball_results = {path: future.result() for path, future in file_futures.items()}
+
+    print_report(restore, tarball_results, time.monotonic() - start)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
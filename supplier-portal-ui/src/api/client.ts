@@ -71,6 +71,15 @@ export async function callSupplierPortal<T>(
   return call<T>(`siud.api.supplier_portal.${method}`, args)
 }
 
+/**
+ * URL of a supplier portal API method, for links the browser opens itself
+ * (e.g. file downloads; uses the session cookie)
+ */
+export function getSupplierPortalUrl(method: string, params: Record<string, string> = {}): string {
+  const query = new URLSearchParams(params).toString()
+  return `${API_URL}/api/method/siud.api.supplier_portal.${method}${query ? `?${query}` : ''}`
+}
+
 /**
  * Get a list of documents
  */
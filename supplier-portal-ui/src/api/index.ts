@@ -6,6 +6,7 @@
 export {
   call,
   callSupplierPortal,
+  getSupplierPortalUrl,
   getList,
   getDoc,
   createDoc,
@@ -2,7 +2,7 @@
  * Inquiry API
  */
 
-import { callSupplierPortal, uploadFile } from './client'
+import { callSupplierPortal, getSupplierPortalUrl, uploadFile } from './client'
 import type { SupplierInquiry, FrappeListResponse } from '@/types'
 
 export interface InquiryStats {
@@ -12,6 +12,19 @@ export interface InquiryStats {
   by_status: Record<string, number>
 }
 
+export interface FacetCount {
+  value: string
+  label?: string
+  count: number
+}
+
+export interface InquiryFacets {
+  total: number
+  status: FacetCount[]
+  topic_category: FacetCount[]
+  month: FacetCount[]
+}
+
 export interface GetInquiriesParams {
   page?: number
   page_size?: number
@@ -19,8 +32,16 @@ export interface GetInquiriesParams {
   date_from?: string
   date_to?: string
   order_by?: string
+  topic_category?: string
+  /** 1 to include archived (long closed) inquiries */
+  include_archived?: 0 | 1
 }
 
+export type InquiryFilterParams = Pick<
+  GetInquiriesParams,
+  'status' | 'date_from' | 'date_to' | 'topic_category' | 'include_archived'
+>
+
 export interface CreateInquiryParams {
   topic_category: string
   description: string
@@ -47,6 +68,14 @@ export async function getInquiryStats(): Promise<InquiryStats> {
   return callSupplierPortal<InquiryStats>('get_inquiry_stats')
 }
 
+/**
+ * Get filter option counts for the current supplier's inquiries.
+ * Each facet applies the other active filters but not its own.
+ */
+export async function getInquiryFacets(params: InquiryFilterParams = {}): Promise<InquiryFacets> {
+  return callSupplierPortal<InquiryFacets>('get_inquiry_facets', params)
+}
+
 /**
  * Get paginated list of inquiries for current supplier
  */
@@ -78,6 +107,14 @@ export async function attachFileToInquiry(inquiryName: string, fileUrl: string):
   })
 }
 
+/**
+ * Download URL of an inquiry attachment (File name); the file is checked
+ * against the current supplier and served by nginx
+ */
+export function getAttachmentUrl(fileName: string): string {
+  return getSupplierPortalUrl('download_attachment', { name: fileName })
+}
+
 /**
  * Upload a file and attach it to an inquiry
  */
@@ -32,3 +32,29 @@ export interface ReferenceData {
 export async function getReferenceData(): Promise<ReferenceData> {
   return callSupplierPortal<ReferenceData>('get_reference_data')
 }
+
+export interface TopicNode {
+  name: string
+  category_code: string
+  category_name: string
+  has_children: boolean
+}
+
+export interface TopicSearchResult extends TopicNode {
+  /** Ancestor topic names, from the root */
+  path: string[]
+}
+
+/**
+ * Get one level of the topic tree (top level when parent is omitted)
+ */
+export async function getTopicChildren(parent?: string): Promise<TopicNode[]> {
+  return callSupplierPortal<TopicNode[]>('get_topic_children', { parent })
+}
+
+/**
+ * Prefix search over topic names and codes
+ */
+export async function searchTopics(query: string, limit: number = 20): Promise<TopicSearchResult[]> {
+  return callSupplierPortal<TopicSearchResult[]>('search_topics', { query, limit })
+}
@@ -3,7 +3,16 @@
  */
 
 import { callSupplierPortal } from './client'
-import type { SupplierActivityDomain, ContactPerson } from '@/types'
+import type { SupplierActivityDomain, ContactPerson, ContactPersonRole } from '@/types'
+
+export interface ProfileActivityDomain extends Pick<SupplierActivityDomain, 'activity_domain_category'> {
+  category_name: string
+}
+
+export interface ProfileContactPerson
+  extends Pick<ContactPerson, 'name' | 'contact_name' | 'supplier_link' | 'email' | 'mobile_phone' | 'branch' | 'primary_role_type'> {
+  assigned_roles: (Pick<ContactPersonRole, 'role'> & { role_title_he: string })[]
+}
 
 export interface SupplierProfile {
   name: string
@@ -12,8 +21,9 @@ export interface SupplierProfile {
   phone?: string
   email?: string
   address?: string
-  activity_domains: SupplierActivityDomain[]
-  contact_persons?: ContactPerson[]
+  modified: string
+  activity_domains: ProfileActivityDomain[]
+  contact_persons: ProfileContactPerson[]
 }
 
 export interface UpdateSupplierProfileParams {
@@ -23,6 +33,11 @@ export interface UpdateSupplierProfileParams {
   address?: string
 }
 
+export interface PatchResult {
+  changed: string[]
+  modified: string
+}
+
 export interface UpdateResult {
   success: boolean
   message: string
@@ -41,3 +56,33 @@ export async function getSupplierProfile(): Promise<SupplierProfile> {
 export async function updateSupplierProfile(params: UpdateSupplierProfileParams): Promise<UpdateResult> {
   return callSupplierPortal<UpdateResult>('update_supplier_profile', params)
 }
+
+/**
+ * Write only the given profile fields; rejected if the profile was modified
+ * after `modified` (the value returned by getSupplierProfile)
+ */
+export async function patchSupplierProfile(
+  changes: UpdateSupplierProfileParams,
+  modified: string
+): Promise<PatchResult> {
+  return callSupplierPortal<PatchResult>('patch_profile', { changes, modified })
+}
+
+export interface ContactPersonChanges {
+  create?: (Omit<ProfileContactPerson, 'name' | 'supplier_link' | 'assigned_roles'> & { assigned_roles?: string[] })[]
+  update?: (Partial<Omit<ProfileContactPerson, 'supplier_link' | 'assigned_roles'>> & { name: string; assigned_roles?: string[] })[]
+  delete?: string[]
+}
+
+export interface ContactPersonSyncResult {
+  created: string[]
+  updated: string[]
+  deleted: string[]
+}
+
+/**
+ * Create, update and delete contact persons in one transaction (all or nothing)
+ */
+export async function syncContactPersons(changes: ContactPersonChanges): Promise<ContactPersonSyncResult> {
+  return callSupplierPortal<ContactPersonSyncResult>('sync_contacts', changes)
+}
@@ -1 +1,2 @@
 export { default as InquiryTable } from './InquiryTable.vue'
+export { default as TopicPicker } from './TopicPicker.vue'
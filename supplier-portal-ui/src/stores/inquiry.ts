@@ -8,10 +8,13 @@ import { ref, computed } from 'vue'
 import {
   getInquiryStats,
   getInquiries,
+  getInquiryFacets,
   getInquiry,
   createInquiry,
   uploadAndAttachFile,
   type InquiryStats,
+  type InquiryFacets,
+  type InquiryFilterParams,
   type GetInquiriesParams,
   type CreateInquiryParams,
 } from '@/api/inquiry'
@@ -38,6 +41,10 @@ export const useInquiryStore = defineStore('inquiry', () => {
   })
   const filters = ref<GetInquiriesParams>({})
 
+  // State - Filter facets (counts per filter option)
+  const facets = ref<InquiryFacets | null>(null)
+  const facetsLoading = ref(false)
+
   // State - Current inquiry (detail view)
   const currentInquiry = ref<SupplierInquiry | null>(null)
   const detailLoading = ref(false)
@@ -104,6 +111,22 @@ export const useInquiryStore = defineStore('inquiry', () => {
     }
   }
 
+  /**
+   * Fetch filter option counts for the given filters
+   */
+  async function fetchFacets(params: InquiryFilterParams = {}): Promise<void> {
+    facetsLoading.value = true
+
+    try {
+      facets.value = await getInquiryFacets(params)
+    } catch (e) {
+      console.error('Failed to fetch inquiry facets:', e)
+      facets.value = null
+    } finally {
+      facetsLoading.value = false
+    }
+  }
+
   /**
    * Load more inquiries (next page)
    */
@@ -219,6 +242,8 @@ export const useInquiryStore = defineStore('inquiry', () => {
     listError,
     pagination,
     filters,
+    facets,
+    facetsLoading,
 
     // State - Detail
     currentInquiry,
@@ -239,6 +264,7 @@ export const useInquiryStore = defineStore('inquiry', () => {
 
     // Actions - List
     fetchInquiries,
+    fetchFacets,
     loadNextPage,
     goToPage,
     resetList,
@@ -8,13 +8,15 @@ This module contains whitelisted API methods for external access.
 """
 
 from siud.api.supplier_portal import (
-    get_current_user,
-    get_supplier_profile,
-    update_supplier_profile,
-    get_inquiry_stats,
-    get_inquiries,
-    get_inquiry,
-    create_inquiry,
-    get_reference_data,
-    attach_file_to_inquiry,
+	attach_file_to_inquiry,
+	create_inquiry,
+	download_attachment,
+	get_current_user,
+	get_inquiries,
+	get_inquiry,
+	get_inquiry_facets,
+	get_inquiry_stats,
+	get_reference_data,
+	get_supplier_profile,
+	update_supplier_profile,
 )
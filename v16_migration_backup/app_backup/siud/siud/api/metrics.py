@@ -0,0 +1,190 @@
+# Copyright (c) 2025, Tzvi and contributors
+# For license information, please see license.txt
+
+"""
+Metrics Exporter
+
+Prometheus scrape endpoint for the siud app:
+
+	GET /api/method/siud.api.metrics.prometheus
+	Authorization: Bearer <siud_metrics_token from site_config.json>
+
+Request latency, cache and job metrics are aggregated by siud.utils.metrics
+across all backend pods and workers; RQ queue depth and database statistics
+are read at scrape time.
+
+The site is resolved from the Host header, so the endpoint cannot be scraped
+by pod IP; in k8s the static job in k8s/prometheus-scrape.yaml scrapes it
+through nginx, which sets the site's Host, with the bearer token.
+"""
+
+import hmac
+from collections import defaultdict
+
+import frappe
+from frappe import _
+
+from siud.utils.metrics import METRICS, get_aggregated_series
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# MariaDB status variables exported as siud_db_<name lowercased>
+DB_STATUS_GAUGES = ("Threads_connected", "Threads_running", "Threads_cached", "Max_used_connections")
+DB_STATUS_COUNTERS = (
+	"Questions",
+	"Slow_queries",
+	"Connections",
+	"Aborted_connects",
+	"Innodb_row_lock_waits",
+	"Innodb_row_lock_time",
+)
+
+
+@frappe.whitelist(allow_guest=True, methods=["GET"])
+def prometheus():
+	"""
+	Render all siud metrics in the Prometheus text exposition format.
+
+	Requires either the configured bearer token or a System Manager session.
+	"""
+	validate_scrape_access()
+
+	lines = []
+	render_aggregated(lines)
+	render_queues(lines)
+	render_database(lines)
+
+	frappe.response["type"] = "download"
+	frappe.response["filename"] = "metrics.txt"
+	frappe.response["filecontent"] = "\n".join(lines) + "\n"
+	frappe.response["content_type"] = CONTENT_TYPE
+	frappe.response["display_content_as"] = "inline"
+
+
+def validate_scrape_access():
+	token = frappe.conf.get("siud_metrics_token")
+	auth_header = frappe.get_request_header("Authorization") or ""
+	if token and auth_header.startswith("Bearer "):
+		if hmac.compare_digest(auth_header[len("Bearer ") :].strip(), token):
+			return
+
+	if frappe.session.user != "Guest" and "System Manager" in frappe.get_roles():
+		return
+
+	frappe.throw(_("Not permitted to read metrics"), frappe.PermissionError)
+
+
+# =============================================================================
+# Renderers
+# =============================================================================
+
+
+def render_aggregated(lines):
+	"""Render the counters and histograms flushed to Redis by all processes."""
+	grouped = defaultdict(list)
+	for series, value in get_aggregated_series().items():
+		name, _sep, labels = series.partition("\t")
+		grouped[_base_name(name)].append((name, labels, value))
+
+	for base_name, (metric_type, help_text, buckets) in METRICS.items():
+		samples = grouped.get(base_name)
+		if not samples:
+			continue
+
+		lines.append(f"# HELP {base_name} {help_text}")
+		lines.append(f"# TYPE {base_name} {metric_type}")
+		if metric_type == "histogram":
+			lines.extend(_render_histogram(base_name, samples, buckets))
+		else:
+			lines.extend(_sample(name, labels, value) for name, labels, value in sorted(samples))
+
+
+def _render_histogram(base_name, samples, buckets):
+	"""Buckets are stored non-cumulatively; Prometheus expects cumulative `le` counts."""
+	bucket_counts = defaultdict(dict)
+	rendered = []
+	for name, labels, value in sorted(samples):
+		if name.endswith("_bucket"):
+			label_list = labels.split(",")
+			le = next(label for label in label_list if label.startswith("le="))
+			series_labels = ",".join(label for label in label_list if label != le)
+			bucket_counts[series_labels][le[4:-1]] = value
+		else:
+			rendered.append(_sample(name, labels, value))
+
+	for series_labels, counts in sorted(bucket_counts.items()):
+		cumulative = 0
+		for bound in [*(str(bucket) for bucket in buckets), "+Inf"]:
+			cumulative += counts.get(bound, 0)
+			labels = f'{series_labels},le="{bound}"' if series_labels else f'le="{bound}"'
+			rendered.append(_sample(f"{base_name}_bucket", labels, cumulative))
+
+	return rendered
+
+
+def render_queues(lines):
+	"""RQ queue depth, running and failed job counts per queue."""
+	from frappe.utils.background_jobs import get_queue, get_queue_list
+	from rq.registry import FailedJobRegistry, StartedJobRegistry
+
+	depth, started, failed = [], [], []
+	for queue_type in get_queue_list():
+		queue = get_queue(queue_type)
+		labels = f'queue="{queue_type}"'
+		depth.append(_sample("siud_rq_queue_depth", labels, queue.count))
+		started.append(_sample("siud_rq_jobs_started", labels, StartedJobRegistry(queue=queue).count))
+		failed.append(_sample("siud_rq_jobs_failed", labels, FailedJobRegistry(queue=queue).count))
+
+	lines.extend(_gauge("siud_rq_queue_depth", "Jobs waiting in the RQ queue", depth))
+	lines.extend(_gauge("siud_rq_jobs_started", "Jobs currently executing", started))
+	lines.extend(_gauge("siud_rq_jobs_failed", "Jobs in the failed job registry", failed))
+
+
+def render_database(lines):
+	"""Connection and query statistics from MariaDB global status."""
+	names = DB_STATUS_GAUGES + DB_STATUS_COUNTERS
+	status = dict(
+		frappe.db.sql(
+			f"show global status where Variable_name in ({', '.join(['%s'] * len(names))})",
+			names,
+		)
+	)
+	max_connections = frappe.db.sql("select @@max_connections")[0][0]
+
+	lines.extend(
+		_gauge(
+			"siud_db_max_connections",
+			"Configured max_connections",
+			[_sample("siud_db_max_connections", "", max_connections)],
+		)
+	)
+	for name in DB_STATUS_GAUGES:
+		metric = f"siud_db_{name.lower()}"
+		lines.extend(_gauge(metric, f"MariaDB {name}", [_sample(metric, "", status.get(name, 0))]))
+	for name in DB_STATUS_COUNTERS:
+		metric = f"siud_db_{name.lower()}_total"
+		lines.append(f"# HELP {metric} MariaDB {name}")
+		lines.append(f"# TYPE {metric} counter")
+		lines.append(_sample(metric, "", status.get(name, 0)))
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+
+def _base_name(name):
+	for suffix in ("_bucket", "_sum", "_count"):
+		if name.endswith(suffix) and name[: -len(suffix)] in METRICS:
+			return name[: -len(suffix)]
+	return name
+
+
+def _gauge(name, help_text, samples):
+	return [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", *samples]
+
+
+def _sample(name, labels, value):
+	value = float(value)
+	formatted = str(int(value)) if value.is_integer() else repr(value)
+	return f"{name}{{{labels}}} {formatted}" if labels else f"{name} {formatted}"
@@ -8,14 +8,44 @@ Whitelisted methods for the standalone Supplier Portal UI.
 All methods require authentication and validate supplier_link access.
 """
 
+import mimetypes
+import os
+from urllib.parse import quote
+
 import frappe
 from frappe import _
-
+from frappe.utils import cint
+from werkzeug.wrappers import Response
+from werkzeug.wsgi import wrap_file
+
+from siud.siud.doctype.contact_person.contact_person import sync_contact_persons
+from siud.siud.doctype.supplier.supplier import (
+	get_supplier_profile as get_cached_supplier_profile,
+)
+from siud.siud.doctype.supplier.supplier import (
+	get_supplier_summary,
+	get_user_identity,
+	patch_supplier_profile,
+)
+from siud.siud.doctype.supplier_inquiry.inquiry_status import (
+	CLOSED,
+	DEFAULT,
+	OPEN,
+	STATUSES,
+	as_options,
+	get_codes,
+	get_label,
+	to_code,
+)
+from siud.utils import cache
+from siud.utils.inquiry_archive import ARCHIVE_DOCTYPE
+from siud.utils.swr import stale_while_revalidate
 
 # =============================================================================
 # Helper Functions
 # =============================================================================
 
+
 def get_user_supplier_link():
 	"""
 	Get the supplier_link for the current logged-in user.
@@ -30,11 +60,12 @@ def get_user_supplier_link():
 	if frappe.session.user == "Guest":
 		frappe.throw(_("Please log in to access this resource"), frappe.AuthenticationError)
 
-	user = frappe.get_doc("User", frappe.session.user)
-	supplier_link = user.get("supplier_link")
+	supplier_link = get_user_identity(frappe.session.user).get("supplier_link")
 
 	if not supplier_link:
-		frappe.throw(_("No supplier linked to your account. Please contact the administrator."), frappe.PermissionError)
+		frappe.throw(
+			_("No supplier linked to your account. Please contact the administrator."), frappe.PermissionError
+		)
 
 	return supplier_link
 
@@ -55,10 +86,16 @@ def validate_supplier_access(supplier_name):
 		frappe.throw(_("You are not authorized to access this supplier"), frappe.PermissionError)
 
 
+def get_inquiry_doctypes(include_archived=0):
+	"""The live inquiry DocType, followed by the archive when it is asked for."""
+	return ["Supplier Inquiry", ARCHIVE_DOCTYPE] if cint(include_archived) else ["Supplier Inquiry"]
+
+
 # =============================================================================
 # Authentication & User Info
 # =============================================================================
 
+
 @frappe.whitelist()
 def get_current_user():
 	"""
@@ -80,7 +117,7 @@ def get_current_user():
 		}
 	"""
 	supplier_link = get_user_supplier_link()
-	user = frappe.get_doc("User", frappe.session.user)
+	user = frappe._dict(get_user_identity(frappe.session.user))
 
 	# Generate user initials
 	name_parts = (user.full_name or user.first_name or frappe.session.user).split()
@@ -92,20 +129,22 @@ def get_current_user():
 		initials = frappe.session.user[0:2]
 
 	# Get supplier details
-	supplier = frappe.get_doc("Supplier", supplier_link)
+	supplier = frappe._dict(get_supplier_summary(supplier_link))
+	if not supplier:
+		raise frappe.DoesNotExistError(_("Supplier {0} not found").format(supplier_link))
 
 	return {
 		"user": {
 			"email": frappe.session.user,
 			"full_name": user.full_name or "",
 			"first_name": user.first_name or "",
-			"initials": initials.upper()
+			"initials": initials.upper(),
 		},
 		"supplier": {
 			"name": supplier.name,
 			"supplier_id": supplier.supplier_id,
-			"supplier_name": supplier.supplier_name or supplier.name
-		}
+			"supplier_name": supplier.supplier_name or supplier.name,
+		},
 	}
 
 
@@ -113,6 +152,7 @@ def get_current_user():
 # Supplier Profile
 # =============================================================================
 
+
 @frappe.whitelist()
 def get_supplier_profile():
 	"""
@@ -126,43 +166,17 @@ def get_supplier_profile():
 			"phone": str,
 			"email": str,
 			"address": str,
-			"activity_domains": list,  # List of activity domain categories
-			"contact_persons": list    # List of contact persons
+			"modified": str,           # Concurrency token for patch_profile
+			"activity_domains": list,  # [{"activity_domain_category", "category_name"}]
+			"contact_persons": list    # Contact Person records with their assigned_roles
 		}
 	"""
 	supplier_link = get_user_supplier_link()
-	supplier = frappe.get_doc("Supplier", supplier_link)
-
-	# Get activity domains
-	activity_domains = []
-	if hasattr(supplier, 'activity_domains') and supplier.activity_domains:
-		for ad in supplier.activity_domains:
-			activity_domains.append({
-				"activity_domain_category": ad.activity_domain_category
-			})
-
-	# Get contact persons
-	contact_persons = []
-	if hasattr(supplier, 'contact_persons') and supplier.contact_persons:
-		for cp in supplier.contact_persons:
-			contact_persons.append({
-				"full_name": cp.full_name,
-				"role": cp.role,
-				"phone": cp.phone,
-				"email": cp.email,
-				"is_primary": cp.is_primary
-			})
+	profile = get_cached_supplier_profile(supplier_link)
+	if not profile:
+		raise frappe.DoesNotExistError(_("Supplier {0} not found").format(supplier_link))
 
-	return {
-		"name": supplier.name,
-		"supplier_id": supplier.supplier_id,
-		"supplier_name": supplier.supplier_name or "",
-		"phone": supplier.phone or "",
-		"email": supplier.email or "",
-		"address": supplier.address or "",
-		"activity_domains": activity_domains,
-		"contact_persons": contact_persons
-	}
+	return profile
 
 
 @frappe.whitelist()
@@ -170,6 +184,8 @@ def update_supplier_profile(supplier_name, phone, email, address):
 	"""
 	Update the current user's supplier profile.
 
+	Only fields whose value differs are written (see patch_profile).
+
 	Args:
 		supplier_name: Updated supplier name
 		phone: Updated phone number
@@ -182,37 +198,93 @@ def update_supplier_profile(supplier_name, phone, email, address):
 	supplier_link = get_user_supplier_link()
 
 	try:
-		supplier = frappe.get_doc("Supplier", supplier_link)
-
-		# Update allowed fields only
-		supplier.supplier_name = supplier_name
-		supplier.phone = phone
-		supplier.email = email
-		supplier.address = address
-
-		supplier.save(ignore_permissions=False)
+		patch_supplier_profile(
+			supplier_link,
+			{"supplier_name": supplier_name, "phone": phone, "email": email, "address": address},
+		)
 		frappe.db.commit()
 
-		return {
-			"success": True,
-			"message": _("Profile updated successfully")
-		}
+		return {"success": True, "message": _("Profile updated successfully")}
 
 	except frappe.PermissionError:
 		frappe.throw(_("You do not have permission to update this profile"), frappe.PermissionError)
+	except frappe.ValidationError:
+		raise
 	except Exception as e:
-		frappe.log_error(f"Error updating supplier profile: {str(e)}")
+		frappe.log_error(f"Error updating supplier profile: {e!s}")
 		frappe.throw(_("An error occurred while updating the profile. Please try again."))
 
 
+@frappe.whitelist(methods=["POST", "PATCH"])
+def patch_profile(changes, modified=None):
+	"""
+	Partially update the current user's supplier profile.
+
+	Args:
+		changes: dict (or JSON string) of the fields to change, any of
+			supplier_name, phone, email, address
+		modified: The profile's modified timestamp as returned by
+			get_supplier_profile; the update is rejected with
+			frappe.TimestampMismatchError if the profile changed since
+
+	Returns:
+		dict: {
+			"changed": list,  # Fieldnames actually written (empty if nothing changed)
+			"modified": str   # New concurrency token
+		}
+	"""
+	supplier_link = get_user_supplier_link()
+	changes = frappe.parse_json(changes) if isinstance(changes, str) else changes
+	if not isinstance(changes, dict):
+		frappe.throw(_("changes must be an object of field values"))
+
+	return patch_supplier_profile(supplier_link, changes, modified)
+
+
+# =============================================================================
+# Contact Persons
+# =============================================================================
+
+
+@frappe.whitelist(methods=["POST"])
+def sync_contacts(create=None, update=None, delete=None):
+	"""
+	Create, update and delete the current user's supplier contact persons in one transaction.
+
+	Either every change is saved or none is (see sync_contact_persons).
+
+	Args:
+		create: List of {"contact_name", "email", "mobile_phone", "branch",
+			"primary_role_type", "assigned_roles": [role names]}
+		update: List of {"name", ...fields to change}
+		delete: List of Contact Person names
+
+	Returns:
+		dict: {
+			"created": list,  # New Contact Person names, in the order of create
+			"updated": list,
+			"deleted": list
+		}
+	"""
+	supplier_link = get_user_supplier_link()
+
+	def parse(value):
+		return frappe.parse_json(value) if isinstance(value, str) else value
+
+	return sync_contact_persons(supplier_link, parse(create), parse(update), parse(delete))
+
+
 # =============================================================================
 # Inquiry Statistics
 # =============================================================================
 
+
 @frappe.whitelist()
+@stale_while_revalidate(ttl=60, max_stale=600, scope="supplier")
 def get_inquiry_stats():
 	"""
-	Get inquiry statistics for the current user's supplier.
+	Get inquiry statistics for the current user's supplier, archived
+	inquiries included.
 
 	Returns:
 		dict: {
@@ -224,38 +296,123 @@ def get_inquiry_stats():
 	"""
 	supplier_link = get_user_supplier_link()
 
-	# Total count
-	total = frappe.db.count("Supplier Inquiry", {"supplier_link": supplier_link})
-
-	# Open statuses (Hebrew)
-	open_statuses = ["פנייה חדשה התקבלה", "מיון וניתוב", "בטיפול", "דורש השלמות / המתנה"]
-	open_count = frappe.db.count("Supplier Inquiry", {
-		"supplier_link": supplier_link,
-		"inquiry_status": ["in", open_statuses]
-	})
-
-	# Closed statuses (Hebrew)
-	closed_statuses = ["נסגר – ניתן מענה", "סגור"]
-	closed_count = frappe.db.count("Supplier Inquiry", {
-		"supplier_link": supplier_link,
-		"inquiry_status": ["in", closed_statuses]
-	})
-
-	# Count by individual status
-	all_statuses = open_statuses + closed_statuses
-	by_status = {}
-	for status in all_statuses:
-		count = frappe.db.count("Supplier Inquiry", {
-			"supplier_link": supplier_link,
-			"inquiry_status": status
-		})
-		by_status[status] = count
+	# One query; both tables are grouped over their (supplier_link, status_code) index
+	counts = dict(
+		frappe.db.sql(
+			f"""
+		select status_code, sum(count)
+		from (
+			select status_code, count(*) as count
+			from `tabSupplier Inquiry`
+			where supplier_link = %(supplier_link)s
+			group by status_code
+			union all
+			select status_code, count(*)
+			from `tab{ARCHIVE_DOCTYPE}`
+			where supplier_link = %(supplier_link)s
+			group by status_code
+		) counts
+		group by status_code
+		""",
+			{"supplier_link": supplier_link},
+		)
+	)
+	counts = {code: int(count) for code, count in counts.items()}
+
+	by_status = {get_label(code): counts.get(code, 0) for code in STATUSES}
+	total = sum(counts.values())
+	open_count = sum(counts.get(code, 0) for code in get_codes(OPEN))
+	closed_count = sum(counts.get(code, 0) for code in get_codes(CLOSED))
+
+	return {"total": total, "open": open_count, "closed": closed_count, "by_status": by_status}
+
+
+@frappe.whitelist()
+@stale_while_revalidate(ttl=60, max_stale=600, scope="supplier")
+def get_inquiry_facets(status=None, date_from=None, date_to=None, topic_category=None, include_archived=0):
+	"""
+	Get filter option counts for the current user's inquiry list.
+
+	Takes the same filters as get_inquiries. Each facet counts with the other
+	active filters applied but not its own, so it shows how many inquiries
+	every option would return; the date range applies to all facets.
+	With include_archived, archived inquiries are counted as well.
+
+	Returns:
+		dict: {
+			"total": int,  # Inquiries matching all filters
+			"status": [{"value", "label", "count"}],  # Every status, in workflow order
+			"topic_category": [{"value", "count"}],  # Largest first
+			"month": [{"value", "count"}]  # "YYYY-MM", newest first
+		}
+	"""
+	supplier_link = get_user_supplier_link()
+
+	conditions = ["supplier_link = %(supplier_link)s"]
+	values = {"supplier_link": supplier_link}
+	if date_from:
+		conditions.append("creation >= %(date_from)s")
+		values["date_from"] = date_from
+	if date_to:
+		conditions.append("creation <= %(date_to)s")
+		values["date_to"] = date_to + " 23:59:59"
+
+	# One grouped query (per table); the facets are summed from its rows
+	rows = []
+	for doctype in get_inquiry_doctypes(include_archived):
+		rows += frappe.db.sql(
+			f"""
+			select status_code, topic_category, date_format(creation, '%%Y-%%m') as month, count(*) as count
+			from `tab{doctype}`
+			where {" and ".join(conditions)}
+			group by status_code, topic_category, month
+			""",
+			values,
+			as_dict=True,
+		)
+
+	status_code = (to_code(status) or "") if status else None
+	return count_inquiry_facets(rows, status_code, topic_category or None)
+
+
+def count_inquiry_facets(rows, status_code=None, topic_category=None):
+	"""
+	Sum (status_code, topic_category, month, count) rows into facets.
+
+	Args:
+		rows: Grouped counts
+		status_code: Active status filter (None for all)
+		topic_category: Active topic filter (None for all)
+
+	Returns:
+		dict: See get_inquiry_facets
+	"""
+	by_status, by_topic, by_month = {}, {}, {}
+	total = 0
+	for row in rows:
+		status_match = status_code is None or row["status_code"] == status_code
+		topic_match = topic_category is None or row["topic_category"] == topic_category
+		if topic_match:
+			by_status[row["status_code"]] = by_status.get(row["status_code"], 0) + row["count"]
+		if status_match:
+			by_topic[row["topic_category"]] = by_topic.get(row["topic_category"], 0) + row["count"]
+		if status_match and topic_match:
+			by_month[row["month"]] = by_month.get(row["month"], 0) + row["count"]
+			total += row["count"]
 
 	return {
 		"total": total,
-		"open": open_count,
-		"closed": closed_count,
-		"by_status": by_status
+		"status": [
+			{"value": code, "label": get_label(code), "count": by_status.get(code, 0)} for code in STATUSES
+		],
+		"topic_category": [
+			{"value": topic, "count": count}
+			for topic, count in sorted(by_topic.items(), key=lambda item: (-item[1], item[0] or ""))
+			if topic
+		],
+		"month": [
+			{"value": month, "count": count} for month, count in sorted(by_month.items(), reverse=True)
+		],
 	}
 
 
@@ -263,6 +420,7 @@ def get_inquiry_stats():
 # Inquiry CRUD
 # =============================================================================
 
+
 @frappe.whitelist()
 def get_inquiries(
 	page=1,
@@ -270,7 +428,9 @@ def get_inquiries(
 	status=None,
 	date_from=None,
 	date_to=None,
-	order_by="creation desc"
+	order_by="creation desc",
+	topic_category=None,
+	include_archived=0,
 ):
 	"""
 	Get paginated list of inquiries for the current user's supplier.
@@ -278,14 +438,16 @@ def get_inquiries(
 	Args:
 		page: Page number (1-indexed)
 		page_size: Number of items per page (max 100)
-		status: Filter by inquiry_status (optional)
+		status: Filter by status code or Hebrew status label (optional)
 		date_from: Filter by creation date >= (optional, YYYY-MM-DD)
 		date_to: Filter by creation date <= (optional, YYYY-MM-DD)
 		order_by: Sort order (default: "creation desc")
+		topic_category: Filter by Inquiry Topic Category (optional)
+		include_archived: Also return archived (long closed) inquiries
 
 	Returns:
 		dict: {
-			"data": list,  # List of inquiry objects
+			"data": list,  # List of inquiry objects, each with "archived" 0/1
 			"total": int,  # Total count (for pagination)
 			"page": int,
 			"page_size": int,
@@ -302,7 +464,10 @@ def get_inquiries(
 	filters = {"supplier_link": supplier_link}
 
 	if status:
-		filters["inquiry_status"] = status
+		filters["status_code"] = to_code(status) or ""
+
+	if topic_category:
+		filters["topic_category"] = topic_category
 
 	if date_from:
 		filters["creation"] = [">=", date_from]
@@ -320,37 +485,53 @@ def get_inquiries(
 	if len(order_parts) >= 1 and order_parts[0] not in allowed_order_fields:
 		order_by = "creation desc"
 
+	doctypes = get_inquiry_doctypes(include_archived)
+
 	# Get total count
-	total = frappe.db.count("Supplier Inquiry", filters)
+	total = sum(frappe.db.count(doctype, filters) for doctype in doctypes)
 
 	# Calculate pagination
 	total_pages = (total + page_size - 1) // page_size
 	start = (page - 1) * page_size
 
-	# Get inquiries
-	inquiries = frappe.get_all(
-		"Supplier Inquiry",
-		filters=filters,
-		fields=[
-			"name",
-			"topic_category",
-			"inquiry_status",
-			"inquiry_context",
-			"inquiry_description",
-			"creation",
-			"modified"
-		],
-		order_by=order_by,
-		start=start,
-		limit=page_size
-	)
+	# Get inquiries; with the archive, merge the first start + page_size rows of each table
+	inquiries = []
+	for doctype in doctypes:
+		rows = frappe.get_all(
+			doctype,
+			filters=filters,
+			fields=[
+				"name",
+				"topic_category",
+				"inquiry_status",
+				"status_code",
+				"inquiry_context",
+				"inquiry_description",
+				"creation",
+				"modified",
+			],
+			order_by=order_by,
+			start=0 if len(doctypes) > 1 else start,
+			limit=start + page_size if len(doctypes) > 1 else page_size,
+		)
+		for row in rows:
+			row["archived"] = int(doctype == ARCHIVE_DOCTYPE)
+		inquiries += rows
+
+	if len(doctypes) > 1:
+		field, *direction = order_by.split()
+		inquiries.sort(
+			key=lambda row: (row.get(field) is None, row.get(field) or ""),
+			reverse=bool(direction) and direction[0].lower() == "desc",
+		)
+		inquiries = inquiries[start : start + page_size]
 
 	return {
 		"data": inquiries,
 		"total": total,
 		"page": page,
 		"page_size": page_size,
-		"total_pages": total_pages
+		"total_pages": total_pages,
 	}
 
 
@@ -360,15 +541,16 @@ def get_inquiry(name):
 	Get a single inquiry by name/ID.
 
 	Args:
-		name: The inquiry document name
+		name: The inquiry document name (live or archived)
 
 	Returns:
 		dict: Full inquiry details including attachments
 	"""
 	supplier_link = get_user_supplier_link()
 
-	# Get the inquiry
-	inquiry = frappe.get_doc("Supplier Inquiry", name)
+	# Get the inquiry; names no longer live have been moved to the archive
+	doctype = "Supplier Inquiry" if frappe.db.exists("Supplier Inquiry", name) else ARCHIVE_DOCTYPE
+	inquiry = frappe.get_doc(doctype, name)
 
 	# Validate access
 	if inquiry.supplier_link != supplier_link:
@@ -377,25 +559,24 @@ def get_inquiry(name):
 	# Get attachments
 	attachments = frappe.get_all(
 		"File",
-		filters={
-			"attached_to_doctype": "Supplier Inquiry",
-			"attached_to_name": name
-		},
-		fields=["name", "file_name", "file_url", "file_size", "creation"]
+		filters={"attached_to_doctype": doctype, "attached_to_name": name},
+		fields=["name", "file_name", "file_url", "file_size", "creation"],
 	)
 
 	return {
 		"name": inquiry.name,
 		"topic_category": inquiry.topic_category,
 		"inquiry_status": inquiry.inquiry_status,
+		"status_code": inquiry.status_code,
 		"inquiry_context": inquiry.inquiry_context,
 		"inquiry_description": inquiry.inquiry_description,
-		"insured_id_number": inquiry.insured_id_number if hasattr(inquiry, 'insured_id_number') else None,
-		"insured_full_name": inquiry.insured_full_name if hasattr(inquiry, 'insured_full_name') else None,
-		"admin_response": inquiry.admin_response if hasattr(inquiry, 'admin_response') else None,
+		"insured_id_number": inquiry.insured_id_number if hasattr(inquiry, "insured_id_number") else None,
+		"insured_full_name": inquiry.insured_full_name if hasattr(inquiry, "insured_full_name") else None,
+		"admin_response": inquiry.admin_response if hasattr(inquiry, "admin_response") else None,
 		"creation": inquiry.creation,
 		"modified": inquiry.modified,
-		"attachments": attachments
+		"archived": int(doctype == ARCHIVE_DOCTYPE),
+		"attachments": attachments,
 	}
 
 
@@ -435,28 +616,26 @@ def create_inquiry(topic_category, description, inquiry_context, insured_id=None
 
 	try:
 		# Create the inquiry
-		inquiry = frappe.get_doc({
-			"doctype": "Supplier Inquiry",
-			"supplier_link": supplier_link,
-			"topic_category": topic_category,
-			"inquiry_description": description,
-			"inquiry_context": inquiry_context,
-			"inquiry_status": "פנייה חדשה התקבלה",  # Default status
-			"insured_id_number": insured_id if inquiry_context == "מבוטח" else None,
-			"insured_full_name": insured_name if inquiry_context == "מבוטח" else None
-		})
+		inquiry = frappe.get_doc(
+			{
+				"doctype": "Supplier Inquiry",
+				"supplier_link": supplier_link,
+				"topic_category": topic_category,
+				"inquiry_description": description,
+				"inquiry_context": inquiry_context,
+				"inquiry_status": get_label(DEFAULT),
+				"insured_id_number": insured_id if inquiry_context == "מבוטח" else None,
+				"insured_full_name": insured_name if inquiry_context == "מבוטח" else None,
+			}
+		)
 
 		inquiry.insert(ignore_permissions=False)
 		frappe.db.commit()
 
-		return {
-			"success": True,
-			"name": inquiry.name,
-			"message": _("Inquiry created successfully")
-		}
+		return {"success": True, "name": inquiry.name, "message": _("Inquiry created successfully")}
 
 	except Exception as e:
-		frappe.log_error(f"Error creating inquiry: {str(e)}")
+		frappe.log_error(f"Error creating inquiry: {e!s}")
 		frappe.throw(_("An error occurred while creating the inquiry. Please try again."))
 
 
@@ -464,7 +643,9 @@ def create_inquiry(topic_category, description, inquiry_context, insured_id=None
 # Reference Data
 # =============================================================================
 
+
 @frappe.whitelist(allow_guest=True)
+@stale_while_revalidate(ttl=300, max_stale=3600, scope="global")
 def get_reference_data():
 	"""
 	Get all reference data needed for the portal.
@@ -480,56 +661,149 @@ def get_reference_data():
 			"inquiry_contexts": list
 		}
 	"""
+	reference_data = cache.get("reference", "reference_data", _load_reference_data)
+	reference_data["inquiry_topics"] = get_topic_tree()
+	return reference_data
+
+
+def get_topic_tree():
+	"""
+	Get the full Inquiry Topic Category tree in NestedSet (lft) order.
+
+	Returns:
+		list: [{"name", "category_code", "category_name", "parent_inquiry_topic_category"}]
+	"""
+	return cache.get(
+		"topic_tree",
+		"all",
+		lambda: frappe.get_all(
+			"Inquiry Topic Category",
+			fields=["name", "category_code", "category_name", "parent_inquiry_topic_category"],
+			order_by="lft",  # NestedSet order
+		),
+	)
+
+
+@frappe.whitelist()
+def get_topic_children(parent=None):
+	"""
+	Get one level of the Inquiry Topic Category tree for the topic picker.
+
+	Args:
+		parent: Parent topic name (empty for the top level)
+
+	Returns:
+		list: [{"name", "category_code", "category_name", "has_children"}] by category_name
+	"""
+	return cache.get("topic_tree", f"children:{parent or ''}", lambda: _load_topic_children(parent))
+
+
+@frappe.whitelist()
+def search_topics(query, limit=20):
+	"""
+	Prefix search over topic names and codes (both indexed).
+
+	Args:
+		query: Beginning of category_name or category_code
+		limit: Max results (up to 50)
+
+	Returns:
+		list: [{"name", "category_code", "category_name", "has_children", "path"}],
+			name matches first; path lists the ancestors' names from the root
+	"""
+	query = (query or "").strip()
+	if not query:
+		return []
+
+	limit = min(cint(limit) or 20, 50)
+	pattern = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+	# Two single-index range scans instead of an OR across columns
+	topics = {}
+	for field in ("category_name", "category_code"):
+		for row in frappe.db.sql(
+			f"""select name, category_code, category_name, lft, rgt, rgt > lft + 1 as has_children
+			from `tabInquiry Topic Category`
+			where {field} like %s
+			order by {field}
+			limit {limit}""",
+			(pattern,),
+			as_dict=True,
+		):
+			topics.setdefault(row.name, row)
+
+	topics = list(topics.values())[:limit]
+	if not topics:
+		return []
+
+	ancestors = frappe.db.sql(
+		f"""select category_name, lft, rgt from `tabInquiry Topic Category`
+		where {" or ".join(["(lft < %s and rgt > %s)"] * len(topics))}
+		order by lft""",
+		[bound for topic in topics for bound in (topic.lft, topic.rgt)],
+		as_dict=True,
+	)
+
+	return [
+		{
+			"name": topic.name,
+			"category_code": topic.category_code,
+			"category_name": topic.category_name,
+			"has_children": bool(topic.has_children),
+			"path": [a.category_name for a in ancestors if a.lft < topic.lft and a.rgt > topic.rgt],
+		}
+		for topic in topics
+	]
+
+
+def _load_topic_children(parent):
+	# "is null or = ''" keeps the (parent, category_name) index usable, unlike ifnull()
+	condition = (
+		"parent_inquiry_topic_category = %(parent)s"
+		if parent
+		else "(parent_inquiry_topic_category is null or parent_inquiry_topic_category = '')"
+	)
+	return [
+		{**row, "has_children": bool(row.has_children)}
+		for row in frappe.db.sql(
+			f"""select name, category_code, category_name, rgt > lft + 1 as has_children
+			from `tabInquiry Topic Category`
+			where {condition}
+			order by category_name""",
+			{"parent": parent},
+			as_dict=True,
+		)
+	]
+
+
+def _load_reference_data():
+	"""Load the reference data served by get_reference_data, except the topic tree."""
 	# Activity Domain Categories
 	activity_domains = frappe.get_all(
 		"Activity Domain Category",
 		fields=["name", "category_code", "category_name"],
-		order_by="category_name"
-	)
-
-	# Inquiry Topic Categories (hierarchical)
-	inquiry_topics = frappe.get_all(
-		"Inquiry Topic Category",
-		fields=["name", "category_code", "category_name", "parent_inquiry_topic_category"],
-		order_by="lft"  # NestedSet order
+		order_by="category_name",
 	)
 
 	# Supplier Roles
 	supplier_roles = frappe.get_all(
-		"Supplier Role",
-		fields=["name", "role_name", "role_title_he"],
-		order_by="role_name"
+		"Supplier Role", fields=["name", "role_name", "role_title_he"], order_by="role_name"
 	)
 
 	# Contact Person Roles
-	contact_person_roles = frappe.get_all(
-		"Contact Person Role",
-		fields=["name", "role"],
-		order_by="role"
-	)
+	contact_person_roles = frappe.get_all("Contact Person Role", fields=["name", "role"], order_by="role")
 
 	# Static reference data
-	inquiry_statuses = [
-		{"value": "פנייה חדשה התקבלה", "label": "פנייה חדשה התקבלה", "type": "open"},
-		{"value": "מיון וניתוב", "label": "מיון וניתוב", "type": "open"},
-		{"value": "בטיפול", "label": "בטיפול", "type": "open"},
-		{"value": "דורש השלמות / המתנה", "label": "דורש השלמות / המתנה", "type": "open"},
-		{"value": "נסגר – ניתן מענה", "label": "נסגר – ניתן מענה", "type": "closed"},
-		{"value": "סגור", "label": "סגור", "type": "closed"}
-	]
+	inquiry_statuses = as_options()
 
-	inquiry_contexts = [
-		{"value": "ספק עצמו", "label": "ספק עצמו"},
-		{"value": "מבוטח", "label": "מבוטח"}
-	]
+	inquiry_contexts = [{"value": "ספק עצמו", "label": "ספק עצמו"}, {"value": "מבוטח", "label": "מבוטח"}]
 
 	return {
 		"activity_domains": activity_domains,
-		"inquiry_topics": inquiry_topics,
 		"supplier_roles": supplier_roles,
 		"contact_person_roles": contact_person_roles,
 		"inquiry_statuses": inquiry_statuses,
-		"inquiry_contexts": inquiry_contexts
+		"inquiry_contexts": inquiry_contexts,
 	}
 
 
@@ -537,6 +811,7 @@ def get_reference_data():
 # File Upload
 # =============================================================================
 
+
 @frappe.whitelist()
 def attach_file_to_inquiry(inquiry_name, file_url):
 	"""
@@ -558,24 +833,82 @@ def attach_file_to_inquiry(inquiry_name, file_url):
 		frappe.throw(_("You are not authorized to modify this inquiry"), frappe.PermissionError)
 
 	# Find the file by URL and update its attachment
-	file_doc = frappe.get_all(
-		"File",
-		filters={"file_url": file_url},
-		fields=["name"],
-		limit=1
-	)
+	file_doc = frappe.get_all("File", filters={"file_url": file_url}, fields=["name"], limit=1)
 
 	if not file_doc:
 		frappe.throw(_("File not found"))
 
 	# Update file attachment
-	frappe.db.set_value("File", file_doc[0].name, {
-		"attached_to_doctype": "Supplier Inquiry",
-		"attached_to_name": inquiry_name
-	})
+	frappe.db.set_value(
+		"File",
+		file_doc[0].name,
+		{"attached_to_doctype": "Supplier Inquiry", "attached_to_name": inquiry_name},
+	)
 	frappe.db.commit()
 
-	return {
-		"success": True,
-		"message": _("File attached successfully")
+	return {"success": True, "message": _("File attached successfully")}
+
+
+# =============================================================================
+# File Download
+# =============================================================================
+
+
+@frappe.whitelist(methods=["GET"])
+def download_attachment(name):
+	"""
+	Download a file attached to one of the current user's inquiries (live or archived).
+
+	Behind nginx, which sets X-Use-X-Accel-Redirect on proxied requests (the same
+	header frappe checks for its own private files), only the headers come from
+	here: X-Accel-Redirect hands the transfer to nginx's internal /private/files
+	location (or /files), which also answers Range requests, so a large download
+	does not hold a gunicorn worker. Without nginx the file is streamed from
+	here, with Range support.
+
+	Args:
+		name: The File document name
+
+	Returns:
+		Response: Passed on as is by frappe's request handler
+	"""
+	supplier_link = get_user_supplier_link()
+
+	attachment = frappe.db.get_value(
+		"File", name, ["file_url", "file_name", "attached_to_doctype", "attached_to_name"], as_dict=True
+	)
+	if not attachment or attachment.attached_to_doctype not in get_inquiry_doctypes(include_archived=1):
+		frappe.throw(_("File not found"), frappe.DoesNotExistError)
+
+	if (
+		frappe.db.get_value(attachment.attached_to_doctype, attachment.attached_to_name, "supplier_link")
+		!= supplier_link
+	):
+		frappe.throw(_("You are not authorized to access this file"), frappe.PermissionError)
+
+	file_url = attachment.file_url or ""
+	if not file_url.startswith(("/files/", "/private/files/")) or ".." in file_url.split("/"):
+		frappe.throw(_("File not found"), frappe.DoesNotExistError)
+
+	file_name = attachment.file_name or os.path.basename(file_url)
+	headers = {
+		"Content-Disposition": f"attachment; filename*=UTF-8''{quote(file_name)}",
+		"Cache-Control": "private, no-cache",
 	}
+	mimetype = mimetypes.guess_type(file_name)[0] or "application/octet-stream"
+
+	if frappe.request.headers.get("X-Use-X-Accel-Redirect"):
+		response = Response(mimetype=mimetype, headers=headers)
+		response.headers["X-Accel-Redirect"] = quote(file_url)
+		return response
+
+	path = frappe.get_doc("File", name).get_full_path()
+	response = Response(
+		wrap_file(frappe.request.environ, open(path, "rb")),
+		mimetype=mimetype,
+		headers=headers,
+		direct_passthrough=True,
+	)
+	return response.make_conditional(
+		frappe.request, accept_ranges=True, complete_length=os.path.getsize(path)
+	)
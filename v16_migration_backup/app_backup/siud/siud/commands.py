@@ -0,0 +1,196 @@
+# Copyright (c) 2025, Tzvi and contributors
+# For license information, please see license.txt
+
+"""
+Bench Commands
+
+	bench --site <site> siud-schema-check [--provisioning <dir>]   # exit 0 if migrate/provisioning can be skipped
+	bench --site <site> siud-schema-stamp [--provisioning <dir>]   # record the fingerprint after a successful rollout
+	bench --site <site> siud-backup [--base]   # incremental backup of the siud DocTypes
+	bench --site <site> siud-restore <path>    # replay a backup chain (base + increments)
+	bench --site <site> siud-schema-snapshot <file>   # schema, row counts and checksums to JSON
+	bench siud-schema-diff <before> <after>           # exit 1 if the snapshots differ
+	bench --site <site> siud-fixtures-export <dir> [--format tsv|jsonl]
+	bench --site <site> siud-fixtures-import <dir>
+	bench --site <site> siud-import-suppliers <file.csv|xlsx> [--dry-run]
+"""
+
+import os
+import sys
+
+import click
+import frappe
+from frappe.commands import get_site, pass_context
+
+
+@click.command("siud-schema-check")
+@click.option("--provisioning", help="Directory of the provisioning specs to include in the fingerprint")
+@pass_context
+def schema_check(context, provisioning=None):
+	"""Exit 0 if the schema fingerprint matches the stored one, 1 if migrate is needed."""
+	from siud.utils.schema_fingerprint import get_changes, get_fingerprint, get_stored_fingerprint
+
+	frappe.init(site=get_site(context))
+	try:
+		frappe.connect()
+		changes = get_changes(get_stored_fingerprint(), get_fingerprint(provisioning))
+	finally:
+		frappe.destroy()
+
+	if changes:
+		click.echo(f"siud schema changed: {', '.join(changes)}")
+		sys.exit(1)
+	click.echo("siud schema unchanged")
+
+
+@click.command("siud-schema-stamp")
+@click.option("--provisioning", help="Directory of the provisioning specs to include in the fingerprint")
+@pass_context
+def schema_stamp(context, provisioning=None):
+	"""Store the current schema fingerprint."""
+	from siud.utils.schema_fingerprint import stamp
+
+	frappe.init(site=get_site(context))
+	try:
+		frappe.connect()
+		stamp(provisioning)
+	finally:
+		frappe.destroy()
+	click.echo("siud schema fingerprint stored")
+
+
+@click.command("siud-backup")
+@click.option("--base", is_flag=True, default=False, help="Export all rows instead of the changes")
+@pass_context
+def siud_backup(context, base=False):
+	"""Write an incremental (or base) backup of the siud DocTypes."""
+	from siud.utils.incremental_backup import backup
+
+	frappe.init(site=get_site(context))
+	try:
+		frappe.connect()
+		path = backup(base=base)
+	finally:
+		frappe.destroy()
+	click.echo(f"siud backup written to {path}")
+
+
+@click.command("siud-restore")
+@click.argument("path")
+@pass_context
+def siud_restore(context, path):
+	"""Replay a siud backup and its ancestors, base first."""
+	from siud.utils.incremental_backup import restore
+
+	frappe.init(site=get_site(context))
+	try:
+		frappe.connect()
+		restore(path)
+	finally:
+		frappe.destroy()
+	click.echo("siud backup restored")
+
+
+@click.command("siud-schema-snapshot")
+@click.argument("output")
+@click.option("--workers", type=int, default=4, help="Parallel DB connections")
+@click.option("--chunk-size", type=int, default=10000, help="Rows per checksummed primary-key range")
+@click.option("--table", "tables", multiple=True, help="Table to include (default: the siud module's tables)")
+@pass_context
+def schema_snapshot(context, output, workers=4, chunk_size=10000, tables=None):
+	"""Write a schema, row count and checksum snapshot of the site to a JSON file."""
+	from siud.utils.schema_verifier import save, snapshot
+
+	frappe.init(site=get_site(context))
+	try:
+		frappe.connect()
+		data = snapshot(tables=list(tables), chunk_size=chunk_size, workers=workers)
+	finally:
+		frappe.destroy()
+	save(data, output)
+	click.echo(f"{len(data['tables'])} tables snapshotted to {output} in {data.get('duration', 0)}s")
+
+
+@click.command("siud-schema-diff")
+@click.argument("before")
+@click.argument("after")
+def schema_diff(before, after):
+	"""Compare two snapshots; exit 1 if they differ."""
+	from siud.utils.schema_verifier import diff, format_diff, has_differences, load
+
+	result = diff(load(before), load(after))
+	click.echo(format_diff(result))
+	if has_differences(result):
+		sys.exit(1)
+
+
+@click.command("siud-fixtures-export")
+@click.argument("path")
+@click.option("--format", "format", type=click.Choice(["tsv", "jsonl"]), default="tsv")
+@pass_context
+def fixtures_export(context, path, format="tsv"):
+	"""Export the siud reference DocTypes to one file each."""
+	from siud.utils.fixtures import export_fixtures
+
+	frappe.init(site=get_site(context))
+	try:
+		frappe.connect()
+		counts = export_fixtures(path, format=format)
+	finally:
+		frappe.destroy()
+	for doctype, count in counts.items():
+		click.echo(f"{doctype}: {count} rows")
+
+
+@click.command("siud-fixtures-import")
+@click.argument("path")
+@pass_context
+def fixtures_import(context, path):
+	"""Upsert the siud reference DocTypes from exported fixture files."""
+	from siud.utils.fixtures import import_fixtures
+
+	frappe.init(site=get_site(context))
+	try:
+		frappe.connect()
+		counts = import_fixtures(path)
+	finally:
+		frappe.destroy()
+	for doctype, count in counts.items():
+		click.echo(f"{doctype}: {count} rows")
+
+
+@click.command("siud-import-suppliers")
+@click.argument("path")
+@click.option("--dry-run", is_flag=True, default=False, help="Validate only")
+@click.option("--chunk-size", type=int, default=500, help="Rows validated and inserted together")
+@pass_context
+def import_suppliers(context, path, dry_run=False, chunk_size=500):
+	"""Bulk import suppliers and contact persons from a CSV or XLSX file."""
+	from siud.utils.supplier_import import import_suppliers
+
+	frappe.init(site=get_site(context))
+	try:
+		frappe.connect()
+		report = import_suppliers(os.path.abspath(path), chunk_size=chunk_size, dry_run=dry_run)
+	finally:
+		frappe.destroy()
+
+	for error in report["errors"]:
+		click.echo(f"✗ row {error['row']} ({error['supplier_id'] or '-'}): {'; '.join(error['errors'])}")
+	click.echo(
+		f"{report['rows']} rows: {report['suppliers']} suppliers, {report['contacts']} contact persons"
+		f"{' validated' if dry_run else ' imported'}, {len(report['errors'])} rows with errors"
+	)
+
+
+commands = [
+	schema_check,
+	schema_stamp,
+	siud_backup,
+	siud_restore,
+	schema_snapshot,
+	schema_diff,
+	fixtures_export,
+	fixtures_import,
+	import_suppliers,
+]
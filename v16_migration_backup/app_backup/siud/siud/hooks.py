@@ -60,18 +60,36 @@ app_license = "mit"
 # home_page = "login"
 
 # website user home page (by Role)
-role_home_page = {
-	"Supplier Portal User": "supplier-dashboard"
-}
+role_home_page = {"Supplier Portal User": "supplier-dashboard"}
 
 # Portal Menu Items
 # ------------------
 # Standard portal menu items to show in the portal
 standard_portal_menu_items = [
-	{"title": "דף הבית", "route": "/supplier-dashboard", "reference_doctype": "", "role": "Supplier Portal User"},
-	{"title": "הפניות שלי", "route": "/supplier-inquiry-form/list", "reference_doctype": "Supplier Inquiry", "role": "Supplier Portal User"},
-	{"title": "פנייה חדשה", "route": "/supplier-inquiry-form/new", "reference_doctype": "Supplier Inquiry", "role": "Supplier Portal User"},
-	{"title": "פרופיל הספק", "route": "/supplier-profile", "reference_doctype": "Supplier", "role": "Supplier Portal User"},
+	{
+		"title": "דף הבית",
+		"route": "/supplier-dashboard",
+		"reference_doctype": "",
+		"role": "Supplier Portal User",
+	},
+	{
+		"title": "הפניות שלי",
+		"route": "/supplier-inquiry-form/list",
+		"reference_doctype": "Supplier Inquiry",
+		"role": "Supplier Portal User",
+	},
+	{
+		"title": "פנייה חדשה",
+		"route": "/supplier-inquiry-form/new",
+		"reference_doctype": "Supplier Inquiry",
+		"role": "Supplier Portal User",
+	},
+	{
+		"title": "פרופיל הספק",
+		"route": "/supplier-profile",
+		"reference_doctype": "Supplier",
+		"role": "Supplier Portal User",
+	},
 ]
 
 # Generators
@@ -142,17 +160,65 @@ standard_portal_menu_items = [
 # ---------------
 # Hook on document methods and events
 
-# doc_events = {
-# 	"*": {
-# 		"on_update": "method",
-# 		"on_cancel": "method",
-# 		"on_trash": "method"
-# 	}
-# }
+doc_events = {
+	"User": {
+		"on_update": "siud.utils.cache_events.on_user_change",
+		"on_trash": "siud.utils.cache_events.on_user_change",
+	},
+	"Supplier": {
+		"on_update": [
+			"siud.utils.cache_events.on_supplier_change",
+			"siud.utils.supplier_search.on_supplier_change",
+		],
+		"on_trash": [
+			"siud.utils.cache_events.on_supplier_change",
+			"siud.utils.supplier_search.on_supplier_trash",
+		],
+	},
+	"Activity Domain Category": {
+		"on_update": "siud.utils.cache_events.on_reference_change",
+		"on_trash": "siud.utils.cache_events.on_reference_change",
+		"after_rename": "siud.utils.cache_events.on_reference_change",
+	},
+	"Supplier Role": {
+		"on_update": "siud.utils.cache_events.on_reference_change",
+		"on_trash": "siud.utils.cache_events.on_reference_change",
+		"after_rename": "siud.utils.cache_events.on_reference_change",
+	},
+	"Contact Person Role": {
+		"on_update": "siud.utils.cache_events.on_reference_change",
+		"on_trash": "siud.utils.cache_events.on_reference_change",
+		"after_rename": "siud.utils.cache_events.on_reference_change",
+	},
+	"Contact Person": {
+		"on_update": "siud.utils.cache_events.on_contact_person_change",
+		"on_trash": "siud.utils.cache_events.on_contact_person_change",
+	},
+	"Supplier Inquiry": {
+		"after_insert": "siud.utils.cache_events.on_inquiry_change",
+		"on_update": "siud.utils.cache_events.on_inquiry_change",
+		"on_trash": "siud.utils.cache_events.on_inquiry_change",
+	},
+	"Inquiry Topic Category": {
+		"on_update": "siud.utils.cache_events.on_topic_change",
+		"on_trash": "siud.utils.cache_events.on_topic_change",
+		"after_rename": "siud.utils.cache_events.on_topic_change",
+	},
+}
 
 # Scheduled Tasks
 # ---------------
 
+scheduler_events = {
+	"hourly": [
+		"siud.utils.incremental_backup.scheduled_backup",
+		"siud.utils.inquiry_rollup.update_rollups",
+	],
+	"daily": [
+		"siud.utils.inquiry_archive.scheduled_archive",
+	],
+}
+
 # scheduler_events = {
 # 	"all": [
 # 		"siud.tasks.all"
@@ -209,13 +275,25 @@ standard_portal_menu_items = [
 
 # Request Events
 # ----------------
-# before_request = ["siud.utils.before_request"]
-# after_request = ["siud.utils.after_request"]
+before_request = [
+	"siud.utils.metrics.before_request",
+	"siud.utils.query_detector.before_request",
+]
+after_request = [
+	"siud.utils.query_detector.after_request",
+	"siud.utils.metrics.after_request",
+]
 
 # Job Events
 # ----------
-# before_job = ["siud.utils.before_job"]
-# after_job = ["siud.utils.after_job"]
+before_job = [
+	"siud.utils.metrics.before_job",
+	"siud.utils.query_detector.before_job",
+]
+after_job = [
+	"siud.utils.query_detector.after_job",
+	"siud.utils.metrics.after_job",
+]
 
 # User Data Protection
 # --------------------
@@ -259,4 +337,3 @@ standard_portal_menu_items = [
 # ------------
 # List of apps whose translatable strings should be excluded from this app's translations.
 # ignore_translatable_strings_from = []
-
@@ -0,0 +1,29 @@
+# Copyright (c) 2025, Tzvi and contributors
+# For license information, please see license.txt
+
+"""
+Assign Activity Domain Category.bit_index, add its unique index and backfill
+Supplier.activity_domain_mask and Delegated Supplier.scope_mask from their
+child tables.
+
+Existing categories get bit_index -1 (unassigned) when the column is added, so
+model sync cannot add the unique index; it is added here once every category
+has its own bit.
+
+Masks are computed in SQL in primary-key batches with a commit in between
+(see siud.utils.domain_mask.rebuild_masks), so the patch never holds long
+locks on a large table.
+"""
+
+import frappe
+
+from siud.utils.domain_mask import MASKS, add_unique_bit_index, assign_bit_indexes, rebuild_masks
+
+
+def execute():
+	assign_bit_indexes()
+	frappe.db.commit()
+	add_unique_bit_index()
+
+	for doctype in MASKS:
+		rebuild_masks(doctype)
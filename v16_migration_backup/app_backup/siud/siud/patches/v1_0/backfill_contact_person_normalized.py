@@ -0,0 +1,48 @@
+# Copyright (c) 2025, Tzvi and contributors
+# For license information, please see license.txt
+
+"""
+Backfill Contact Person.email_normalized and phone_normalized.
+
+Rows are updated in primary-key batches with one CASE update per batch and a
+commit in between, so the patch never holds long locks on a large table.
+"""
+
+import frappe
+
+from siud.siud.doctype.contact_person.contact_person import normalize_email, normalize_phone
+
+BATCH_SIZE = 5000
+
+
+def execute():
+	last_name = ""
+	while True:
+		rows = frappe.db.sql(
+			"""
+			select name, email, mobile_phone from `tabContact Person`
+			where name > %s
+			order by name
+			limit %s
+			""",
+			(last_name, BATCH_SIZE),
+		)
+		if not rows:
+			break
+
+		cases = " ".join(["when %s then %s"] * len(rows))
+		frappe.db.sql(
+			f"""
+			update `tabContact Person`
+			set email_normalized = case name {cases} end,
+				phone_normalized = case name {cases} end
+			where name in ({", ".join(["%s"] * len(rows))})
+			""",
+			(
+				*(value for name, email, phone in rows for value in (name, normalize_email(email))),
+				*(value for name, email, phone in rows for value in (name, normalize_phone(phone))),
+				*(name for name, email, phone in rows),
+			),
+		)
+		frappe.db.commit()
+		last_name = rows[-1][0]
@@ -0,0 +1,49 @@
+# Copyright (c) 2025, Tzvi and contributors
+# For license information, please see license.txt
+
+"""
+Backfill Supplier Inquiry.status_code from the Hebrew inquiry_status label.
+
+Rows are updated in primary-key batches with one CASE update per batch and a
+commit in between, so the patch never holds long locks on a large table.
+"""
+
+import frappe
+
+from siud.siud.doctype.supplier_inquiry.inquiry_status import STATUSES
+
+BATCH_SIZE = 5000
+
+
+def execute():
+	case_parts = []
+	values = []
+	for code, (label, _status_class) in STATUSES.items():
+		case_parts.append("when %s then %s")
+		values.extend([label, code])
+	case_sql = f"case inquiry_status {' '.join(case_parts)} else null end"
+
+	last_name = ""
+	while True:
+		names = frappe.db.sql_list(
+			"""
+			select name from `tabSupplier Inquiry`
+			where name > %s
+			order by name
+			limit %s
+			""",
+			(last_name, BATCH_SIZE),
+		)
+		if not names:
+			break
+
+		frappe.db.sql(
+			f"""
+			update `tabSupplier Inquiry`
+			set status_code = {case_sql}
+			where name in ({", ".join(["%s"] * len(names))})
+			""",
+			(*values, *names),
+		)
+		frappe.db.commit()
+		last_name = names[-1]
@@ -0,0 +1,15 @@
+# Copyright (c) 2025, Tzvi and contributors
+# For license information, please see license.txt
+
+"""
+Build the Supplier Search Token index for existing suppliers.
+
+Suppliers are indexed in batches with a commit after each (see
+siud.utils.supplier_search.rebuild_index).
+"""
+
+from siud.utils.supplier_search import rebuild_index
+
+
+def execute():
+	rebuild_index()
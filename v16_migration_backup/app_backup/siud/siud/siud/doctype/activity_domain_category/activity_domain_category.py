@@ -1,9 +1,21 @@
 # Copyright (c) 2025, Tzvi and contributors
 # For license information, please see license.txt
 
-# import frappe
 from frappe.model.document import Document
 
+from siud.utils.domain_mask import add_unique_bit_index, clear_bit, is_assigned, next_bit_index
+
 
 class ActivityDomainCategory(Document):
-	pass
+	def before_insert(self):
+		if not is_assigned(self.bit_index):
+			self.bit_index = next_bit_index()
+
+	def on_trash(self):
+		if is_assigned(self.bit_index):
+			clear_bit(self.bit_index)
+
+
+def on_doctype_update():
+	"""Unique bit_index; on existing sites the backfill patch adds it after assigning the bits."""
+	add_unique_bit_index()
@@ -0,0 +1,8 @@
+// Copyright (c) 2025, Tzvi and contributors
+// For license information, please see license.txt
+
+// frappe.ui.form.on("Archived Supplier Inquiry", {
+// 	refresh(frm) {
+
+// 	},
+// });
@@ -0,0 +1,15 @@
+# Copyright (c) 2025, Tzvi and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class ArchivedSupplierInquiry(Document):
+	pass
+
+
+def on_doctype_update():
+	"""Same per-supplier indexes as Supplier Inquiry, for the portal's archive reads."""
+	frappe.db.add_index("Archived Supplier Inquiry", ["supplier_link", "status_code"])
+	frappe.db.add_index("Archived Supplier Inquiry", ["supplier_link", "creation"])
@@ -1,9 +1,154 @@
 # Copyright (c) 2025, Tzvi and contributors
 # For license information, please see license.txt
 
-# import frappe
+import re
+
+import frappe
+from frappe import _
 from frappe.model.document import Document
+from frappe.utils import strip_html
+
+# Fields a supplier may set on its own contact persons (plus assigned_roles)
+CONTACT_FIELDS = ("contact_name", "email", "mobile_phone", "branch", "primary_role_type")
 
 
 class ContactPerson(Document):
-	pass
+	def validate(self):
+		self.email_normalized = normalize_email(self.email)
+		self.phone_normalized = normalize_phone(self.mobile_phone)
+
+
+def on_doctype_update():
+	"""Composite indexes for looking up a supplier's contacts by email or phone."""
+	frappe.db.add_index("Contact Person", ["supplier_link", "email_normalized"])
+	frappe.db.add_index("Contact Person", ["supplier_link", "phone_normalized"])
+
+
+def normalize_email(email):
+	return (email or "").strip().lower()
+
+
+def normalize_phone(phone):
+	"""
+	Digits only, with the Israeli country code replaced by the trunk prefix.
+
+	"+972 (50) 123-4567", "972501234567" and "050-1234567" all give "0501234567".
+	"""
+	digits = re.sub(r"\D", "", phone or "")
+	if digits.startswith("972") and len(digits) > 10:
+		digits = "0" + digits[3:]
+	return digits
+
+
+def sync_contact_persons(supplier_name, create=None, update=None, delete=None):
+	"""
+	Create, update and delete contact persons of one supplier as a single unit.
+
+	All changes are applied inside a savepoint; if any of them fails, or the
+	result has two contacts with the same normalized email, everything is
+	rolled back and one error listing every failed entry is raised.
+
+	Args:
+		supplier_name: Supplier document name; only its own contacts can be changed
+		create: List of dicts with CONTACT_FIELDS and optionally assigned_roles
+			(list of Supplier Role names)
+		update: List of dicts with "name" and the fields to change; assigned_roles,
+			when given, replaces the contact's roles
+		delete: List of Contact Person names
+
+	Returns:
+		dict: {"created": [names], "updated": [names], "deleted": [names]}
+
+	Raises:
+		frappe.PermissionError: If a contact does not belong to the supplier
+		frappe.ValidationError: If any change is invalid
+	"""
+	create, update, delete = create or [], update or [], delete or []
+
+	existing = set(frappe.get_all("Contact Person", filters={"supplier_link": supplier_name}, pluck="name"))
+	foreign = [row.get("name") for row in update if row.get("name") not in existing]
+	foreign += [name for name in delete if name not in existing]
+	if foreign:
+		frappe.throw(
+			_("Contact persons not found for this supplier: {0}").format(", ".join(map(str, foreign))),
+			frappe.PermissionError,
+		)
+
+	errors = []
+	for operation, rows, allowed in (
+		("create", create, {*CONTACT_FIELDS, "assigned_roles"}),
+		("update", update, {"name", *CONTACT_FIELDS, "assigned_roles"}),
+	):
+		for index, row in enumerate(rows):
+			unknown = sorted(set(row) - allowed)
+			if unknown:
+				errors.append(
+					f"{operation}[{index}]: " + _("Fields cannot be set: {0}").format(", ".join(unknown))
+				)
+	if set(delete) & {row["name"] for row in update}:
+		errors.append(_("A contact person cannot be updated and deleted in the same call"))
+	if errors:
+		frappe.throw("<br>".join(errors), title=_("Contact persons were not saved"))
+
+	result = {"created": [], "updated": [], "deleted": []}
+	frappe.db.savepoint("sync_contact_persons")
+
+	for index, name in enumerate(delete):
+		if run_change(
+			errors, f"delete[{index}]", frappe.delete_doc, "Contact Person", name, ignore_permissions=True
+		):
+			result["deleted"].append(name)
+
+	for index, row in enumerate(update):
+		doc = apply_contact_row(frappe.get_doc("Contact Person", row["name"]), row)
+		if run_change(errors, f"update[{index}]", doc.save, ignore_permissions=True):
+			result["updated"].append(doc.name)
+
+	for index, row in enumerate(create):
+		doc = apply_contact_row(frappe.new_doc("Contact Person", supplier_link=supplier_name), row)
+		if run_change(errors, f"create[{index}]", doc.insert, ignore_permissions=True):
+			result["created"].append(doc.name)
+
+	if not errors:
+		errors = [
+			_("Email {0} is used by more than one contact person").format(email)
+			for email in frappe.db.sql_list(
+				"""select email_normalized from `tabContact Person`
+				where supplier_link = %s and email_normalized != ''
+				group by email_normalized having count(*) > 1""",
+				supplier_name,
+			)
+		]
+
+	if errors:
+		frappe.db.rollback(save_point="sync_contact_persons")
+		# Drop the messages of the individual failures; they are all in the one below
+		frappe.clear_messages()
+		frappe.throw("<br>".join(errors), title=_("Contact persons were not saved"))
+
+	return result
+
+
+def apply_contact_row(doc, row):
+	for field in CONTACT_FIELDS:
+		if field in row:
+			doc.set(field, row[field])
+	if "assigned_roles" in row:
+		doc.set(
+			"assigned_roles",
+			[
+				{"role": role.get("role") if isinstance(role, dict) else role}
+				for role in row["assigned_roles"] or []
+			],
+		)
+	return doc
+
+
+def run_change(errors, label, change, *args, **kwargs):
+	"""Run change(*args, **kwargs), collecting its validation error instead of stopping the batch."""
+	try:
+		change(*args, **kwargs)
+		return True
+	except frappe.ValidationError as e:
+		errors.append(f"{label}: {strip_html(str(e))}")
+		return False
@@ -1,9 +1,14 @@
 # Copyright (c) 2025, Tzvi and Contributors
 # See license.txt
 
-# import frappe
-from frappe.tests import IntegrationTestCase
+import frappe
+from frappe.tests import IntegrationTestCase, UnitTestCase
 
+from siud.siud.doctype.contact_person.contact_person import (
+	normalize_email,
+	normalize_phone,
+	sync_contact_persons,
+)
 
 # On IntegrationTestCase, the doctype test records and all
 # link-field test record dependencies are recursively loaded
@@ -12,6 +17,17 @@ EXTRA_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
 IGNORE_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
 
 
+class UnitTestContactPerson(UnitTestCase):
+	"""
+	Unit tests for ContactPerson.
+	"""
+
+	def test_normalize(self):
+		self.assertEqual(normalize_email(" Dana@Example.COM "), "dana@example.com")
+		for phone in ("+972 (50) 123-4567", "972501234567", "050-1234567"):
+			self.assertEqual(normalize_phone(phone), "0501234567")
+		self.assertEqual(normalize_phone(None), "")
+
 
 class IntegrationTestContactPerson(IntegrationTestCase):
 	"""
@@ -19,4 +35,58 @@ class IntegrationTestContactPerson(IntegrationTestCase):
 	Use this class for testing interactions between multiple components.
 	"""
 
-	pass
+	def setUp(self):
+		for supplier_id in ("_CP-SUP-1", "_CP-SUP-2"):
+			for name in frappe.get_all(
+				"Contact Person", filters={"supplier_link": supplier_id}, pluck="name"
+			):
+				frappe.delete_doc("Contact Person", name, ignore_permissions=True)
+			if not frappe.db.exists("Supplier", supplier_id):
+				frappe.get_doc(
+					{"doctype": "Supplier", "supplier_id": supplier_id, "supplier_name": supplier_id}
+				).insert(ignore_permissions=True)
+
+	def test_sync(self):
+		result = sync_contact_persons(
+			"_CP-SUP-1",
+			create=[
+				{"contact_name": "דנה", "email": "Dana@Example.com", "mobile_phone": "+972-50-1234567"},
+				{"contact_name": "יוסי"},
+			],
+		)
+		dana, yossi = result["created"]
+		self.assertEqual(
+			frappe.db.get_value("Contact Person", dana, ["email_normalized", "phone_normalized"]),
+			("dana@example.com", "0501234567"),
+		)
+
+		result = sync_contact_persons("_CP-SUP-1", update=[{"name": dana, "branch": "חיפה"}], delete=[yossi])
+		self.assertEqual((result["updated"], result["deleted"]), ([dana], [yossi]))
+		self.assertEqual(frappe.db.get_value("Contact Person", dana, "branch"), "חיפה")
+		self.assertFalse(frappe.db.exists("Contact Person", yossi))
+
+	def test_other_supplier_contacts_are_rejected(self):
+		other = sync_contact_persons("_CP-SUP-2", create=[{"contact_name": "אחר"}])["created"][0]
+		self.assertRaises(frappe.PermissionError, sync_contact_persons, "_CP-SUP-1", delete=[other])
+		self.assertRaises(
+			frappe.PermissionError, sync_contact_persons, "_CP-SUP-1", update=[{"name": other, "branch": "x"}]
+		)
+		self.assertTrue(frappe.db.exists("Contact Person", other))
+
+	def test_failed_batch_is_rolled_back(self):
+		self.assertRaises(
+			frappe.ValidationError,
+			sync_contact_persons,
+			"_CP-SUP-1",
+			create=[
+				{"contact_name": "א", "email": "same@example.com"},
+				{"contact_name": "ב", "email": "SAME@example.com"},
+			],
+		)
+		self.assertRaises(
+			frappe.ValidationError,
+			sync_contact_persons,
+			"_CP-SUP-1",
+			create=[{"contact_name": "ג"}, {"contact_name": ""}],
+		)
+		self.assertFalse(frappe.db.exists("Contact Person", {"supplier_link": "_CP-SUP-1"}))
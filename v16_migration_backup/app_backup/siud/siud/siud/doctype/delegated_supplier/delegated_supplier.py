@@ -1,9 +1,11 @@
 # Copyright (c) 2025, Tzvi and contributors
 # For license information, please see license.txt
 
-# import frappe
 from frappe.model.document import Document
 
+from siud.utils.domain_mask import get_mask
+
 
 class DelegatedSupplier(Document):
-	pass
+	def validate(self):
+		self.scope_mask = get_mask(row.activity_domain_category for row in self.delegation_scope)
@@ -0,0 +1,15 @@
+# Copyright (c) 2025, Tzvi and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class InquiryDailyRollup(Document):
+	pass
+
+
+def on_doctype_update():
+	"""Per-supplier and per-topic report ranges read only the index."""
+	frappe.db.add_index("Inquiry Daily Rollup", ["supplier_link", "rollup_date"])
+	frappe.db.add_index("Inquiry Daily Rollup", ["topic_category", "rollup_date"])
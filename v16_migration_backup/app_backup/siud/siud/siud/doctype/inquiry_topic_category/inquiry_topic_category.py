@@ -1,9 +1,14 @@
 # Copyright (c) 2025, Tzvi and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.utils.nestedset import NestedSet
 
 
 class InquiryTopicCategory(NestedSet):
 	pass
+
+
+def on_doctype_update():
+	"""Composite index for loading one level of the tree (topic picker)."""
+	frappe.db.add_index("Inquiry Topic Category", ["parent_inquiry_topic_category", "category_name"])
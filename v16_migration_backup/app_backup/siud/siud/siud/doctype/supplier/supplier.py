@@ -2,11 +2,246 @@
 # For license information, please see license.txt
 
 import frappe
+from frappe import _
 from frappe.model.document import Document
+from frappe.utils import get_datetime, now, validate_email_address, validate_phone_number
+
+from siud.utils import cache
+from siud.utils.domain_mask import get_mask
+from siud.utils.supplier_search import index_suppliers
+
+# Fields a portal user may edit on their own supplier
+PROFILE_FIELDS = ("supplier_name", "phone", "email", "address")
 
 
 class Supplier(Document):
-	pass
+	def validate(self):
+		self.activity_domain_mask = get_mask(row.activity_domain_category for row in self.activity_domains)
+
+
+def get_user_identity(user):
+	"""
+	Get the cached identity of a user: supplier_link and display names.
+
+	Args:
+		user: User name (email)
+
+	Returns:
+		dict: {"supplier_link": str, "full_name": str, "first_name": str}, or {} if the user does not exist
+	"""
+	return cache.get("identity", user, lambda: _load_user_identity(user))
+
+
+def _load_user_identity(user):
+	identity = frappe.db.get_value("User", user, ["supplier_link", "full_name", "first_name"], as_dict=True)
+	return dict(identity) if identity else {}
+
+
+def get_supplier_summary(supplier_name):
+	"""
+	Get the cached summary fields of a supplier.
+
+	Args:
+		supplier_name: Supplier document name
+
+	Returns:
+		dict: {"name": str, "supplier_id": str, "supplier_name": str}, or {} if not found
+	"""
+	return cache.get("supplier_summary", supplier_name, lambda: _load_supplier_summary(supplier_name))
+
+
+def _load_supplier_summary(supplier_name):
+	summary = frappe.db.get_value(
+		"Supplier", supplier_name, ["name", "supplier_id", "supplier_name"], as_dict=True
+	)
+	return dict(summary) if summary else {}
+
+
+def get_supplier_profile(supplier_name):
+	"""
+	Get the cached profile of a supplier with its activity domains and contact persons.
+
+	Assembled with two joined queries (see _load_supplier_profile) and
+	invalidated by siud.utils.cache_events when the supplier, one of its
+	contact persons or a referenced category/role changes.
+
+	Args:
+		supplier_name: Supplier document name
+
+	Returns:
+		dict: {
+			"name", "supplier_id", "supplier_name", "phone", "email", "address", "modified",
+			"activity_domains": [{"activity_domain_category", "category_name"}],
+			"contact_persons": [{"name", "contact_name", "supplier_link", "email", "mobile_phone",
+				"branch", "primary_role_type", "assigned_roles": [{"role", "role_title_he"}]}]
+		}, or {} if not found
+	"""
+	return cache.get("supplier_profile", supplier_name, lambda: _load_supplier_profile(supplier_name))
+
+
+def _load_supplier_profile(supplier_name):
+	# Supplier fields with one row per activity domain
+	rows = frappe.db.sql(
+		"""select s.name, s.supplier_id, s.supplier_name, s.phone, s.email, s.address, s.modified,
+			ad.activity_domain_category, adc.category_name
+		from `tabSupplier` s
+		left join `tabSupplier Activity Domain` ad
+			on ad.parent = s.name and ad.parenttype = 'Supplier' and ad.parentfield = 'activity_domains'
+		left join `tabActivity Domain Category` adc on adc.name = ad.activity_domain_category
+		where s.name = %s
+		order by ad.idx""",
+		supplier_name,
+		as_dict=True,
+	)
+	if not rows:
+		return {}
+
+	first = rows[0]
+	profile = {
+		"name": first.name,
+		"supplier_id": first.supplier_id,
+		"supplier_name": first.supplier_name or "",
+		"phone": first.phone or "",
+		"email": first.email or "",
+		"address": first.address or "",
+		"modified": str(first.modified),
+		"activity_domains": [
+			{
+				"activity_domain_category": row.activity_domain_category,
+				"category_name": row.category_name or row.activity_domain_category,
+			}
+			for row in rows
+			if row.activity_domain_category
+		],
+		"contact_persons": [],
+	}
+
+	# Contact persons with one row per assigned role
+	contacts = {}
+	for row in frappe.db.sql(
+		"""select cp.name, cp.contact_name, cp.supplier_link, cp.email, cp.mobile_phone, cp.branch,
+			cp.primary_role_type, cpr.role, sr.role_title_he
+		from `tabContact Person` cp
+		left join `tabContact Person Role` cpr
+			on cpr.parent = cp.name and cpr.parenttype = 'Contact Person' and cpr.parentfield = 'assigned_roles'
+		left join `tabSupplier Role` sr on sr.name = cpr.role
+		where cp.supplier_link = %s
+		order by cp.contact_name, cp.name, cpr.idx""",
+		supplier_name,
+		as_dict=True,
+	):
+		contact = contacts.get(row.name)
+		if contact is None:
+			contact = contacts[row.name] = {
+				"name": row.name,
+				"contact_name": row.contact_name or "",
+				"supplier_link": row.supplier_link,
+				"email": row.email or "",
+				"mobile_phone": row.mobile_phone or "",
+				"branch": row.branch or "",
+				"primary_role_type": row.primary_role_type or "",
+				"assigned_roles": [],
+			}
+			profile["contact_persons"].append(contact)
+		if row.role:
+			contact["assigned_roles"].append(
+				{"role": row.role, "role_title_he": row.role_title_he or row.role}
+			)
+
+	return profile
+
+
+def patch_supplier_profile(supplier_name, changes, modified=None):
+	"""
+	Write only the profile fields that actually changed.
+
+	The row is locked with SELECT ... FOR UPDATE and compared with the
+	incoming values; unchanged fields are dropped and nothing is written when
+	no field changed. A Version entry records the old and new values, since
+	save() (which would validate and rewrite the whole document with its
+	child tables) is bypassed.
+
+	Args:
+		supplier_name: Supplier document name
+		changes: dict of PROFILE_FIELDS to new values
+		modified: The modified timestamp the client loaded; if given and the
+			row was modified since, nothing is written
+
+	Returns:
+		dict: {"changed": [fieldnames], "modified": str}
+
+	Raises:
+		frappe.TimestampMismatchError: If modified does not match the current row
+		frappe.ValidationError: On unknown fields or invalid values
+	"""
+	unknown = sorted(set(changes) - set(PROFILE_FIELDS))
+	if unknown:
+		frappe.throw(_("These fields cannot be updated: {0}").format(", ".join(unknown)))
+
+	fields = ", ".join(f"`{field}`" for field in PROFILE_FIELDS)
+	current = frappe.db.sql(
+		f"select modified, {fields} from `tabSupplier` where name = %s for update",
+		supplier_name,
+		as_dict=True,
+	)
+	if not current:
+		raise frappe.DoesNotExistError(_("Supplier {0} not found").format(supplier_name))
+	current = current[0]
+
+	if modified and get_datetime(modified) != current.modified:
+		frappe.throw(
+			_("The profile was changed by someone else in the meantime. Please reload it and try again."),
+			frappe.TimestampMismatchError,
+		)
+
+	changed = {}
+	for field, value in changes.items():
+		value = (value or "").strip()
+		if value != (current[field] or ""):
+			changed[field] = value
+	if not changed:
+		return {"changed": [], "modified": str(current.modified)}
+
+	validate_profile_fields(changed)
+
+	timestamp = now()
+	frappe.db.set_value(
+		"Supplier",
+		supplier_name,
+		{**changed, "modified": timestamp, "modified_by": frappe.session.user},
+		update_modified=False,
+	)
+	frappe.get_doc(
+		{
+			"doctype": "Version",
+			"ref_doctype": "Supplier",
+			"docname": supplier_name,
+			"data": frappe.as_json(
+				{
+					"changed": [[field, current[field], value] for field, value in changed.items()],
+					"added": [],
+					"removed": [],
+					"row_changed": [],
+				}
+			),
+		}
+	).insert(ignore_permissions=True)
+
+	# The document hooks (cache_events, supplier_search) do not run without save()
+	cache.invalidate("supplier_summary", supplier_name)
+	cache.invalidate("supplier_profile", supplier_name)
+	index_suppliers([supplier_name])
+
+	return {"changed": list(changed), "modified": timestamp}
+
+
+def validate_profile_fields(values):
+	if "supplier_name" in values and not values["supplier_name"]:
+		frappe.throw(_("Supplier name is required"))
+	if values.get("email"):
+		validate_email_address(values["email"], throw=True)
+	if values.get("phone"):
+		validate_phone_number(values["phone"], throw=True)
 
 
 def has_website_permission(doc, ptype, user, verbose=False):
@@ -26,9 +261,8 @@ def has_website_permission(doc, ptype, user, verbose=False):
 	if not user:
 		return False
 
-	# Get the supplier_link from the User document
-	user_doc = frappe.get_doc("User", user)
-	user_supplier_link = user_doc.get("supplier_link")
+	# Get the supplier_link of the user (cached identity, not a full User load per document)
+	user_supplier_link = get_user_identity(user).get("supplier_link")
 
 	if verbose:
 		frappe.msgprint(f"User: {user}, User Supplier Link: {user_supplier_link}, Doc Name: {doc.name}")
@@ -1,9 +1,15 @@
 # Copyright (c) 2025, Tzvi and Contributors
 # See license.txt
 
-# import frappe
+import frappe
 from frappe.tests import IntegrationTestCase
 
+from siud.siud.doctype.supplier.supplier import (
+	_load_supplier_profile,
+	get_supplier_profile,
+	get_supplier_summary,
+	patch_supplier_profile,
+)
 
 # On IntegrationTestCase, the doctype test records and all
 # link-field test record dependencies are recursively loaded
@@ -12,11 +18,101 @@ EXTRA_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
 IGNORE_TEST_RECORD_DEPENDENCIES = []  # eg. ["User"]
 
 
-
 class IntegrationTestSupplier(IntegrationTestCase):
 	"""
 	Integration tests for Supplier.
 	Use this class for testing interactions between multiple components.
 	"""
 
-	pass
+	def setUp(self):
+		# Records persist between tests of the class, so start each one from scratch
+		frappe.db.delete("Contact Person", {"supplier_link": "_PATCH-1"})
+		frappe.db.delete("Version", {"ref_doctype": "Supplier", "docname": "_PATCH-1"})
+		if frappe.db.exists("Supplier", "_PATCH-1"):
+			frappe.delete_doc("Supplier", "_PATCH-1", ignore_permissions=True, force=True)
+
+		self.supplier = frappe.get_doc(
+			{"doctype": "Supplier", "supplier_id": "_PATCH-1", "supplier_name": "ספק", "phone": "03-1234567"}
+		).insert(ignore_permissions=True)
+
+	def test_patch_writes_changed_fields_only(self):
+		result = patch_supplier_profile(self.supplier.name, {"supplier_name": "ספק", "address": "רחוב 1"})
+
+		self.assertEqual(result["changed"], ["address"])
+		self.assertEqual(frappe.db.get_value("Supplier", self.supplier.name, "address"), "רחוב 1")
+
+		version = frappe.get_last_doc(
+			"Version", filters={"ref_doctype": "Supplier", "docname": self.supplier.name}
+		)
+		self.assertEqual(frappe.parse_json(version.data)["changed"], [["address", None, "רחוב 1"]])
+
+	def test_patch_without_changes_writes_nothing(self):
+		result = patch_supplier_profile(self.supplier.name, {"phone": " 03-1234567 "}, self.supplier.modified)
+
+		self.assertEqual(result["changed"], [])
+		self.assertEqual(
+			frappe.db.get_value("Supplier", self.supplier.name, "modified"), self.supplier.modified
+		)
+		self.assertFalse(
+			frappe.db.exists("Version", {"ref_doctype": "Supplier", "docname": self.supplier.name})
+		)
+
+	def test_patch_rejects_stale_token(self):
+		token = self.supplier.modified
+		result = patch_supplier_profile(self.supplier.name, {"supplier_name": "ספק חדש"}, token)
+
+		self.assertEqual(get_supplier_summary(self.supplier.name)["supplier_name"], "ספק חדש")
+		self.assertRaises(
+			frappe.TimestampMismatchError,
+			patch_supplier_profile,
+			self.supplier.name,
+			{"supplier_name": "ספק ישן"},
+			token,
+		)
+		patch_supplier_profile(self.supplier.name, {"supplier_name": "ספק ישן"}, result["modified"])
+
+	def test_patch_rejects_other_fields(self):
+		self.assertRaises(
+			frappe.ValidationError, patch_supplier_profile, self.supplier.name, {"supplier_id": "X"}
+		)
+		self.assertRaises(
+			frappe.ValidationError, patch_supplier_profile, self.supplier.name, {"email": "not-an-email"}
+		)
+
+	def test_profile_assembly(self):
+		if not frappe.db.exists("Activity Domain Category", "_PROF-ADC"):
+			frappe.get_doc(
+				{"doctype": "Activity Domain Category", "category_code": "_PROF-ADC", "category_name": "תחום"}
+			).insert(ignore_permissions=True)
+		if not frappe.db.exists("Supplier Role", "_Prof Role"):
+			frappe.get_doc(
+				{"doctype": "Supplier Role", "role_name": "_Prof Role", "role_title_he": "תפקיד"}
+			).insert(ignore_permissions=True)
+		self.supplier.append("activity_domains", {"activity_domain_category": "_PROF-ADC"})
+		self.supplier.save(ignore_permissions=True)
+
+		self.assertEqual(get_supplier_profile(self.supplier.name)["contact_persons"], [])
+
+		contact = frappe.get_doc(
+			{
+				"doctype": "Contact Person",
+				"contact_name": "איש קשר",
+				"supplier_link": self.supplier.name,
+				"assigned_roles": [{"role": "_Prof Role"}],
+			}
+		).insert(ignore_permissions=True)
+
+		with self.assertQueryCount(2):
+			_load_supplier_profile(self.supplier.name)
+
+		# Cached profile was invalidated by the Contact Person insert
+		profile = get_supplier_profile(self.supplier.name)
+		self.assertEqual(
+			profile["activity_domains"], [{"activity_domain_category": "_PROF-ADC", "category_name": "תחום"}]
+		)
+		self.assertEqual(profile["contact_persons"][0]["name"], contact.name)
+		self.assertEqual(
+			profile["contact_persons"][0]["assigned_roles"],
+			[{"role": "_Prof Role", "role_title_he": "תפקיד"}],
+		)
+		self.assertEqual(get_supplier_profile("_missing supplier"), {})
@@ -0,0 +1,65 @@
+# Copyright (c) 2025, Tzvi and contributors
+# For license information, please see license.txt
+
+"""
+Inquiry Status Codes
+
+The single authoritative mapping between the Hebrew inquiry_status labels shown
+to users (and used as workflow states) and the compact codes stored in the
+indexed status_code column. Filters and counts should use the codes; labels are
+for display only.
+"""
+
+OPEN = "open"
+CLOSED = "closed"
+
+# code: (Hebrew label, open/closed class) - in workflow order
+STATUSES = {
+	"new": ("פנייה חדשה התקבלה", OPEN),
+	"triage": ("מיון וניתוב", OPEN),
+	"in_progress": ("בטיפול", OPEN),
+	"pending": ("דורש השלמות / המתנה", OPEN),
+	"answered": ("נסגר – ניתן מענה", CLOSED),
+	"closed": ("סגור", CLOSED),
+}
+
+DEFAULT = "new"
+
+_CODES_BY_LABEL = {label: code for code, (label, _status_class) in STATUSES.items()}
+
+
+def get_label(code):
+	"""Hebrew label for a status code."""
+	return STATUSES[code][0]
+
+
+def get_code(label):
+	"""
+	Status code for a Hebrew label.
+
+	Returns:
+		str: The code, or None for an unknown (or empty) label
+	"""
+	return _CODES_BY_LABEL.get(label)
+
+
+def to_code(status):
+	"""Accept either a code or a Hebrew label (API filters) and return the code."""
+	return status if status in STATUSES else get_code(status)
+
+
+def get_codes(status_class):
+	"""All codes of one class (OPEN or CLOSED)."""
+	return [code for code, (_label, cls) in STATUSES.items() if cls == status_class]
+
+
+def is_open(code):
+	return code in STATUSES and STATUSES[code][1] == OPEN
+
+
+def as_options():
+	"""Statuses for reference data / select inputs."""
+	return [
+		{"value": label, "code": code, "label": label, "type": status_class}
+		for code, (label, status_class) in STATUSES.items()
+	]
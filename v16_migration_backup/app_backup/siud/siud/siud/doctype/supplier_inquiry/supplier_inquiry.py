@@ -4,9 +4,27 @@
 import frappe
 from frappe.model.document import Document
 
+from siud.siud.doctype.supplier.supplier import get_user_identity
+from siud.siud.doctype.supplier_inquiry.inquiry_status import get_code
+
 
 class SupplierInquiry(Document):
-	pass
+	def validate(self):
+		self.set_status_code()
+
+	def before_update_after_submit(self):
+		# Workflow transitions on submitted inquiries do not run validate
+		self.set_status_code()
+
+	def set_status_code(self):
+		# Filters and counts use the indexed code; the label stays for display and workflow
+		self.status_code = get_code(self.inquiry_status)
+
+
+def on_doctype_update():
+	"""Composite indexes for the per-supplier status filters and counts, and for archiving."""
+	frappe.db.add_index("Supplier Inquiry", ["supplier_link", "status_code"])
+	frappe.db.add_index("Supplier Inquiry", ["status_code", "modified"])
 
 
 def has_website_permission(doc, ptype, user, verbose=False):
@@ -26,12 +44,13 @@ def has_website_permission(doc, ptype, user, verbose=False):
 	if not user:
 		return False
 
-	# Get the supplier_link from the User document
-	user_doc = frappe.get_doc("User", user)
-	user_supplier_link = user_doc.get("supplier_link")
+	# Get the supplier_link of the user (cached identity, not a full User load per document)
+	user_supplier_link = get_user_identity(user).get("supplier_link")
 
 	if verbose:
-		frappe.msgprint(f"User: {user}, User Supplier Link: {user_supplier_link}, Doc Supplier Link: {doc.supplier_link}")
+		frappe.msgprint(
+			f"User: {user}, User Supplier Link: {user_supplier_link}, Doc Supplier Link: {doc.supplier_link}"
+		)
 
 	# Portal users can only see inquiries linked to their supplier
 	if user_supplier_link and doc.supplier_link:
@@ -58,8 +77,7 @@ def get_list_context(context=None):
 	# Get current user's supplier link
 	user = frappe.session.user
 	if user and user != "Guest":
-		user_doc = frappe.get_doc("User", user)
-		supplier_link = user_doc.get("supplier_link")
+		supplier_link = get_user_identity(user).get("supplier_link")
 
 		if supplier_link:
 			# Add filter to only show inquiries for this supplier
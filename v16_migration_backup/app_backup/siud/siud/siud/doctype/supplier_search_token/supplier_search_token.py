@@ -0,0 +1,14 @@
+# Copyright (c) 2025, Tzvi and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class SupplierSearchToken(Document):
+	pass
+
+
+def on_doctype_update():
+	"""Prefix lookups (token LIKE 'abc%') resolve to suppliers from the index alone."""
+	frappe.db.add_index("Supplier Search Token", ["token", "supplier"])
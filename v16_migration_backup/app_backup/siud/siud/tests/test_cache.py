@@ -0,0 +1,88 @@
+# Copyright (c) 2025, Tzvi and Contributors
+# See license.txt
+
+import time
+
+import frappe
+from frappe.tests import IntegrationTestCase, UnitTestCase
+
+from siud.utils import cache
+from siud.utils.cache import LRUCache
+
+
+class UnitTestLRUCache(UnitTestCase):
+	"""
+	Unit tests for the in-process LRU tier.
+	"""
+
+	def test_evicts_least_recently_used_entry(self):
+		lru = LRUCache(max_entries=2)
+		lru.set("a", b"1", ttl=60)
+		lru.set("b", b"2", ttl=60)
+		lru.get("a")
+		lru.set("c", b"3", ttl=60)
+
+		self.assertEqual(lru.get("a"), b"1")
+		self.assertIsNone(lru.get("b"))
+
+	def test_evicts_by_size(self):
+		lru = LRUCache(max_bytes=10)
+		lru.set("a", b"12345", ttl=60)
+		lru.set("b", b"123456", ttl=60)
+
+		self.assertIsNone(lru.get("a"))
+		self.assertEqual(lru.size, 6)
+
+	def test_expired_entries_are_dropped(self):
+		lru = LRUCache()
+		lru.set("a", b"1", ttl=0.01)
+		time.sleep(0.02)
+
+		self.assertIsNone(lru.get("a"))
+		self.assertEqual(len(lru), 0)
+
+	def test_delete_prefix(self):
+		lru = LRUCache()
+		lru.set("site|ns|a", b"1", ttl=60)
+		lru.set("site|ns|b", b"2", ttl=60)
+		lru.set("site|other|a", b"3", ttl=60)
+		lru.delete_prefix("site|ns|")
+
+		self.assertEqual(len(lru), 1)
+
+
+class IntegrationTestTwoTierCache(IntegrationTestCase):
+	"""
+	Integration tests for the Redis-backed cache API.
+	"""
+
+	def test_get_set_invalidate(self):
+		calls = []
+
+		def generate():
+			calls.append(1)
+			return {"value": 1}
+
+		cache.invalidate("reference", "test-key")
+		self.assertEqual(cache.get("reference", "test-key", generate), {"value": 1})
+		self.assertEqual(cache.get("reference", "test-key", generate), {"value": 1})
+		self.assertEqual(len(calls), 1)
+
+		cache.invalidate("reference", "test-key")
+		self.assertIsNone(cache.get("reference", "test-key"))
+
+	def test_cached_values_are_copies(self):
+		cache.set_value("reference", "test-copy", {"items": [1]})
+		cache.get("reference", "test-copy")["items"].append(2)
+
+		self.assertEqual(cache.get("reference", "test-copy"), {"items": [1]})
+		cache.invalidate("reference", "test-copy")
+
+	def test_invalidate_namespace(self):
+		cache.set_value("reference", "test-a", 1)
+		cache.set_value("reference", "test-b", 2)
+
+		cache.invalidate("reference")
+
+		self.assertIsNone(cache.get("reference", "test-a"))
+		self.assertIsNone(cache.get("reference", "test-b"))
@@ -0,0 +1,115 @@
+# Copyright (c) 2025, Tzvi and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests import IntegrationTestCase
+from frappe.utils import today
+
+from siud.patches.v1_0.backfill_activity_domain_masks import execute as backfill_masks
+from siud.siud.doctype.activity_domain_category.activity_domain_category import on_doctype_update
+from siud.utils import cache
+from siud.utils.domain_mask import (
+	get_domains,
+	get_mask,
+	get_suppliers_in_domains,
+	is_domain_in_scope,
+	mask_condition,
+)
+
+DOMAINS = ("_MASK-A", "_MASK-B", "_MASK-C")
+
+
+class IntegrationTestDomainMask(IntegrationTestCase):
+	"""
+	Integration tests for activity domain bitmasks.
+	"""
+
+	def setUp(self):
+		for code in DOMAINS:
+			if not frappe.db.exists("Activity Domain Category", code):
+				frappe.get_doc(
+					{"doctype": "Activity Domain Category", "category_code": code, "category_name": code}
+				).insert(ignore_permissions=True)
+
+		for supplier_id, domains in (
+			("_MASK-1", ["_MASK-A"]),
+			("_MASK-2", ["_MASK-A", "_MASK-B"]),
+			("_MASK-3", []),
+		):
+			if frappe.db.exists("Supplier", supplier_id):
+				frappe.delete_doc("Supplier", supplier_id, ignore_permissions=True, force=True)
+			frappe.get_doc(
+				{
+					"doctype": "Supplier",
+					"supplier_id": supplier_id,
+					"supplier_name": supplier_id,
+					"activity_domains": [{"activity_domain_category": domain} for domain in domains],
+				}
+			).insert(ignore_permissions=True)
+
+	def test_bits_are_unique(self):
+		bits = [frappe.db.get_value("Activity Domain Category", code, "bit_index") for code in DOMAINS]
+		self.assertTrue(all(bit >= 0 for bit in bits))
+		self.assertEqual(len(set(bits)), len(bits))
+		self.assertEqual(get_domains(get_mask(DOMAINS)), sorted(DOMAINS))
+
+	def test_suppliers_in_domains(self):
+		def matching(domains, match_all=False):
+			return [
+				name for name in get_suppliers_in_domains(domains, match_all) if name.startswith("_MASK-")
+			]
+
+		self.assertEqual(matching(["_MASK-A"]), ["_MASK-1", "_MASK-2"])
+		self.assertEqual(matching(["_MASK-B", "_MASK-C"]), ["_MASK-2"])
+		self.assertEqual(matching(["_MASK-A", "_MASK-B"], match_all=True), ["_MASK-2"])
+		self.assertEqual(mask_condition(["no such domain"]), "1 = 0")
+
+	def test_mask_follows_save(self):
+		supplier = frappe.get_doc("Supplier", "_MASK-1")
+		supplier.set("activity_domains", [{"activity_domain_category": "_MASK-C"}])
+		supplier.save(ignore_permissions=True)
+		self.assertEqual(
+			frappe.db.get_value("Supplier", "_MASK-1", "activity_domain_mask"), get_mask(["_MASK-C"])
+		)
+
+	def test_delegation_scope(self):
+		delegation = frappe.get_doc(
+			{
+				"doctype": "Delegated Supplier",
+				"delegating_supplier": "_MASK-1",
+				"delegated_supplier": "_MASK-2",
+				"valid_from": today(),
+				"delegation_scope": [{"activity_domain_category": "_MASK-B"}],
+			}
+		).insert(ignore_permissions=True)
+
+		self.assertTrue(is_domain_in_scope(delegation.name, "_MASK-B"))
+		self.assertFalse(is_domain_in_scope(delegation.name, "_MASK-A"))
+
+	def test_backfill_existing_categories(self):
+		# As after model sync on a site that had categories before bit_index:
+		# every row is -1 (unassigned) and the masks are empty
+		frappe.db.sql_ddl("alter table `tabActivity Domain Category` drop index if exists unique_bit_index")
+		frappe.db.sql(
+			"update `tabActivity Domain Category` set bit_index = -1 where name in %s", (list(DOMAINS),)
+		)
+		frappe.db.sql("update `tabSupplier` set activity_domain_mask = 0 where name like '\\_MASK-%%'")
+		cache.invalidate("reference")
+
+		on_doctype_update()
+		self.assertFalse(self.has_unique_index())
+
+		backfill_masks()
+
+		bits = [frappe.db.get_value("Activity Domain Category", code, "bit_index") for code in DOMAINS]
+		self.assertTrue(all(bit >= 0 for bit in bits))
+		self.assertEqual(len(set(bits)), len(bits))
+		self.assertTrue(self.has_unique_index())
+		self.assertEqual(
+			[name for name in get_suppliers_in_domains(["_MASK-B"]) if name.startswith("_MASK-")], ["_MASK-2"]
+		)
+
+	def has_unique_index(self):
+		return bool(
+			frappe.db.sql("show index from `tabActivity Domain Category` where Key_name = 'unique_bit_index'")
+		)
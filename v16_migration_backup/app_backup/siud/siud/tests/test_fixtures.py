@@ -0,0 +1,76 @@
+# Copyright (c) 2025, Tzvi and Contributors
+# See license.txt
+
+import os
+import shutil
+import tempfile
+
+import frappe
+from frappe.tests import IntegrationTestCase, UnitTestCase
+
+from siud.utils.fixtures import (
+	escape_tsv,
+	export_fixtures,
+	format_tsv,
+	import_fixtures,
+	iter_file,
+	unescape_tsv,
+)
+
+
+class UnitTestFixtures(UnitTestCase):
+	"""
+	Unit tests for the fixture file formats.
+	"""
+
+	def setUp(self):
+		self.path = tempfile.mkdtemp()
+		self.addCleanup(shutil.rmtree, self.path)
+
+	def test_tsv_escaping_round_trip(self):
+		for value in ("קטגוריה", "a\tb", "line\nbreak", "back\\slash", ""):
+			self.assertEqual(unescape_tsv(escape_tsv(value)), value)
+
+	def test_null(self):
+		self.assertEqual(escape_tsv(None), "\\N")
+		self.assertIsNone(unescape_tsv("\\N"))
+		self.assertIsNone(unescape_tsv("NULL"))
+
+	def test_tsv_file_is_read_in_batches(self):
+		file_path = os.path.join(self.path, "supplier_role.tsv")
+		with open(file_path, "w", encoding="utf-8") as f:
+			f.write("name\trole_title_he\n")
+			f.write(format_tsv(("R-1", "מנהל\tראשי")))
+			f.write(format_tsv(("R-2", None)))
+
+		rows = [row for batch in iter_file(file_path) for row in batch]
+		self.assertEqual(
+			rows, [{"name": "R-1", "role_title_he": "מנהל\tראשי"}, {"name": "R-2", "role_title_he": None}]
+		)
+
+	def test_empty_file(self):
+		file_path = os.path.join(self.path, "supplier_role.tsv")
+		open(file_path, "w").close()
+		self.assertEqual(list(iter_file(file_path)), [])
+
+
+class IntegrationTestFixtures(IntegrationTestCase):
+	"""
+	Integration tests for export and re-import.
+	"""
+
+	def setUp(self):
+		self.path = tempfile.mkdtemp()
+		self.addCleanup(shutil.rmtree, self.path)
+
+	def test_round_trip(self):
+		for format in ("tsv", "jsonl"):
+			counts = export_fixtures(self.path, format=format, doctypes=["Supplier Role"])
+			self.assertEqual(counts["Supplier Role"], frappe.db.count("Supplier Role"))
+
+			before = frappe.get_all("Supplier Role", fields=["*"], order_by="name")
+			self.assertEqual(
+				import_fixtures(self.path, doctypes=["Supplier Role"]).get("Supplier Role", 0), len(before)
+			)
+			self.assertEqual(frappe.get_all("Supplier Role", fields=["*"], order_by="name"), before)
+			os.remove(os.path.join(self.path, f"supplier_role.{format}"))
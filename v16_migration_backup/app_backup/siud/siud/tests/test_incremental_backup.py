@@ -0,0 +1,96 @@
+# Copyright (c) 2025, Tzvi and Contributors
+# See license.txt
+
+import json
+import os
+import shutil
+import tempfile
+
+import frappe
+from frappe.tests import IntegrationTestCase, UnitTestCase
+
+from siud.utils.incremental_backup import (
+	GLOBAL_KEY,
+	backup,
+	get_backup_root,
+	get_checkpoint,
+	get_file_path,
+	read_chunk,
+	resolve_chain,
+	write_chunks,
+)
+
+
+class UnitTestIncrementalBackup(UnitTestCase):
+	"""
+	Unit tests for chunk files and backup chains.
+	"""
+
+	def setUp(self):
+		self.path = tempfile.mkdtemp()
+		self.addCleanup(shutil.rmtree, self.path)
+
+	def test_chunks_round_trip(self):
+		records = [
+			{"doctype": "Supplier", "row": {"name": f"S-{i}", "supplier_name": "ספק"}} for i in range(5)
+		]
+		result = write_chunks(self.path, "supplier", iter(records), chunk_rows=2)
+
+		self.assertEqual(result["rows"], 5)
+		self.assertEqual([chunk["rows"] for chunk in result["chunks"]], [2, 2, 1])
+		read = [record for chunk in result["chunks"] for record in read_chunk(self.path, chunk)]
+		self.assertEqual(read, records)
+
+	def test_no_records_no_chunks(self):
+		self.assertEqual(write_chunks(self.path, "supplier", iter([])), {"rows": 0, "chunks": []})
+
+	def test_corrupt_chunk_is_rejected(self):
+		chunk = write_chunks(self.path, "supplier", iter([{"doctype": "Supplier", "row": {}}]))["chunks"][0]
+		chunk["sha256"] = "0" * 64
+		self.assertRaises(frappe.ValidationError, read_chunk, self.path, chunk)
+
+	def test_chain_is_resolved_from_base(self):
+		for name, parent in (("1-base", None), ("2-incr", "1-base"), ("3-incr", "2-incr")):
+			os.makedirs(os.path.join(self.path, name))
+			with open(os.path.join(self.path, name, "manifest.json"), "w") as f:
+				json.dump({"name": name, "parent": parent}, f)
+
+		chain = resolve_chain(os.path.join(self.path, "3-incr"))
+		self.assertEqual([manifest["name"] for path, manifest in chain], ["1-base", "2-incr", "3-incr"])
+
+	def test_missing_parent_is_rejected(self):
+		os.makedirs(os.path.join(self.path, "2-incr"))
+		with open(os.path.join(self.path, "2-incr", "manifest.json"), "w") as f:
+			json.dump({"name": "2-incr", "parent": "1-base"}, f)
+		self.assertRaises(frappe.ValidationError, resolve_chain, os.path.join(self.path, "2-incr"))
+
+	def test_file_paths(self):
+		self.assertEqual(get_file_path("/files/a.pdf"), "public/files/a.pdf")
+		self.assertEqual(get_file_path("/private/files/a.pdf"), "private/files/a.pdf")
+		self.assertIsNone(get_file_path("https://example.com/a.pdf"))
+
+
+class IntegrationTestIncrementalBackup(IntegrationTestCase):
+	"""
+	Integration tests for base and incremental backups.
+	"""
+
+	def setUp(self):
+		self.stored = frappe.db.get_global(GLOBAL_KEY)
+		frappe.db.set_global(GLOBAL_KEY, None)
+
+	def tearDown(self):
+		frappe.db.set_global(GLOBAL_KEY, self.stored)
+		frappe.db.commit()
+
+	def test_base_then_incremental(self):
+		base = backup()
+		self.addCleanup(shutil.rmtree, base)
+		incremental = backup()
+		self.addCleanup(shutil.rmtree, incremental)
+
+		self.assertEqual(os.path.dirname(base), get_backup_root())
+		chain = resolve_chain(incremental)
+		self.assertEqual([manifest["kind"] for path, manifest in chain], ["base", "incremental"])
+		self.assertIn("Supplier Inquiry", chain[0][1]["doctypes"])
+		self.assertEqual(get_checkpoint()["increments"], 1)
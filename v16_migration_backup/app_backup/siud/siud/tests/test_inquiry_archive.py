@@ -0,0 +1,109 @@
+# Copyright (c) 2025, Tzvi and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests import IntegrationTestCase
+from frappe.utils import add_to_date, now_datetime
+
+from siud.siud.doctype.supplier_inquiry.inquiry_status import get_label
+from siud.utils.incremental_backup import iter_changed_rows, iter_deleted
+from siud.utils.inquiry_archive import ARCHIVE_DOCTYPE, archive_inquiries
+from siud.utils.nestedset import import_tree
+
+SUPPLIER = "_ARC-SUP"
+
+
+class IntegrationTestInquiryArchive(IntegrationTestCase):
+	"""
+	Integration tests for moving closed inquiries to the archive.
+	"""
+
+	def setUp(self):
+		import_tree(
+			"Inquiry Topic Category",
+			[
+				{
+					"name": "_ARC-T",
+					"category_code": "_ARC-T",
+					"category_name": "_ARC-T",
+					"parent_inquiry_topic_category": None,
+				}
+			],
+		)
+		if not frappe.db.exists("Supplier", SUPPLIER):
+			frappe.get_doc(
+				{"doctype": "Supplier", "supplier_id": SUPPLIER, "supplier_name": SUPPLIER}
+			).insert(ignore_permissions=True)
+
+		frappe.db.delete(ARCHIVE_DOCTYPE, {"supplier_link": SUPPLIER})
+		frappe.db.delete("Supplier Inquiry", {"supplier_link": SUPPLIER})
+		frappe.db.delete("File", {"file_name": "_arc.txt"})
+
+		self.closed = self.make_inquiry("closed", "2000-01-01")
+		self.open = self.make_inquiry("in_progress", "2000-01-01")
+		self.recent = self.make_inquiry("closed")
+
+	def make_inquiry(self, status_code, modified=None):
+		inquiry = frappe.get_doc(
+			{
+				"doctype": "Supplier Inquiry",
+				"supplier_link": SUPPLIER,
+				"topic_category": "_ARC-T",
+				"inquiry_description": "archive test",
+				"inquiry_context": "ספק עצמו",
+				"inquiry_status": get_label(status_code),
+			}
+		).insert(ignore_permissions=True)
+		if modified:
+			frappe.db.set_value("Supplier Inquiry", inquiry.name, "modified", modified, update_modified=False)
+		return inquiry.name
+
+	def test_only_old_closed_inquiries_move(self):
+		file = frappe.get_doc(
+			{
+				"doctype": "File",
+				"file_name": "_arc.txt",
+				"content": "archive test",
+				"attached_to_doctype": "Supplier Inquiry",
+				"attached_to_name": self.closed,
+			}
+		).insert(ignore_permissions=True)
+
+		archive_inquiries(after_days=30, pause=0)
+
+		self.assertFalse(frappe.db.exists("Supplier Inquiry", self.closed))
+		self.assertEqual(frappe.db.get_value(ARCHIVE_DOCTYPE, self.closed, "status_code"), "closed")
+		self.assertEqual(frappe.db.get_value("File", file.name, "attached_to_doctype"), ARCHIVE_DOCTYPE)
+		self.assertTrue(frappe.db.exists("Supplier Inquiry", self.open))
+		self.assertTrue(frappe.db.exists("Supplier Inquiry", self.recent))
+
+	def test_move_is_seen_by_incremental_backup(self):
+		file = frappe.get_doc(
+			{
+				"doctype": "File",
+				"file_name": "_arc.txt",
+				"content": "archive test",
+				"attached_to_doctype": "Supplier Inquiry",
+				"attached_to_name": self.closed,
+			}
+		).insert(ignore_permissions=True)
+		since = add_to_date(now_datetime(), seconds=-1)
+
+		archive_inquiries(after_days=30, pause=0)
+		until = add_to_date(now_datetime(), seconds=1)
+
+		archived = [row["name"] for rows in iter_changed_rows(ARCHIVE_DOCTYPE, since, until) for row in rows]
+		self.assertIn(self.closed, archived)
+		self.assertIn({"doctype": "Supplier Inquiry", "name": self.closed}, list(iter_deleted(since, until)))
+		self.assertGreater(frappe.db.get_value("File", file.name, "modified"), since)
+
+	def test_history_follows_the_archived_inquiry(self):
+		comment = frappe.get_doc("Supplier Inquiry", self.closed).add_comment("Comment", "archive test")
+
+		archive_inquiries(after_days=30, pause=0)
+
+		self.assertEqual(
+			frappe.db.get_value("Comment", comment.name, ["reference_doctype", "reference_name"]),
+			(ARCHIVE_DOCTYPE, self.closed),
+		)
+		self.assertEqual(frappe.db.get_value(ARCHIVE_DOCTYPE, self.closed, "docstatus"), 0)
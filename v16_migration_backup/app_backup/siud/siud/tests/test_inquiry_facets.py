@@ -0,0 +1,36 @@
+# Copyright (c) 2025, Tzvi and Contributors
+# See license.txt
+
+from frappe.tests import UnitTestCase
+
+from siud.api.supplier_portal import count_inquiry_facets
+
+ROWS = [
+	{"status_code": "new", "topic_category": "T1", "month": "2026-09", "count": 3},
+	{"status_code": "new", "topic_category": "T2", "month": "2026-10", "count": 1},
+	{"status_code": "closed", "topic_category": "T1", "month": "2026-10", "count": 2},
+]
+
+
+class UnitTestInquiryFacets(UnitTestCase):
+	"""
+	Unit tests for summing grouped inquiry counts into facets.
+	"""
+
+	def test_without_filters(self):
+		facets = count_inquiry_facets(ROWS)
+		self.assertEqual(facets["total"], 6)
+		self.assertEqual({row["value"]: row["count"] for row in facets["status"]}["new"], 4)
+		self.assertEqual(facets["topic_category"], [{"value": "T1", "count": 5}, {"value": "T2", "count": 1}])
+		self.assertEqual(
+			facets["month"], [{"value": "2026-10", "count": 3}, {"value": "2026-09", "count": 3}]
+		)
+
+	def test_facet_ignores_its_own_filter(self):
+		facets = count_inquiry_facets(ROWS, status_code="new", topic_category="T1")
+		self.assertEqual(facets["total"], 3)
+		# Status counts within topic T1, topic counts within status "new"
+		status = {row["value"]: row["count"] for row in facets["status"]}
+		self.assertEqual((status["new"], status["closed"], status["triage"]), (3, 2, 0))
+		self.assertEqual(facets["topic_category"], [{"value": "T1", "count": 3}, {"value": "T2", "count": 1}])
+		self.assertEqual(facets["month"], [{"value": "2026-09", "count": 3}])
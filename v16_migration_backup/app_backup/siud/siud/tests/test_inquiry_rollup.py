@@ -0,0 +1,89 @@
+# Copyright (c) 2025, Tzvi and Contributors
+# See license.txt
+
+import datetime
+import json
+
+import frappe
+from frappe.tests import IntegrationTestCase, UnitTestCase
+
+from siud.siud.doctype.supplier_inquiry.inquiry_status import get_label
+from siud.utils.inquiry_rollup import (
+	ROLLUP_DOCTYPE,
+	aggregate,
+	get_inquiry_volume,
+	get_status_change,
+	upsert_rollups,
+)
+
+DAY = datetime.date(2000, 1, 3)
+
+
+def version(created, old, new, inquiry_created):
+	return frappe._dict(
+		creation=created,
+		data=json.dumps({"changed": [["inquiry_status", old, new]]}),
+		inquiry_creation=inquiry_created,
+		supplier_link="S1",
+		topic_category="T1",
+	)
+
+
+class UnitTestInquiryRollup(UnitTestCase):
+	"""
+	Unit tests for folding creations and status changes into daily counters.
+	"""
+
+	def test_status_change(self):
+		self.assertEqual(
+			get_status_change(
+				json.dumps({"changed": [["inquiry_status", get_label("new"), get_label("closed")]]})
+			),
+			("new", "closed"),
+		)
+		self.assertIsNone(get_status_change(json.dumps({"changed": [["response_text", "a", "b"]]})))
+
+	def test_aggregate(self):
+		opened = datetime.datetime(2000, 1, 1, 12)
+		closed_at = datetime.datetime(2000, 1, 3, 12)
+		rollups = aggregate(
+			[frappe._dict(day=DAY, supplier_link="S1", topic_category="T1", count=2)],
+			[
+				version(closed_at, get_label("new"), get_label("in_progress"), opened),
+				version(closed_at, get_label("in_progress"), get_label("closed"), opened),
+				# Closed to closed is a transition but not another closing
+				version(closed_at, get_label("closed"), get_label("answered"), opened),
+			],
+		)
+		self.assertEqual(rollups[(DAY, "S1", "T1", "new")]["created_count"], 2)
+		self.assertEqual(rollups[(DAY, "S1", "T1", "in_progress")]["transitioned_count"], 1)
+		self.assertEqual(rollups[(DAY, "S1", "T1", "closed")]["closed_count"], 1)
+		self.assertEqual(rollups[(DAY, "S1", "T1", "closed")]["time_to_close_seconds"], 2 * 86400)
+		self.assertEqual(rollups[(DAY, "S1", "T1", "answered")]["closed_count"], 0)
+
+
+class IntegrationTestInquiryRollup(IntegrationTestCase):
+	"""
+	Integration tests for rollup upserts and reports.
+	"""
+
+	def setUp(self):
+		frappe.db.delete(ROLLUP_DOCTYPE, {"supplier_link": "_ROLLUP-SUP"})
+
+	def test_upserts_add_up(self):
+		key = (DAY, "_ROLLUP-SUP", None, "closed")
+		counts = {
+			"created_count": 0,
+			"transitioned_count": 1,
+			"closed_count": 1,
+			"time_to_close_seconds": 86400,
+		}
+		upsert_rollups({key: counts})
+		upsert_rollups({key: dict(counts, time_to_close_seconds=3 * 86400)})
+
+		rows = get_inquiry_volume(
+			DAY, DAY, group_by=["status_code"], interval="month", supplier_link="_ROLLUP-SUP"
+		)["rows"]
+		self.assertEqual(len(rows), 1)
+		self.assertEqual((rows[0].period, rows[0].status_code), ("2000-01", "closed"))
+		self.assertEqual((rows[0].transitioned, rows[0].closed, rows[0].avg_days_to_close), (2, 2, 2.0))
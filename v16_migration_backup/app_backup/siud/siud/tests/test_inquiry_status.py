@@ -0,0 +1,52 @@
+# Copyright (c) 2025, Tzvi and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests import IntegrationTestCase, UnitTestCase
+
+from siud.siud.doctype.supplier_inquiry.inquiry_status import (
+	CLOSED,
+	OPEN,
+	STATUSES,
+	get_code,
+	get_codes,
+	get_label,
+	to_code,
+)
+
+
+class UnitTestInquiryStatus(UnitTestCase):
+	"""
+	Unit tests for the status code mapping.
+	"""
+
+	def test_mapping_round_trips(self):
+		for code in STATUSES:
+			self.assertEqual(get_code(get_label(code)), code)
+
+	def test_codes_fit_column(self):
+		self.assertTrue(all(len(code) <= 16 for code in STATUSES))
+
+	def test_classes_partition_codes(self):
+		self.assertEqual(sorted(get_codes(OPEN) + get_codes(CLOSED)), sorted(STATUSES))
+
+	def test_to_code_accepts_code_or_label(self):
+		self.assertEqual(to_code("pending"), "pending")
+		self.assertEqual(to_code("דורש השלמות / המתנה"), "pending")
+		self.assertIsNone(to_code("פתוחה"))
+
+
+class IntegrationTestInquiryStatus(IntegrationTestCase):
+	"""
+	Integration tests for the status_code column.
+	"""
+
+	def test_composite_index_exists(self):
+		indexes = frappe.db.sql(
+			"show index from `tabSupplier Inquiry` where Column_name = 'status_code'", as_dict=True
+		)
+		self.assertTrue(any(index.Seq_in_index == 2 for index in indexes))
+
+	def test_select_options_match_mapping(self):
+		options = frappe.get_meta("Supplier Inquiry").get_field("inquiry_status").options.split("\n")
+		self.assertEqual(sorted(filter(None, options)), sorted(get_label(code) for code in STATUSES))
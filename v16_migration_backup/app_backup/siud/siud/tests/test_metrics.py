@@ -0,0 +1,37 @@
+# Copyright (c) 2025, Tzvi and Contributors
+# See license.txt
+
+from frappe.tests import UnitTestCase
+
+from siud.api.metrics import _render_histogram
+from siud.utils import metrics
+
+
+class UnitTestMetrics(UnitTestCase):
+	"""
+	Unit tests for in-process metric recording and Prometheus rendering.
+	"""
+
+	def setUp(self):
+		metrics._local.shard = None
+
+	def test_observe_records_bucket_sum_and_count(self):
+		metrics.observe("siud_request_duration_seconds", 0.02, method="siud.api.x", status=200)
+		shard = metrics._get_shard()
+
+		self.assertEqual(
+			shard['siud_request_duration_seconds_bucket\tle="0.025",method="siud.api.x",status="200"'], 1
+		)
+		self.assertEqual(shard['siud_request_duration_seconds_count\tmethod="siud.api.x",status="200"'], 1)
+
+	def test_histogram_buckets_are_cumulative(self):
+		samples = [
+			("siud_job_duration_seconds_bucket", 'le="0.1",queue="short"', 2),
+			("siud_job_duration_seconds_bucket", 'le="5",queue="short"', 3),
+			("siud_job_duration_seconds_count", 'queue="short"', 5),
+		]
+		lines = _render_histogram("siud_job_duration_seconds", samples, metrics.JOB_BUCKETS)
+
+		self.assertIn('siud_job_duration_seconds_bucket{queue="short",le="1"} 2', lines)
+		self.assertIn('siud_job_duration_seconds_bucket{queue="short",le="+Inf"} 5', lines)
+		self.assertIn('siud_job_duration_seconds_count{queue="short"} 5', lines)
@@ -0,0 +1,91 @@
+# Copyright (c) 2025, Tzvi and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests import IntegrationTestCase, UnitTestCase
+
+from siud.utils.nestedset import (
+	bulk_import_tree,
+	bulk_move_subtree,
+	compute_bounds,
+	import_tree,
+	move_subtree,
+)
+
+DOCTYPE = "Inquiry Topic Category"
+PARENT_FIELD = "parent_inquiry_topic_category"
+
+
+class UnitTestNestedSet(UnitTestCase):
+	"""
+	Unit tests for computing lft/rgt from parent pointers.
+	"""
+
+	def test_bounds(self):
+		bounds = compute_bounds([("a", None), ("c", "a"), ("b", "a"), ("d", "b"), ("e", "")])
+		self.assertEqual(bounds, {"a": (1, 8), "b": (2, 5), "d": (3, 4), "c": (6, 7), "e": (9, 10)})
+
+	def test_unknown_parent(self):
+		self.assertRaises(frappe.ValidationError, compute_bounds, [("a", "missing")])
+
+	def test_cycle(self):
+		self.assertRaises(frappe.ValidationError, compute_bounds, [("root", None), ("a", "b"), ("b", "a")])
+
+	def test_large_tree(self):
+		names = [f"N{i:05d}" for i in range(10000)]
+		bounds = compute_bounds((name, names[(i - 1) // 10] if i else None) for i, name in enumerate(names))
+		self.assertEqual(bounds[names[0]], (1, 20000))
+
+
+class IntegrationTestNestedSet(IntegrationTestCase):
+	"""
+	Integration tests for bulk tree import and subtree moves.
+	"""
+
+	def make_node(self, name, parent=None):
+		return {"name": name, "category_code": name, "category_name": name, PARENT_FIELD: parent}
+
+	def get_bounds(self, name):
+		return tuple(frappe.db.get_value(DOCTYPE, name, ["lft", "rgt"]))
+
+	def test_import_and_move(self):
+		import_tree(
+			DOCTYPE,
+			[
+				self.make_node("_T-ROOT"),
+				self.make_node("_T-A", "_T-ROOT"),
+				self.make_node("_T-B", "_T-ROOT"),
+				self.make_node("_T-A1", "_T-A"),
+			],
+		)
+		root, a, a1 = self.get_bounds("_T-ROOT"), self.get_bounds("_T-A"), self.get_bounds("_T-A1")
+		self.assertEqual(root[1] - root[0], 7)
+		self.assertTrue(root[0] < a[0] < a1[0] < a1[1] < a[1] < root[1])
+
+		move_subtree(DOCTYPE, "_T-A", new_parent="_T-B")
+		b, a, a1 = self.get_bounds("_T-B"), self.get_bounds("_T-A"), self.get_bounds("_T-A1")
+		self.assertTrue(b[0] < a[0] < a1[0] < a1[1] < a[1] < b[1])
+		self.assertEqual(frappe.db.get_value(DOCTYPE, "_T-A", "old_parent"), "_T-B")
+
+	def test_move_under_descendant_is_rejected(self):
+		import_tree(DOCTYPE, [self.make_node("_T-ROOT"), self.make_node("_T-A", "_T-ROOT")])
+		self.assertRaises(frappe.ValidationError, move_subtree, DOCTYPE, "_T-ROOT", "_T-A")
+
+	def test_import_sets_standard_fields(self):
+		frappe.db.delete(DOCTYPE, {"name": "_T-STAMP"})
+		import_tree(DOCTYPE, [self.make_node("_T-STAMP")])
+		row = frappe.db.get_value(
+			DOCTYPE, "_T-STAMP", ["creation", "modified", "owner", "modified_by"], as_dict=True
+		)
+		self.assertTrue(row.creation and row.modified)
+		self.assertEqual((row.owner, row.modified_by), (frappe.session.user, frappe.session.user))
+
+		frappe.db.set_value(DOCTYPE, "_T-STAMP", "owner", "Guest", update_modified=False)
+		import_tree(DOCTYPE, [self.make_node("_T-STAMP")])
+		self.assertEqual(frappe.db.get_value(DOCTYPE, "_T-STAMP", "owner"), "Guest")
+		self.assertEqual(frappe.db.get_value(DOCTYPE, "_T-STAMP", "creation"), row.creation)
+
+	def test_api_only_for_supported_trees(self):
+		# File is a tree DocType, but the endpoints must not write it
+		self.assertRaises(frappe.PermissionError, bulk_import_tree, "File", [{"name": "_T-FILE"}])
+		self.assertRaises(frappe.PermissionError, bulk_move_subtree, "File", "Home")
@@ -0,0 +1,82 @@
+# Copyright (c) 2025, Tzvi and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests import IntegrationTestCase
+
+from siud.utils.portal_users import PORTAL_ROLE, bulk_create_portal_users
+
+
+class IntegrationTestPortalUsers(IntegrationTestCase):
+	"""
+	Integration tests for bulk portal user provisioning.
+	"""
+
+	def setUp(self):
+		for supplier_id, email in (
+			("_PU-1", "_pu1@example.com"),
+			("_PU-2", "_pu2@example.com"),
+			("_PU-3", ""),
+		):
+			if not frappe.db.exists("Supplier", supplier_id):
+				frappe.get_doc(
+					{
+						"doctype": "Supplier",
+						"supplier_id": supplier_id,
+						"supplier_name": supplier_id,
+						"email": email,
+					}
+				).insert(ignore_permissions=True)
+		self.addCleanup(self.delete_users)
+
+	def delete_users(self):
+		# bulk_create_portal_users commits per batch, so the rollback does not remove them
+		users = ["_pu1@example.com", "_pu2@example.com"]
+		frappe.db.delete("Has Role", {"parenttype": "User", "parent": ["in", users]})
+		frappe.db.delete("User", {"name": ["in", users]})
+		frappe.db.delete("__Auth", {"doctype": "User", "name": ["in", users]})
+		frappe.db.commit()
+
+	def test_provision(self):
+		result = bulk_create_portal_users(
+			["_PU-1", {"supplier": "_PU-2"}, "_PU-3", "_PU-MISSING"], send_welcome_email=0
+		)
+
+		self.assertEqual(result["created"], ["_pu1@example.com", "_pu2@example.com"])
+		self.assertEqual([skipped["supplier"] for skipped in result["skipped"]], ["_PU-3", "_PU-MISSING"])
+
+		user = frappe.db.get_value(
+			"User", "_pu1@example.com", ["user_type", "supplier_link", "enabled"], as_dict=True
+		)
+		self.assertEqual((user.user_type, user.supplier_link, user.enabled), ("Website User", "_PU-1", 1))
+		self.assertIn(PORTAL_ROLE, frappe.get_roles("_pu2@example.com"))
+
+	def test_existing_user_is_linked(self):
+		bulk_create_portal_users(["_PU-1"], send_welcome_email=0)
+		frappe.db.set_value("User", "_pu1@example.com", "supplier_link", None)
+
+		result = bulk_create_portal_users(["_PU-1"], send_welcome_email=0)
+
+		self.assertEqual((result["created"], result["linked"]), ([], ["_pu1@example.com"]))
+		self.assertEqual(frappe.db.get_value("User", "_pu1@example.com", "supplier_link"), "_PU-1")
+		self.assertEqual(frappe.db.count("Has Role", {"parent": "_pu1@example.com", "role": PORTAL_ROLE}), 1)
+
+	def test_existing_user_gets_role(self):
+		frappe.get_doc(
+			{"doctype": "User", "email": "_pu1@example.com", "first_name": "PU", "user_type": "Website User"}
+		).insert(ignore_permissions=True)
+		# Caches the roles the user has before provisioning
+		self.assertNotIn(PORTAL_ROLE, frappe.get_roles("_pu1@example.com"))
+
+		result = bulk_create_portal_users(["_PU-1"], send_welcome_email=0)
+
+		self.assertEqual(result["linked"], ["_pu1@example.com"])
+		self.assertIn(PORTAL_ROLE, frappe.get_roles("_pu1@example.com"))
+
+	def test_user_linked_elsewhere_is_skipped(self):
+		bulk_create_portal_users(["_PU-1"], send_welcome_email=0)
+		result = bulk_create_portal_users(
+			[{"supplier": "_PU-2", "email": "_pu1@example.com"}], send_welcome_email=0
+		)
+		self.assertEqual(result["skipped"][0]["supplier"], "_PU-2")
+		self.assertEqual(frappe.db.get_value("User", "_pu1@example.com", "supplier_link"), "_PU-1")
@@ -0,0 +1,61 @@
+# Copyright (c) 2025, Tzvi and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests import IntegrationTestCase, UnitTestCase
+
+from siud.utils.query_detector import NPlusOneAssertionsMixin, QueryLog, detect_n_plus_one, fingerprint
+
+
+class UnitTestQueryDetector(UnitTestCase):
+	"""
+	Unit tests for query fingerprinting and violation reporting.
+	"""
+
+	def test_fingerprint_masks_literals(self):
+		self.assertEqual(
+			fingerprint("SELECT `name` FROM `tabUser` WHERE `name`='a@example.com' LIMIT 1"),
+			fingerprint("select `name`  from `tabUser` where `name`='b@example.com' limit 20"),
+		)
+
+	def test_fingerprint_collapses_value_lists(self):
+		self.assertEqual(
+			fingerprint("select * from `tabSupplier Inquiry` where inquiry_status in ('a', 'b')"),
+			fingerprint("select * from `tabSupplier Inquiry` where inquiry_status in (%s, %s, %s)"),
+		)
+
+	def test_fingerprint_keeps_identifiers(self):
+		self.assertIn("column_break_1", fingerprint("select column_break_1 from `tabX` where idx=3"))
+
+	def test_violations_respect_threshold(self):
+		log = QueryLog(threshold=3)
+		for i in range(3):
+			log.record(f"select * from `tabUser` where name='{i}'", "siud/api/x.py:1 in f")
+		log.record("select 1")
+
+		violations = log.violations()
+		self.assertEqual(len(violations), 1)
+		self.assertEqual(violations[0]["count"], 3)
+		self.assertEqual(violations[0]["call_sites"], {"siud/api/x.py:1 in f": 3})
+
+
+class IntegrationTestQueryDetector(NPlusOneAssertionsMixin, IntegrationTestCase):
+	"""
+	Integration tests for the detector against the test site database.
+	"""
+
+	def test_detects_query_in_loop(self):
+		with self.assertNPlusOne(threshold=5) as log:
+			for _ in range(5):
+				frappe.db.get_value("User", "Administrator", "email")
+
+		self.assertIn("test_query_detector.py", next(iter(log.violations()[0]["call_sites"])))
+
+	def test_single_query_passes(self):
+		with self.assertNoNPlusOne():
+			frappe.get_all("User", fields=["name", "email"], limit=5)
+
+	def test_detector_restores_sql(self):
+		with detect_n_plus_one():
+			pass
+		self.assertNotIn("sql", frappe.db.__dict__)
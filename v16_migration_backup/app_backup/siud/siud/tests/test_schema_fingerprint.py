@@ -0,0 +1,74 @@
+# Copyright (c) 2025, Tzvi and Contributors
+# See license.txt
+
+import os
+import shutil
+import tempfile
+
+import frappe
+from frappe.tests import IntegrationTestCase, UnitTestCase
+
+from siud.utils.schema_fingerprint import (
+	GLOBAL_KEY,
+	get_changes,
+	get_fingerprint,
+	get_stored_fingerprint,
+	stamp,
+)
+
+
+class UnitTestSchemaFingerprint(UnitTestCase):
+	"""
+	Unit tests for fingerprint comparison.
+	"""
+
+	def test_no_changes(self):
+		self.assertEqual(get_changes({"a": "1", "b": "2"}, {"a": "1", "b": "2"}), [])
+
+	def test_changed_added_and_removed_components(self):
+		self.assertEqual(get_changes({"a": "1", "b": "2"}, {"a": "9", "c": "3"}), ["a", "b", "c"])
+
+	def test_first_rollout_is_a_change(self):
+		self.assertTrue(get_changes({}, {"siud:modules": "x"}))
+
+
+class IntegrationTestSchemaFingerprint(IntegrationTestCase):
+	"""
+	Integration tests for computing and storing the fingerprint.
+	"""
+
+	def test_fingerprint_is_stable(self):
+		self.assertEqual(get_fingerprint(), get_fingerprint())
+
+	def setUp(self):
+		self.specs = tempfile.mkdtemp()
+		self.addCleanup(shutil.rmtree, self.specs)
+		self.write_spec("ROLES = ['Supplier Portal User']\n")
+
+	def write_spec(self, content):
+		with open(os.path.join(self.specs, "provision.py"), "w") as f:
+			f.write(content)
+
+	def test_fingerprint_covers_schema_sources(self):
+		fingerprint = get_fingerprint(self.specs)
+		for component in (
+			"siud:modules",
+			"siud:patches",
+			"siud:fixtures",
+			"siud:provisioning",
+			"frappe:version",
+		):
+			self.assertIn(component, fingerprint)
+
+	def test_provisioning_change_is_detected(self):
+		before = get_fingerprint(self.specs)
+		self.write_spec("ROLES = ['Supplier Portal User', 'Supplier Portal Admin']\n")
+
+		self.assertEqual(get_changes(before, get_fingerprint(self.specs)), ["siud:provisioning"])
+
+	def test_stamp_makes_check_pass(self):
+		frappe.db.set_global(GLOBAL_KEY, None)
+		self.assertTrue(get_changes(get_stored_fingerprint(), get_fingerprint(self.specs)))
+
+		stamp(self.specs)
+		self.assertEqual(get_changes(get_stored_fingerprint(), get_fingerprint(self.specs)), [])
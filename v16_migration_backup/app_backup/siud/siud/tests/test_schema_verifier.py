@@ -0,0 +1,95 @@
+# Copyright (c) 2025, Tzvi and Contributors
+# See license.txt
+
+import copy
+
+from frappe.tests import IntegrationTestCase, UnitTestCase
+
+from siud.utils.schema_verifier import diff, format_diff, has_differences, snapshot
+
+
+def make_snapshot():
+	return {
+		"tables": {
+			"tabSupplier": {
+				"columns": {
+					"name": {"type": "varchar(140)", "nullable": "NO", "default": None, "extra": ""},
+					"supplier_id": {"type": "varchar(140)", "nullable": "YES", "default": None, "extra": ""},
+				},
+				"indexes": {
+					"PRIMARY": {"unique": True, "columns": ["name"]},
+					"supplier_id": {"unique": True, "columns": ["supplier_id"]},
+				},
+				"rows": {
+					"count": 3,
+					"checksum": 1 ^ 2,
+					"checksum_columns": ["name", "supplier_id"],
+					"ranges": [
+						{"from": None, "to": "S-2", "count": 2, "checksum": 1},
+						{"from": "S-2", "to": None, "count": 1, "checksum": 2},
+					],
+				},
+			}
+		}
+	}
+
+
+class UnitTestSchemaVerifier(UnitTestCase):
+	"""
+	Unit tests for snapshot diffs.
+	"""
+
+	def test_identical_snapshots(self):
+		result = diff(make_snapshot(), make_snapshot())
+		self.assertFalse(has_differences(result))
+		self.assertEqual(format_diff(result), "✓ No differences")
+
+	def test_missing_table_and_column(self):
+		after = make_snapshot()
+		del after["tables"]["tabSupplier"]["columns"]["supplier_id"]
+		after["tables"]["tabSupplier"]["rows"]["checksum_columns"] = ["name"]
+		after["tables"]["tabNew"] = after["tables"]["tabSupplier"]
+
+		result = diff(make_snapshot(), after)
+		self.assertEqual(result["extra_tables"], ["tabNew"])
+		self.assertEqual(result["columns"]["tabSupplier"]["missing"], ["supplier_id"])
+		self.assertEqual(result["rows"]["tabSupplier"]["checksum"], "not comparable (columns differ)")
+
+	def test_index_change(self):
+		after = make_snapshot()
+		after["tables"]["tabSupplier"]["indexes"]["supplier_id"]["unique"] = False
+
+		result = diff(make_snapshot(), after)
+		self.assertIn("supplier_id", result["indexes"]["tabSupplier"]["changed"])
+
+	def test_row_mismatch_is_located(self):
+		after = make_snapshot()
+		rows = after["tables"]["tabSupplier"]["rows"]
+		rows["ranges"][1]["checksum"] = 7
+		rows["checksum"] = 1 ^ 7
+
+		result = diff(make_snapshot(), after)
+		self.assertEqual(result["rows"]["tabSupplier"]["checksum"], "mismatch")
+		self.assertEqual(result["rows"]["tabSupplier"]["ranges"], [["S-2", None]])
+		self.assertNotIn("count", result["rows"]["tabSupplier"])
+
+	def test_different_boundaries_compare_by_total(self):
+		after = make_snapshot()
+		after["tables"]["tabSupplier"]["rows"]["ranges"] = [
+			{"from": None, "to": None, "count": 3, "checksum": 1 ^ 2},
+		]
+		self.assertFalse(has_differences(diff(make_snapshot(), after)))
+
+
+class IntegrationTestSchemaVerifier(IntegrationTestCase):
+	"""
+	Integration tests for snapshots of a live site.
+	"""
+
+	def test_snapshot_is_reproducible(self):
+		before = snapshot(tables=["tabSupplier", "tabSupplier Inquiry"], chunk_size=2, workers=2)
+		after = snapshot(tables=["tabSupplier", "tabSupplier Inquiry"], chunk_size=3, workers=1)
+
+		self.assertIn("PRIMARY", before["tables"]["tabSupplier"]["indexes"])
+		self.assertIn("status_code", before["tables"]["tabSupplier Inquiry"]["columns"])
+		self.assertFalse(has_differences(diff(before, after)))
@@ -0,0 +1,132 @@
+# Copyright (c) 2025, Tzvi and Contributors
+# See license.txt
+
+import csv
+import os
+import shutil
+import tempfile
+
+import frappe
+from frappe.tests import IntegrationTestCase, UnitTestCase
+
+from siud.utils.supplier_import import (
+	format_cell,
+	import_suppliers,
+	iter_chunks,
+	iter_file,
+	next_name,
+	split_list,
+)
+
+HEADER = ["Supplier ID", "supplier_name", "activity_domains", "email", "contact_name", "contact_roles"]
+
+
+def write_csv(path, rows):
+	file_path = os.path.join(path, "suppliers.csv")
+	with open(file_path, "w", encoding="utf-8-sig", newline="") as f:
+		writer = csv.writer(f)
+		writer.writerow(HEADER)
+		writer.writerows(rows)
+	return file_path
+
+
+class UnitTestSupplierImport(UnitTestCase):
+	"""
+	Unit tests for reading supplier files.
+	"""
+
+	def setUp(self):
+		self.path = tempfile.mkdtemp()
+		self.addCleanup(shutil.rmtree, self.path)
+
+	def test_csv_rows(self):
+		file_path = write_csv(self.path, [["S-1", " ספק א ", "", "", "", ""]])
+		self.assertEqual(
+			list(iter_file(file_path)),
+			[
+				(
+					2,
+					{
+						"supplier_id": "S-1",
+						"supplier_name": "ספק א",
+						"activity_domains": "",
+						"email": "",
+						"contact_name": "",
+						"contact_roles": "",
+					},
+				)
+			],
+		)
+
+	def test_unsupported_file(self):
+		self.assertRaises(frappe.ValidationError, list, iter_file(os.path.join(self.path, "suppliers.txt")))
+
+	def test_helpers(self):
+		self.assertEqual(split_list("A, B;C|D\nE"), ["A", "B", "C", "D", "E"])
+		self.assertEqual(format_cell(123456.0), "123456")
+		chunks = list(iter_chunks([(2, {"a": "1"}), (3, {"a": ""}), (4, {"a": "2"})], 1))
+		self.assertEqual(chunks, [[(2, {"a": "1"})], [(4, {"a": "2"})]])
+
+
+class IntegrationTestSupplierImport(IntegrationTestCase):
+	"""
+	Integration tests for bulk supplier import.
+	"""
+
+	def setUp(self):
+		self.path = tempfile.mkdtemp()
+		self.addCleanup(shutil.rmtree, self.path)
+
+	def test_import_with_errors(self):
+		file_path = write_csv(
+			self.path,
+			[
+				["_IMP-1", "ספק ייבוא", "", "imp1@example.com", "איש קשר 1", ""],
+				["_IMP-1", "", "", "", "איש קשר 2", ""],
+				["_IMP-2", "", "", "", "", ""],
+				["_IMP-3", "ספק 3", "לא קיים", "", "", ""],
+				["_IMP-4", "ספק 4", "", "not-an-email", "", ""],
+			],
+		)
+
+		report = import_suppliers(file_path, chunk_size=1)
+
+		self.assertEqual((report["rows"], report["suppliers"], report["contacts"]), (5, 1, 2))
+		self.assertEqual([error["row"] for error in report["errors"]], [4, 5, 6])
+		self.assertEqual(frappe.db.get_value("Supplier", "_IMP-1", "email"), "imp1@example.com")
+
+		contacts = frappe.get_all("Contact Person", filters={"supplier_link": "_IMP-1"}, pluck="name")
+		self.assertEqual(len(contacts), 2)
+		self.assertTrue(all(name.startswith("CP-") for name in contacts))
+
+	def test_contact_names_are_reserved_per_chunk(self):
+		for supplier in ("_IMP-5", "_IMP-6"):
+			frappe.db.delete("Contact Person", {"supplier_link": supplier})
+			frappe.db.delete("Supplier", supplier)
+		file_path = write_csv(
+			self.path,
+			[
+				["_IMP-5", "ספק 5", "", "", "איש קשר 1", ""],
+				["_IMP-5", "", "", "", "איש קשר 2", ""],
+				["_IMP-6", "ספק 6", "", "", "איש קשר 3", ""],
+			],
+		)
+
+		report = import_suppliers(file_path)
+
+		self.assertEqual(report["contacts"], 3)
+		names = frappe.get_all(
+			"Contact Person", filters={"supplier_link": ["in", ["_IMP-5", "_IMP-6"]]}, pluck="name"
+		)
+		numbers = sorted(int(name.removeprefix("CP-")) for name in names)
+		self.assertEqual(numbers, list(range(numbers[0], numbers[0] + 3)))
+		# The series continues after the reserved block
+		self.assertGreater(
+			int(next_name("Contact Person", "format:CP-{#####}").removeprefix("CP-")), numbers[-1]
+		)
+
+	def test_dry_run_writes_nothing(self):
+		file_path = write_csv(self.path, [["_IMP-DRY", "ספק", "", "", "", ""]])
+		report = import_suppliers(file_path, dry_run=True)
+		self.assertEqual(report["suppliers"], 1)
+		self.assertFalse(frappe.db.exists("Supplier", "_IMP-DRY"))
@@ -0,0 +1,109 @@
+# Copyright (c) 2025, Tzvi and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests import IntegrationTestCase, UnitTestCase
+
+from siud.utils.supplier_search import get_query_words, get_tokens, normalize, search, tokenize
+
+
+class UnitTestSupplierSearch(UnitTestCase):
+	"""
+	Unit tests for search normalization and tokens.
+	"""
+
+	def test_hebrew_normalization(self):
+		self.assertEqual(normalize("צה״ל"), normalize('צה"ל'))
+		self.assertEqual(normalize("שָׁלוֹם"), "שלומ")
+		self.assertEqual(tokenize("בית-ספר  Café_12"), ["בית", "ספר", "cafe", "12"])
+
+	def test_tokens(self):
+		tokens = get_tokens(
+			{
+				"supplier_id": "SUP-001",
+				"supplier_name": "החברה לחשמל",
+				"phone": "+972-4-8123456",
+				"email": "Info@Elec.co.il",
+			}
+		)
+		self.assertTrue(
+			{"החברה", "חברה", "לחשמל", "sup", "001", "sup001", "048123456", "info", "elec"} <= tokens
+		)
+
+	def test_phone_query(self):
+		self.assertEqual(get_query_words("050-1234567"), ["0501234567"])
+		self.assertEqual(get_query_words("+972 (50) 123-4567"), ["0501234567"])
+		self.assertEqual(get_query_words("SUP-001"), ["sup", "001"])
+
+
+class IntegrationTestSupplierSearch(IntegrationTestCase):
+	"""
+	Integration tests for supplier search and facets.
+	"""
+
+	def setUp(self):
+		for code in ("_SRCH-A", "_SRCH-B"):
+			if not frappe.db.exists("Activity Domain Category", code):
+				frappe.get_doc(
+					{"doctype": "Activity Domain Category", "category_code": code, "category_name": code}
+				).insert(ignore_permissions=True)
+
+		for name in frappe.get_all("Supplier", filters={"name": ["like", "\\_SRCH-%"]}, pluck="name"):
+			frappe.delete_doc("Supplier", name, ignore_permissions=True, force=True)
+
+		for supplier_id, supplier_name, domains in (
+			("_SRCH-1", "חשמלאי הצפון", ["_SRCH-A"]),
+			("_SRCH-2", "חשמל ובניין בע״מ", ["_SRCH-A", "_SRCH-B"]),
+			("_SRCH-3", "אינסטלציה", ["_SRCH-B"]),
+		):
+			frappe.get_doc(
+				{
+					"doctype": "Supplier",
+					"supplier_id": supplier_id,
+					"supplier_name": supplier_name,
+					"activity_domains": [{"activity_domain_category": domain} for domain in domains],
+				}
+			).insert(ignore_permissions=True)
+
+	def test_prefix_search_with_facets(self):
+		result = search("חשמל srch")
+		self.assertEqual([row.name for row in result["results"]], ["_SRCH-2", "_SRCH-1"])
+		self.assertEqual(result["total"], 2)
+		self.assertEqual(
+			{facet.activity_domain_category: facet.count for facet in result["facets"]},
+			{"_SRCH-A": 2, "_SRCH-B": 1},
+		)
+
+	def test_final_letters_and_domain_filter(self):
+		self.assertEqual([row.name for row in search("הצפונ")["results"]], ["_SRCH-1"])
+		self.assertEqual([row.name for row in search("בעמ")["results"]], ["_SRCH-2"])
+
+		result = search("srch", domains=["_SRCH-B"])
+		self.assertEqual({row.name for row in result["results"]}, {"_SRCH-2", "_SRCH-3"})
+		# Facets ignore the domain filter
+		self.assertEqual(
+			sum(
+				facet.count
+				for facet in result["facets"]
+				if facet.activity_domain_category.startswith("_SRCH")
+			),
+			4,
+		)
+
+	def test_dashed_phone_search(self):
+		supplier = frappe.get_doc("Supplier", "_SRCH-1")
+		supplier.phone = "0507654321"
+		supplier.save(ignore_permissions=True)
+
+		self.assertEqual([row.name for row in search("050-7654321")["results"]], ["_SRCH-1"])
+		self.assertEqual([row.name for row in search("+972 50-765-4321")["results"]], ["_SRCH-1"])
+
+	def test_index_follows_changes(self):
+		supplier = frappe.get_doc("Supplier", "_SRCH-3")
+		supplier.supplier_name = "שרברבות"
+		supplier.save(ignore_permissions=True)
+		self.assertEqual(search("אינסטלציה")["total"], 0)
+		self.assertEqual([row.name for row in search("שרבר")["results"]], ["_SRCH-3"])
+
+		supplier.delete(ignore_permissions=True)
+		self.assertFalse(frappe.db.exists("Supplier Search Token", {"supplier": "_SRCH-3"}))
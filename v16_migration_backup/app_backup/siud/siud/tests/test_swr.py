@@ -0,0 +1,86 @@
+# Copyright (c) 2025, Tzvi and Contributors
+# See license.txt
+
+import time
+
+import frappe
+from frappe.tests import IntegrationTestCase
+
+from siud.utils import cache, swr
+from siud.utils.swr import stale_while_revalidate
+
+calls = []
+answers = {}
+
+
+@stale_while_revalidate(ttl=60, max_stale=60, scope="global")
+def compute_answer(value=1):
+	calls.append(value)
+	return {"answer": answers.get(value, value)}
+
+
+@stale_while_revalidate(ttl=60, max_stale=60, scope="user")
+def compute_user_answer():
+	calls.append("user")
+	return {"answer": len(calls)}
+
+
+class IntegrationTestStaleWhileRevalidate(IntegrationTestCase):
+	"""
+	Integration tests for the stale-while-revalidate decorator.
+	"""
+
+	def setUp(self):
+		calls.clear()
+		answers.clear()
+		compute_answer.invalidate()
+		compute_user_answer.invalidate()
+
+	def test_fresh_result_is_reused(self):
+		self.assertEqual(compute_answer(value=2), {"answer": 2})
+		self.assertEqual(compute_answer(value=2), {"answer": 2})
+		self.assertEqual(calls, [2])
+
+	def test_arguments_are_part_of_the_key(self):
+		compute_answer(value=1)
+		compute_answer(value=2)
+		self.assertEqual(calls, [1, 2])
+
+	def test_invalidate_forces_recompute(self):
+		compute_answer()
+		compute_answer.invalidate()
+		compute_answer()
+		self.assertEqual(calls, [1, 1])
+
+	def test_invalidate_one_scope(self):
+		compute_user_answer()
+		compute_user_answer.invalidate("someone-else@example.com")
+		compute_user_answer()
+		self.assertEqual(calls, ["user"])
+
+		compute_user_answer.invalidate(frappe.session.user)
+		compute_user_answer()
+		self.assertEqual(calls, ["user", "user"])
+
+	def test_stale_result_is_served(self):
+		compute_answer(value=1)
+		self.make_stale(1)
+
+		self.assertEqual(compute_answer(value=1), {"answer": 1})
+
+	def test_refreshed_result_is_served(self):
+		compute_answer(value=1)
+		key = self.make_stale(1)
+		answers[1] = 42
+
+		swr.refresh(f"{__name__}.compute_answer", (), {"value": 1}, key, swr._acquire_lock(key))
+
+		self.assertEqual(compute_answer(value=1), {"answer": 42})
+		self.assertEqual(calls, [1, 1])
+
+	def make_stale(self, value):
+		key = swr._make_key(f"{__name__}.compute_answer", "*", (), {"value": value})
+		envelope = cache.get("swr", key)
+		envelope["computed_at"] = time.time() - 90
+		cache.set_value("swr", key, envelope)
+		return key
@@ -0,0 +1,52 @@
+# Copyright (c) 2025, Tzvi and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests import IntegrationTestCase
+
+from siud.api.supplier_portal import get_topic_children, search_topics
+from siud.utils import cache
+from siud.utils.nestedset import import_tree
+
+
+class IntegrationTestTopicPicker(IntegrationTestCase):
+	"""
+	Integration tests for the topic picker endpoints.
+	"""
+
+	def setUp(self):
+		import_tree(
+			"Inquiry Topic Category",
+			[
+				self.make_node("_TP-ROOT", "_בדיקה ראשי"),
+				self.make_node("_TP-B", "_בדיקה ב", "_TP-ROOT"),
+				self.make_node("_TP-A", "_בדיקה א", "_TP-ROOT"),
+				self.make_node("_TP-A1", "_בדיקה א1", "_TP-A"),
+			],
+		)
+		cache.invalidate("topic_tree")
+
+	def make_node(self, code, name, parent=None):
+		return {
+			"name": code,
+			"category_code": code,
+			"category_name": name,
+			"parent_inquiry_topic_category": parent,
+		}
+
+	def test_children_one_level(self):
+		children = get_topic_children("_TP-ROOT")
+		self.assertEqual([child["name"] for child in children], ["_TP-A", "_TP-B"])
+		self.assertEqual([child["has_children"] for child in children], [True, False])
+		self.assertIn("_TP-ROOT", [topic["name"] for topic in get_topic_children()])
+
+	def test_search_by_name_and_code(self):
+		results = search_topics("_בדיקה א")
+		self.assertEqual([result["name"] for result in results], ["_TP-A", "_TP-A1"])
+		self.assertEqual(results[1]["path"], ["_בדיקה ראשי", "_בדיקה א"])
+
+		self.assertEqual([result["name"] for result in search_topics("_TP-A1")], ["_TP-A1"])
+
+	def test_wildcards_are_literal(self):
+		self.assertEqual(search_topics("%"), [])
+		self.assertEqual(search_topics("  "), [])
@@ -0,0 +1,324 @@
+# Copyright (c) 2025, Tzvi and contributors
+# For license information, please see license.txt
+
+"""
+Two-Tier Cache
+
+A bounded in-process LRU (entry count + byte size, per-entry TTL) in front of
+the site's Redis cache. Every backend pod keeps its own LRU, so invalidations
+and overwrites (set_value) are published on a Redis pub/sub channel and a listener
+thread in each process drops the stale local entries.
+
+Values are stored pickled in both tiers and unpickled on every read, so callers
+can never mutate a cached object in place.
+
+Keys carry a per-namespace version (a Redis counter, remembered by each
+process until the namespace is invalidated). Invalidating a whole namespace
+increments the version instead of scanning Redis for its keys; the old
+entries expire with their TTL.
+
+Usage:
+	from siud.utils import cache
+
+	supplier = cache.get("supplier_summary", name, lambda: load_summary(name))
+	cache.invalidate("supplier_summary", name)
+	cache.invalidate("supplier_summary")  # every supplier
+"""
+
+import json
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+import frappe
+
+from siud.utils.metrics import record_cache_lookup
+
+CHANNEL = "siud_cache_invalidate"
+
+# namespace: default TTL in seconds (applies to both tiers)
+NAMESPACES = {
+	"identity": 300,
+	"reference": 3600,
+	"topic_tree": 3600,
+	"supplier_summary": 600,
+	"supplier_profile": 600,
+	"swr": 3600,
+}
+
+DEFAULT_MAX_ENTRIES = 4096
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+# =============================================================================
+# In-Process LRU
+# =============================================================================
+
+
+class LRUCache:
+	"""Thread-safe LRU bounded by entry count and total pickled size."""
+
+	def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+		self.max_entries = max_entries
+		self.max_bytes = max_bytes
+		self.size = 0
+		self._data = OrderedDict()  # key: (payload, expires_at)
+		self._lock = threading.Lock()
+
+	def get(self, key):
+		"""
+		Returns:
+			bytes: The pickled payload, or None if missing or expired
+		"""
+		with self._lock:
+			entry = self._data.get(key)
+			if entry is None:
+				return None
+			payload, expires_at = entry
+			if expires_at <= time.monotonic():
+				self._remove(key)
+				return None
+			self._data.move_to_end(key)
+			return payload
+
+	def set(self, key, payload, ttl):
+		if len(payload) > self.max_bytes:
+			return
+		with self._lock:
+			if key in self._data:
+				self._remove(key)
+			self._data[key] = (payload, time.monotonic() + ttl)
+			self.size += len(payload)
+			while len(self._data) > self.max_entries or self.size > self.max_bytes:
+				self._remove(next(iter(self._data)))
+
+	def delete(self, key):
+		with self._lock:
+			if key in self._data:
+				self._remove(key)
+
+	def delete_prefix(self, prefix):
+		with self._lock:
+			for key in [key for key in self._data if key.startswith(prefix)]:
+				self._remove(key)
+
+	def clear(self):
+		with self._lock:
+			self._data.clear()
+			self.size = 0
+
+	def __len__(self):
+		return len(self._data)
+
+	def _remove(self, key):
+		payload, _expires_at = self._data.pop(key)
+		self.size -= len(payload)
+
+
+_local_cache = LRUCache()
+# namespace prefix: version, as last read from Redis by this process
+_versions = {}
+
+
+# =============================================================================
+# Public API
+# =============================================================================
+
+
+def get(namespace, key, generator=None, ttl=None):
+	"""
+	Read a value from the local LRU, then Redis; compute and store it on a miss.
+
+	Args:
+		namespace: One of NAMESPACES
+		key: Key within the namespace (str)
+		generator: Optional callable producing the value on a miss
+		ttl: Override the namespace TTL (seconds)
+
+	Returns:
+		The cached or generated value, or None on a miss without generator
+	"""
+	_ensure_listener()
+	cache_key = _make_key(namespace, key)
+	local_key = _local_key(cache_key)
+
+	payload = _local_cache.get(local_key)
+	if payload is not None:
+		record_cache_lookup(namespace, True, tier="local")
+		return pickle.loads(payload)
+
+	pipeline = frappe.cache.pipeline()
+	pipeline.get(cache_key)
+	pipeline.ttl(cache_key)
+	payload, remaining = pipeline.execute()
+	if payload is not None:
+		record_cache_lookup(namespace, True, tier="redis")
+		# The local copy must not outlive the entry it was read from
+		local_ttl = _get_ttl(namespace, ttl)
+		if remaining and remaining > 0:
+			local_ttl = min(local_ttl, remaining)
+		_local_cache.set(local_key, payload, local_ttl)
+		return pickle.loads(payload)
+
+	record_cache_lookup(namespace, False)
+	if generator is None:
+		return None
+
+	value = generator()
+	_store(cache_key, value, _get_ttl(namespace, ttl))
+	return value
+
+
+def set_value(namespace, key, value, ttl=None):
+	"""
+	Store a value in both tiers, replacing it in every pod.
+
+	Other pods drop their local copy of the key and read the new value from
+	Redis on their next access.
+	"""
+	_ensure_listener()
+	cache_key = _make_key(namespace, key)
+	local_key = _store(cache_key, value, _get_ttl(namespace, ttl))
+	_publish(local_key, False)
+
+
+def _store(cache_key, value, ttl):
+	payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+	local_key = _local_key(cache_key)
+	frappe.cache.set(cache_key, payload, ex=ttl)
+	_local_cache.set(local_key, payload, ttl)
+	return local_key
+
+
+def invalidate(namespace, key=None):
+	"""
+	Drop a key (or the whole namespace) from Redis and from every pod's LRU.
+
+	Args:
+		namespace: One of NAMESPACES
+		key: Key to drop; None drops the whole namespace (by bumping its version)
+
+	The invalidation is repeated after the current transaction commits, so a
+	concurrent request cannot re-populate the cache from pre-commit data.
+	"""
+	_invalidate(namespace, key)
+	if getattr(frappe.local, "db", None):
+		frappe.db.after_commit.add(lambda: _invalidate(namespace, key))
+
+
+def _invalidate(namespace, key):
+	if key is None:
+		frappe.cache.incr(_version_key(namespace))
+		local_key, is_prefix = _namespace_prefix(namespace), True
+	else:
+		frappe.cache.delete(_make_key(namespace, key))
+		local_key, is_prefix = _local_key(_make_key(namespace, key)), False
+
+	_drop_local(local_key, is_prefix)
+	_publish(local_key, is_prefix)
+
+
+def _publish(local_key, is_prefix):
+	message = {"key": local_key, "prefix": is_prefix, "origin": _origin_id()}
+	frappe.cache.publish(CHANNEL, json.dumps(message))
+
+
+def _make_key(namespace, key):
+	if namespace not in NAMESPACES:
+		raise ValueError(f"Unknown cache namespace: {namespace}")
+	# make_key adds the site prefix, which also scopes the local LRU per site
+	return frappe.cache.make_key(f"siud_cache|{namespace}|{_get_version(namespace)}|{key}")
+
+
+def _namespace_prefix(namespace):
+	"""Local key prefix of every version of a namespace."""
+	return _local_key(frappe.cache.make_key(f"siud_cache|{namespace}|"))
+
+
+def _version_key(namespace):
+	return frappe.cache.make_key(f"siud_cache_version|{namespace}")
+
+
+def _get_version(namespace):
+	prefix = _namespace_prefix(namespace)
+	version = _versions.get(prefix)
+	if version is None:
+		version = frappe.safe_decode(frappe.cache.get(_version_key(namespace)) or b"0")
+		_versions[prefix] = version
+	return version
+
+
+def _local_key(cache_key):
+	return frappe.safe_decode(cache_key)
+
+
+def _get_ttl(namespace, ttl):
+	return int(ttl or frappe.conf.get("siud_cache_ttl", {}).get(namespace) or NAMESPACES[namespace])
+
+
+def _drop_local(local_key, is_prefix):
+	if is_prefix:
+		# The namespace version changed: read it again from Redis
+		_versions.pop(local_key, None)
+		_local_cache.delete_prefix(local_key)
+	else:
+		_local_cache.delete(local_key)
+
+
+def _clear_local():
+	_versions.clear()
+	_local_cache.clear()
+
+
+# =============================================================================
+# Invalidation Listener
+# =============================================================================
+
+_listener_lock = threading.Lock()
+_listener_pid = None
+
+
+def _origin_id():
+	return f"{os.uname().nodename}:{os.getpid()}"
+
+
+def _ensure_listener():
+	"""Start one subscriber thread per process (re-started after fork)."""
+	global _listener_pid
+	if _listener_pid == os.getpid():
+		return
+
+	with _listener_lock:
+		if _listener_pid == os.getpid():
+			return
+		_clear_local()
+		redis_url = frappe.conf.get("redis_cache")
+		thread = threading.Thread(
+			target=_listen, args=(redis_url,), name="siud-cache-invalidation", daemon=True
+		)
+		thread.start()
+		_listener_pid = os.getpid()
+
+
+def _listen(redis_url):
+	from redis import Redis
+
+	origin = _origin_id()
+	backoff = 1
+	while True:
+		try:
+			pubsub = Redis.from_url(redis_url).pubsub(ignore_subscribe_messages=True)
+			pubsub.subscribe(CHANNEL)
+			# Messages may have been missed while disconnected
+			_clear_local()
+			backoff = 1
+			for message in pubsub.listen():
+				data = json.loads(message["data"])
+				if data["origin"] != origin:
+					_drop_local(data["key"], data["prefix"])
+		except Exception:
+			_clear_local()
+			time.sleep(backoff)
+			backoff = min(backoff * 2, 30)
@@ -0,0 +1,51 @@
+# Copyright (c) 2025, Tzvi and contributors
+# For license information, please see license.txt
+
+"""
+Cache Invalidation Events
+
+Document event handlers (registered in hooks.doc_events) that drop two-tier
+cache entries when the underlying records change.
+"""
+
+from siud.utils import cache
+
+
+def on_user_change(doc, method=None, *args):
+	cache.invalidate("identity", doc.name)
+
+
+def on_supplier_change(doc, method=None, *args):
+	cache.invalidate("supplier_summary", doc.name)
+	cache.invalidate("supplier_profile", doc.name)
+
+
+def on_contact_person_change(doc, method=None, *args):
+	previous = doc.get_doc_before_save() if method == "on_update" else None
+	for supplier in {doc.supplier_link, previous and previous.supplier_link}:
+		if supplier:
+			cache.invalidate("supplier_profile", supplier)
+
+
+def on_reference_change(doc, method=None, *args):
+	from siud.api.supplier_portal import get_reference_data
+
+	cache.invalidate("reference")
+	# Category names and role titles (supplier and contact person roles) are embedded in every supplier profile
+	cache.invalidate("supplier_profile")
+	get_reference_data.invalidate()
+
+
+def on_topic_change(doc, method=None, *args):
+	from siud.api.supplier_portal import get_reference_data
+
+	cache.invalidate("topic_tree")
+	get_reference_data.invalidate()
+
+
+def on_inquiry_change(doc, method=None, *args):
+	from siud.api.supplier_portal import get_inquiry_facets, get_inquiry_stats
+
+	if doc.supplier_link:
+		get_inquiry_stats.invalidate(doc.supplier_link)
+		get_inquiry_facets.invalidate(doc.supplier_link)
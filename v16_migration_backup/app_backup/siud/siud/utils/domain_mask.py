@@ -0,0 +1,225 @@
+# Copyright (c) 2025, Tzvi and contributors
+# For license information, please see license.txt
+
+"""
+Activity Domain Bitmasks
+
+Every Activity Domain Category gets a bit_index (0-62) on insert. Supplier
+keeps the bits of its activity_domains in activity_domain_mask and Delegated
+Supplier the bits of its delegation_scope in scope_mask, both set in the
+controllers' validate. Filtering by domain is then a bitwise test on one
+BIGINT column instead of a join with the child table:
+
+	suppliers in X or Y:   activity_domain_mask & (bit X | bit Y) != 0
+	suppliers in X and Y:  activity_domain_mask & (bit X | bit Y) = (bit X | bit Y)
+
+Masks hold bit positions, not names, so renaming a category does not touch
+them. A deleted category's bit is cleared from all masks before it can be
+reused. BIGINT is signed, which leaves 63 usable bits.
+
+bit_index is UNASSIGNED (-1, the column default) until a bit is given, so rows
+that existed before the column or were written in bulk can be told apart from
+bit 0. Its unique index is only added once no row is unassigned.
+
+Usage:
+	from siud.utils.domain_mask import get_suppliers_in_domains, is_domain_in_scope, mask_condition
+
+	get_suppliers_in_domains(["ELEC", "PLUMB"])
+	is_domain_in_scope("DS-00001", "ELEC")
+	mask_condition(["ELEC"], column="s.activity_domain_mask")  # for your own WHERE clause
+"""
+
+import frappe
+from frappe import _
+
+from siud.utils import cache
+
+MAX_BITS = 63
+BATCH_SIZE = 5000
+UNASSIGNED = -1
+
+MASKS = {
+	# parent doctype: (mask column, child doctype, parentfield)
+	"Supplier": ("activity_domain_mask", "Supplier Activity Domain", "activity_domains"),
+	"Delegated Supplier": ("scope_mask", "Delegated Supplier Scope", "delegation_scope"),
+}
+
+
+# =============================================================================
+# Bit Assignment
+# =============================================================================
+
+
+def get_bit_indexes():
+	"""
+	Returns:
+		dict: {Activity Domain Category name: bit_index}, cached with the reference data
+	"""
+	return cache.get("reference", "domain_bit_indexes", _load_bit_indexes)
+
+
+def _load_bit_indexes():
+	return dict(
+		frappe.db.sql("select name, bit_index from `tabActivity Domain Category` where bit_index >= 0")
+	)
+
+
+def next_bit_index():
+	"""Lowest free bit, read under a lock on the category rows until commit."""
+	used = set(
+		frappe.db.sql_list(
+			"select bit_index from `tabActivity Domain Category` where bit_index >= 0 for update"
+		)
+	)
+	free = next((index for index in range(MAX_BITS) if index not in used), None)
+	if free is None:
+		frappe.throw(_("At most {0} activity domain categories are supported").format(MAX_BITS))
+	return free
+
+
+def clear_bit(bit_index):
+	"""Remove a bit from every mask, before the bit is reused by another category."""
+	bit = 1 << bit_index
+	frappe.db.sql(
+		"update `tabSupplier` set activity_domain_mask = activity_domain_mask & ~%s where activity_domain_mask & %s",
+		(bit, bit),
+	)
+	frappe.db.sql(
+		"update `tabDelegated Supplier` set scope_mask = scope_mask & ~%s where scope_mask & %s", (bit, bit)
+	)
+
+
+def is_assigned(bit_index):
+	return bit_index is not None and bit_index >= 0
+
+
+def assign_bit_indexes():
+	"""Give every category without a bit_index the lowest free one."""
+	for name in frappe.get_all(
+		"Activity Domain Category",
+		filters={"bit_index": ["<", 0]},
+		pluck="name",
+		order_by="creation, name",
+	):
+		frappe.db.set_value(
+			"Activity Domain Category", name, "bit_index", next_bit_index(), update_modified=False
+		)
+	cache.invalidate("reference")
+
+
+def add_unique_bit_index():
+	"""Add the unique index on bit_index, unless some categories still wait for a bit."""
+	if frappe.db.exists("Activity Domain Category", {"bit_index": ["<", 0]}):
+		return False
+	frappe.db.add_unique("Activity Domain Category", ["bit_index"])
+	return True
+
+
+def rebuild_masks(doctype):
+	"""
+	Recompute the mask column of a MASKS doctype from its child rows, for rows
+	written without the controller (bulk imports, patches).
+
+	Runs in primary-key batches (BIT_OR in SQL) with a commit after each.
+	"""
+	column, child_doctype, parentfield = MASKS[doctype]
+	last_name = ""
+	while True:
+		names = frappe.db.sql_list(
+			f"select name from `tab{doctype}` where name > %s order by name limit %s", (last_name, BATCH_SIZE)
+		)
+		if not names:
+			break
+
+		frappe.db.sql(
+			f"""update `tab{doctype}` parent
+			set `{column}` = (
+				select coalesce(bit_or(1 << adc.bit_index), 0)
+				from `tab{child_doctype}` child
+				join `tabActivity Domain Category` adc
+					on adc.name = child.activity_domain_category and adc.bit_index >= 0
+				where child.parent = parent.name and child.parenttype = %s and child.parentfield = %s
+			)
+			where parent.name in %s""",
+			(doctype, parentfield, names),
+		)
+		frappe.db.commit()
+		last_name = names[-1]
+
+
+# =============================================================================
+# Masks
+# =============================================================================
+
+
+def get_mask(domains):
+	"""
+	Args:
+		domains: Activity Domain Category names; unknown names are ignored
+
+	Returns:
+		int: Bitwise OR of the domains' bits
+	"""
+	bit_indexes = get_bit_indexes()
+	mask = 0
+	for domain in domains:
+		if bit_indexes.get(domain) is not None:
+			mask |= 1 << bit_indexes[domain]
+	return mask
+
+
+def get_domains(mask):
+	"""
+	Returns:
+		list: Activity Domain Category names whose bit is set in mask
+	"""
+	return sorted(domain for domain, index in get_bit_indexes().items() if mask & (1 << index))
+
+
+def mask_condition(domains, column="activity_domain_mask", match_all=False):
+	"""
+	SQL condition for rows whose mask column has any (or all) of the domains.
+
+	The mask is an integer computed here, so it is inlined and the condition
+	works in queries with either positional or named parameters.
+
+	Args:
+		domains: Activity Domain Category names
+		column: Column expression, e.g. "s.activity_domain_mask"
+		match_all: Require every domain instead of at least one
+
+	Returns:
+		str: The condition; never true if a required domain has no bit
+	"""
+	mask = get_mask(domains)
+	if not mask or (match_all and len(set(domains)) > bin(mask).count("1")):
+		return "1 = 0"
+	if match_all:
+		return f"({column} & {mask}) = {mask}"
+	return f"({column} & {mask}) != 0"
+
+
+# =============================================================================
+# Queries
+# =============================================================================
+
+
+def get_suppliers_in_domains(domains, match_all=False):
+	"""
+	Returns:
+		list: Supplier names active in any (or, with match_all, every) of the domains
+	"""
+	return frappe.db.sql_list(
+		f"select name from `tabSupplier` where {mask_condition(domains, match_all=match_all)} order by name"
+	)
+
+
+def is_domain_in_scope(delegation, domain):
+	"""
+	Returns:
+		bool: Whether the Delegated Supplier's scope includes the domain
+	"""
+	mask = get_mask([domain])
+	if not mask:
+		return False
+	return bool((frappe.db.get_value("Delegated Supplier", delegation, "scope_mask") or 0) & mask)
@@ -0,0 +1,239 @@
+# Copyright (c) 2025, Tzvi and contributors
+# For license information, please see license.txt
+
+"""
+Reference Data Fixtures
+
+Exports the siud reference DocTypes to one TSV or JSON-lines file each
+(v16_migration_backup/fixtures/<doctype>.tsv) and imports them back.
+
+- Export streams rows in primary-key pages, so memory stays flat however large
+  a table is.
+- Import upserts in batches (INSERT ... ON DUPLICATE KEY UPDATE) without
+  running document hooks, then rebuilds the Inquiry Topic Category tree once
+  in a single linear pass (siud.utils.nestedset) instead of shifting lft/rgt
+  on every insert, and recomputes the activity domain masks
+  (siud.utils.domain_mask).
+
+TSV files have a header row; tabs, newlines and backslashes in values are
+escaped and NULL is written as \\N. Files exported with `mariadb -e "SELECT ..."`
+(NULL written as the word NULL) can be imported as well.
+
+Usage:
+	bench --site <site> siud-fixtures-export v16_migration_backup/fixtures [--format jsonl]
+	bench --site <site> siud-fixtures-import v16_migration_backup/fixtures
+"""
+
+import json
+import os
+
+import frappe
+
+from siud.utils.domain_mask import assign_bit_indexes, rebuild_masks
+from siud.utils.incremental_backup import upsert
+from siud.utils.nestedset import rebuild_tree
+
+# In import order: tree and parent reference tables first, then child tables
+REFERENCE_DOCTYPES = [
+	"Activity Domain Category",
+	"Supplier Role",
+	"Inquiry Topic Category",
+	"Delegated Supplier Scope",
+	"Contact Person Role",
+]
+TREE_DOCTYPES = ["Inquiry Topic Category"]
+FORMATS = ("tsv", "jsonl")
+BATCH_SIZE = 1000
+
+TSV_ESCAPES = {"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"}
+TSV_UNESCAPES = {"\\": "\\", "t": "\t", "n": "\n", "r": "\r", "0": "\0"}
+
+
+# =============================================================================
+# Export
+# =============================================================================
+
+
+def export_fixtures(path, format="tsv", doctypes=None):
+	"""
+	Write one file per reference DocType.
+
+	Args:
+		path: Target directory
+		format: "tsv" or "jsonl"
+		doctypes: Subset of REFERENCE_DOCTYPES (default: all)
+
+	Returns:
+		dict: {doctype: rows written}
+	"""
+	if format not in FORMATS:
+		frappe.throw(f"Unknown fixtures format {format}, expected one of {', '.join(FORMATS)}")
+
+	os.makedirs(path, exist_ok=True)
+	counts = {}
+	for doctype in doctypes or REFERENCE_DOCTYPES:
+		columns = frappe.db.get_table_columns(doctype)
+		with open(get_fixture_path(path, doctype, format), "w", encoding="utf-8", newline="") as f:
+			if format == "tsv":
+				f.write("\t".join(columns) + "\n")
+			counts[doctype] = 0
+			for rows in iter_rows(doctype, columns):
+				for row in rows:
+					f.write(format_tsv(row) if format == "tsv" else format_jsonl(columns, row))
+				counts[doctype] += len(rows)
+	return counts
+
+
+def iter_rows(doctype, columns):
+	"""Yield batches of rows (tuples in column order), paged on name."""
+	quoted = ", ".join(f"`{column}`" for column in columns)
+	last = None
+	while True:
+		rows = frappe.db.sql(
+			f"""select {quoted} from `tab{doctype}`
+			{"where name > %(last)s" if last is not None else ""}
+			order by name limit {BATCH_SIZE}""",
+			{"last": last},
+		)
+		if not rows:
+			return
+		yield rows
+		last = rows[-1][columns.index("name")]
+
+
+def format_tsv(row):
+	return "\t".join(escape_tsv(value) for value in row) + "\n"
+
+
+def escape_tsv(value):
+	if value is None:
+		return "\\N"
+	return "".join(TSV_ESCAPES.get(char, char) for char in str(value))
+
+
+def format_jsonl(columns, row):
+	return json.dumps(dict(zip(columns, row, strict=True)), default=str, ensure_ascii=False) + "\n"
+
+
+# =============================================================================
+# Import
+# =============================================================================
+
+
+def import_fixtures(path, doctypes=None):
+	"""
+	Upsert every fixture file found in path, then rebuild trees and caches once.
+
+	Args:
+		path: Directory with <doctype>.tsv or <doctype>.jsonl files
+		doctypes: Subset of REFERENCE_DOCTYPES (default: all)
+
+	Returns:
+		dict: {doctype: rows imported}
+	"""
+	counts = {}
+	for doctype in doctypes or REFERENCE_DOCTYPES:
+		file_path = next(
+			(
+				get_fixture_path(path, doctype, format)
+				for format in FORMATS
+				if os.path.exists(get_fixture_path(path, doctype, format))
+			),
+			None,
+		)
+		if not file_path:
+			continue
+
+		counts[doctype] = 0
+		for rows in iter_file(file_path):
+			if doctype in TREE_DOCTYPES:
+				# lft/rgt of the exporting site are meaningless here; rebuilt below
+				for row in rows:
+					row.pop("lft", None)
+					row.pop("rgt", None)
+			upsert(doctype, rows)
+			counts[doctype] += len(rows)
+		frappe.db.commit()
+
+	for doctype in TREE_DOCTYPES:
+		if counts.get(doctype):
+			rebuild_tree(doctype)
+	frappe.db.commit()
+
+	if counts.get("Activity Domain Category"):
+		# Imported categories may carry other bit indexes than the ones in the masks
+		assign_bit_indexes()
+		rebuild_masks("Supplier")
+	if counts.get("Activity Domain Category") or counts.get("Delegated Supplier Scope"):
+		# Scope rows were written without the Delegated Supplier controller
+		rebuild_masks("Delegated Supplier")
+
+	clear_reference_caches()
+	return counts
+
+
+def iter_file(file_path):
+	"""Yield batches of row dicts from a TSV or JSON-lines fixture file."""
+	with open(file_path, encoding="utf-8", newline="") as f:
+		if file_path.endswith(".tsv"):
+			header = f.readline().rstrip("\r\n")
+			if not header:
+				return
+			columns = header.split("\t")
+
+			def parse(line):
+				# A row with a different field count is corrupt; strict zip raises instead of truncating
+				return dict(zip(columns, (unescape_tsv(value) for value in line.split("\t")), strict=True))
+
+		else:
+			parse = json.loads
+
+		batch = []
+		for line in f:
+			line = line.rstrip("\r\n")
+			if not line:
+				continue
+			batch.append(parse(line))
+			if len(batch) >= BATCH_SIZE:
+				yield batch
+				batch = []
+		if batch:
+			yield batch
+
+
+def unescape_tsv(value):
+	if value in ("\\N", "NULL"):
+		return None
+	if "\\" not in value:
+		return value
+
+	chars, escaped = [], False
+	for char in value:
+		if escaped:
+			chars.append(TSV_UNESCAPES.get(char, char))
+			escaped = False
+		elif char == "\\":
+			escaped = True
+		else:
+			chars.append(char)
+	return "".join(chars)
+
+
+def clear_reference_caches():
+	"""Rows were written without document hooks, so drop what the hooks would have."""
+	from siud.api.supplier_portal import get_reference_data
+	from siud.utils import cache
+
+	cache.invalidate("reference")
+	cache.invalidate("topic_tree")
+	cache.invalidate("supplier_profile")
+	get_reference_data.invalidate()
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+
+def get_fixture_path(path, doctype, format):
+	return os.path.join(path, f"{frappe.scrub(doctype)}.{format}")
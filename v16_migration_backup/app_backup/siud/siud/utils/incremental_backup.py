@@ -0,0 +1,405 @@
+# Copyright (c) 2025, Tzvi and contributors
+# For license information, please see license.txt
+
+"""
+Incremental Backup of the Siud DocTypes
+
+A base backup exports every row of the siud module's DocTypes; each incremental
+backup after it exports only what changed since the previous checkpoint:
+
+- Rows whose `modified` is in the window, with all their child table rows
+  (child rows removed on save leave no trace, so children are always replaced
+  as a whole on restore); DocTypes in CHANGE_COLUMNS use another column
+- Deleted Document records of siud DocTypes created in the window
+- File records attached to siud DocTypes modified in the window, with the file
+  content
+
+Each backup is a directory of gzipped JSON-lines chunks and a manifest.json that
+points to its parent backup. Restore walks the chain back to the base and
+replays base + increments in order with upserts.
+
+Windows overlap by OVERLAP so rows written by transactions that committed after
+the previous backup read its checkpoint are not lost; replaying a row twice is
+harmless.
+
+Usage:
+	bench --site <site> siud-backup [--base]
+	bench --site <site> siud-restore <backup directory>
+
+	# Hourly, opt-in via site config:
+	#   "siud_incremental_backup": 1,
+	#   "siud_incremental_backup_base_every": 168   (increments between bases)
+"""
+
+import datetime
+import gzip
+import hashlib
+import json
+import os
+import tarfile
+
+import frappe
+from frappe.utils import get_datetime, now_datetime
+
+GLOBAL_KEY = "siud_incremental_backup"
+MODULE = "Siud"
+OVERLAP = datetime.timedelta(minutes=5)
+CHUNK_ROWS = 5000
+BATCH_SIZE = 500
+DEFAULT_BASE_EVERY = 168
+
+# DocTypes whose rows keep an older `modified` when written: the column that
+# tells when they were
+CHANGE_COLUMNS = {
+	# Archived inquiries keep the inquiry's timestamps
+	"Archived Supplier Inquiry": "archived_on",
+}
+
+
+# =============================================================================
+# Backup
+# =============================================================================
+
+
+def scheduled_backup():
+	"""Hourly scheduler entry point; does nothing unless enabled in site config."""
+	if not frappe.conf.get("siud_incremental_backup"):
+		return
+
+	checkpoint = get_checkpoint()
+	base_every = frappe.conf.get("siud_incremental_backup_base_every") or DEFAULT_BASE_EVERY
+	backup(base=not checkpoint or checkpoint.get("increments", 0) >= base_every)
+
+
+def backup(base=False):
+	"""
+	Write a base or incremental backup and move the checkpoint.
+
+	Args:
+		base: Export all rows instead of the changes since the checkpoint
+			(always the case when there is no checkpoint yet)
+
+	Returns:
+		str: The backup directory
+	"""
+	checkpoint = get_checkpoint()
+	base = base or not checkpoint
+	since = None if base else get_datetime(checkpoint["until"]) - OVERLAP
+	until = now_datetime()
+
+	name = until.strftime("%Y%m%d_%H%M%S_%f") + ("-base" if base else "-incr")
+	path = os.path.join(get_backup_root(), name)
+	os.makedirs(path)
+
+	manifest = {
+		"name": name,
+		"kind": "base" if base else "incremental",
+		"parent": None if base else checkpoint["backup"],
+		"since": str(since) if since else None,
+		"until": str(until),
+		"doctypes": {},
+	}
+
+	for doctype in get_doctypes():
+		manifest["doctypes"][doctype] = export_doctype(path, doctype, since, until)
+
+	if not base:
+		manifest["deleted"] = write_chunks(path, "deleted", iter_deleted(since, until))
+	manifest["files"] = export_files(path, since, until)
+
+	with open(os.path.join(path, "manifest.json"), "w") as f:
+		json.dump(manifest, f, indent=1, ensure_ascii=False)
+
+	# Only move the checkpoint once the backup is complete
+	frappe.db.set_global(
+		GLOBAL_KEY,
+		json.dumps(
+			{
+				"backup": name,
+				"until": str(until),
+				"increments": 0 if base else checkpoint.get("increments", 0) + 1,
+			}
+		),
+	)
+	frappe.db.commit()
+	return path
+
+
+def export_doctype(path, doctype, since, until):
+	"""Export a parent DocType's changed rows, each followed by its child rows."""
+	child_doctypes = [df.options for df in frappe.get_meta(doctype).get_table_fields()]
+
+	def records():
+		for rows in iter_changed_rows(doctype, since, until):
+			for row in rows:
+				yield {"doctype": doctype, "row": row}
+			names = [row["name"] for row in rows]
+			for child_doctype in child_doctypes:
+				for child in frappe.db.sql(
+					f"select * from `tab{child_doctype}` where parenttype = %s and parent in %s order by parent, idx",
+					(doctype, names),
+					as_dict=True,
+				):
+					yield {"doctype": child_doctype, "row": child}
+
+	return write_chunks(path, frappe.scrub(doctype), records())
+
+
+def iter_changed_rows(doctype, since, until):
+	"""
+	Yield batches of rows with since < modified <= until (or the CHANGE_COLUMNS
+	column), paged on (column, name).
+
+	Args:
+		since: Exclusive lower bound, or None for all rows
+		until: Inclusive upper bound
+	"""
+	column = CHANGE_COLUMNS.get(doctype, "modified")
+	conditions = [f"`{column}` <= %(until)s"]
+	values = {"until": until}
+	if since:
+		conditions.append(f"`{column}` > %(since)s")
+		values["since"] = since
+
+	while True:
+		rows = frappe.db.sql(
+			f"""select * from `tab{doctype}`
+			where {" and ".join(conditions)}
+			order by `{column}`, name
+			limit {BATCH_SIZE}""",
+			values,
+			as_dict=True,
+		)
+		if not rows:
+			return
+		yield rows
+		if len(rows) < BATCH_SIZE:
+			return
+
+		if "last_name" not in values:
+			conditions.append(
+				f"(`{column}` > %(last_value)s or (`{column}` = %(last_value)s and name > %(last_name)s))"
+			)
+		values["last_value"], values["last_name"] = rows[-1][column], rows[-1]["name"]
+
+
+def iter_deleted(since, until):
+	for row in frappe.get_all(
+		"Deleted Document",
+		filters={
+			"deleted_doctype": ["in", get_doctypes()],
+			"creation": ["between", [since, until]],
+		},
+		fields=["deleted_doctype", "deleted_name"],
+		order_by="creation",
+	):
+		yield {"doctype": row.deleted_doctype, "name": row.deleted_name}
+
+
+def export_files(path, since, until):
+	"""Export File records attached to siud DocTypes and their content."""
+	filters = {"attached_to_doctype": ["in", get_doctypes()], "modified": ["<=", until]}
+	if since:
+		filters["modified"] = ["between", [since, until]]
+
+	files = frappe.get_all("File", filters=filters, fields=["*"], order_by="modified")
+	result = write_chunks(path, "file", ({"doctype": "File", "row": row} for row in files))
+
+	count = 0
+	with tarfile.open(os.path.join(path, "files.tar.gz"), "w:gz") as tar:
+		for row in files:
+			relative_path = get_file_path(row.file_url)
+			if relative_path and os.path.exists(frappe.get_site_path(relative_path)):
+				tar.add(frappe.get_site_path(relative_path), arcname=relative_path)
+				count += 1
+
+	result["content"] = count
+	return result
+
+
+def get_file_path(file_url):
+	"""Site-relative path of a local file URL, None for external URLs."""
+	if not file_url:
+		return None
+	if file_url.startswith("/private/files/"):
+		return file_url.lstrip("/")
+	if file_url.startswith("/files/"):
+		return "public" + file_url
+	return None
+
+
+# =============================================================================
+# Restore
+# =============================================================================
+
+
+def restore(path):
+	"""
+	Replay a backup and all its ancestors, base first.
+
+	Args:
+		path: Backup directory (base or incremental)
+	"""
+	for manifest_path, manifest in resolve_chain(path):
+		print(f"Restoring {manifest['name']} ({manifest['kind']})")
+		if manifest.get("deleted"):
+			for chunk in manifest["deleted"]["chunks"]:
+				apply_deletions(read_chunk(manifest_path, chunk))
+				frappe.db.commit()
+
+		for doctype, exported in manifest["doctypes"].items():
+			for chunk in exported["chunks"]:
+				apply_records(doctype, read_chunk(manifest_path, chunk))
+				frappe.db.commit()
+
+		for chunk in manifest["files"]["chunks"]:
+			apply_records("File", read_chunk(manifest_path, chunk))
+			frappe.db.commit()
+		with tarfile.open(os.path.join(manifest_path, "files.tar.gz")) as tar:
+			if hasattr(tarfile, "data_filter"):
+				tar.extractall(frappe.get_site_path(), filter="data")
+			else:
+				tar.extractall(frappe.get_site_path())
+
+	frappe.clear_cache()
+
+
+def resolve_chain(path):
+	"""
+	Returns:
+		list: [(directory, manifest)] from the base to the given backup
+
+	Raises:
+		frappe.ValidationError: If a parent backup is missing
+	"""
+	chain = []
+	while True:
+		manifest_path = os.path.join(path, "manifest.json")
+		if not os.path.exists(manifest_path):
+			frappe.throw(f"Backup {path} is incomplete or missing (no manifest.json)")
+		with open(manifest_path) as f:
+			manifest = json.load(f)
+		chain.append((path, manifest))
+		if not manifest["parent"]:
+			return chain[::-1]
+		path = os.path.join(os.path.dirname(path), manifest["parent"])
+
+
+def apply_deletions(records):
+	for record in records:
+		doctype, name = record["doctype"], record["name"]
+		for df in frappe.get_meta(doctype).get_table_fields():
+			frappe.db.sql(
+				f"delete from `tab{df.options}` where parenttype = %s and parent = %s", (doctype, name)
+			)
+		frappe.db.sql(f"delete from `tab{doctype}` where name = %s", name)
+
+
+def apply_records(doctype, records):
+	"""Upsert a chunk of parent rows, replacing their child rows."""
+	rows_by_doctype = {}
+	for record in records:
+		rows_by_doctype.setdefault(record["doctype"], []).append(record["row"])
+
+	names = [row["name"] for row in rows_by_doctype.get(doctype, [])]
+	if names:
+		for df in frappe.get_meta(doctype).get_table_fields():
+			frappe.db.sql(
+				f"delete from `tab{df.options}` where parenttype = %s and parent in %s", (doctype, names)
+			)
+
+	for row_doctype, rows in rows_by_doctype.items():
+		for start in range(0, len(rows), BATCH_SIZE):
+			upsert(row_doctype, rows[start : start + BATCH_SIZE])
+
+
+def upsert(doctype, rows):
+	"""INSERT ... ON DUPLICATE KEY UPDATE for the columns the current table still has."""
+	table_columns = set(frappe.db.get_table_columns(doctype))
+	columns = [column for column in rows[0] if column in table_columns]
+	quoted = ", ".join(f"`{column}`" for column in columns)
+	placeholders = ", ".join(["(" + ", ".join(["%s"] * len(columns)) + ")"] * len(rows))
+	updates = ", ".join(f"`{column}` = values(`{column}`)" for column in columns if column != "name")
+	frappe.db.sql(
+		f"insert into `tab{doctype}` ({quoted}) values {placeholders} on duplicate key update {updates}",
+		[row.get(column) for row in rows for column in columns],
+	)
+
+
+# =============================================================================
+# Chunks
+# =============================================================================
+
+
+def write_chunks(path, prefix, records, chunk_rows=CHUNK_ROWS):
+	"""
+	Write records as gzipped JSON lines, chunk_rows per file.
+
+	Returns:
+		dict: {"rows": int, "chunks": [{"file", "rows", "sha256"}]}
+	"""
+	chunks, total = [], 0
+	out, count = None, 0
+
+	def close():
+		out.close()
+		chunk = chunks[-1]
+		chunk["rows"] = count
+		with open(os.path.join(path, chunk["file"]), "rb") as f:
+			chunk["sha256"] = hashlib.sha256(f.read()).hexdigest()
+
+	for record in records:
+		if out is None or count >= chunk_rows:
+			if out is not None:
+				close()
+			chunks.append({"file": f"{prefix}.{len(chunks) + 1:04d}.jsonl.gz"})
+			out, count = gzip.open(os.path.join(path, chunks[-1]["file"]), "wt", encoding="utf-8"), 0
+		out.write(json.dumps(record, default=str, ensure_ascii=False) + "\n")
+		count += 1
+		total += 1
+
+	if out is not None:
+		close()
+	return {"rows": total, "chunks": chunks}
+
+
+def read_chunk(path, chunk):
+	"""
+	Returns:
+		list: The chunk's records
+
+	Raises:
+		frappe.ValidationError: If the chunk does not match its manifest checksum
+	"""
+	file_path = os.path.join(path, chunk["file"])
+	with open(file_path, "rb") as f:
+		data = f.read()
+	if hashlib.sha256(data).hexdigest() != chunk["sha256"]:
+		frappe.throw(f"Backup chunk {file_path} is corrupt (checksum mismatch)")
+	return [json.loads(line) for line in gzip.decompress(data).decode("utf-8").splitlines() if line]
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+
+def get_doctypes():
+	"""Parent DocTypes of the siud module stored in their own tables."""
+	return frappe.get_all(
+		"DocType",
+		filters={"module": MODULE, "istable": 0, "issingle": 0, "is_virtual": 0},
+		pluck="name",
+		order_by="name",
+	)
+
+
+def get_checkpoint():
+	stored = frappe.db.get_global(GLOBAL_KEY)
+	return json.loads(stored) if stored else {}
+
+
+def get_backup_root():
+	return frappe.conf.get("siud_incremental_backup_path") or frappe.get_site_path(
+		"private", "backups", "siud_incremental"
+	)
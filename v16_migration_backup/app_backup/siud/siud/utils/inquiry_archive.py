@@ -0,0 +1,186 @@
+# Copyright (c) 2025, Tzvi and contributors
+# For license information, please see license.txt
+
+"""
+Archive of Closed Inquiries
+
+Inquiries that have been closed (status class CLOSED) and not modified for
+siud_inquiry_archive_after_days are moved from tabSupplier Inquiry to
+tabArchived Supplier Inquiry, keeping their name, timestamps and values, so
+the live table and its (supplier_link, status_code) index hold mostly open
+inquiries.
+
+Each batch copies the rows (docstatus and amended_from included), re-points
+their File, Version, Comment and Communication records at the archive DocType
+and deletes the live rows in one transaction, then pauses so the job never
+holds locks or saturates the database for long. The desk timeline of an
+archived inquiry therefore shows its full history, and the rollups
+(siud.utils.inquiry_rollup) read each DocType's own Version records.
+amended_from keeps the name it had, which may belong to an inquiry that is
+still live.
+
+A move is visible to the incremental backup (siud.utils.incremental_backup):
+archive rows carry archived_on, which the backup reads instead of modified,
+the File rows are modified, and every removed inquiry gets a Deleted Document
+record. Its data only points to the archive, so it cannot be restored from
+the desk as a second copy.
+
+The portal reads the archive through get_inquiries(include_archived=1) and
+get_inquiry, which falls back to the archive for names no longer live.
+
+Usage:
+	bench --site <site> execute siud.utils.inquiry_archive.archive_inquiries --kwargs "{'after_days': 365}"
+
+	# Daily, opt-in via site config:
+	#   "siud_inquiry_archive_after_days": 365,
+	#   "siud_inquiry_archive_pause": 1.0   (seconds between batches)
+"""
+
+import json
+import time
+
+import frappe
+from frappe.utils import add_days, cint, flt, now, now_datetime
+
+from siud.siud.doctype.supplier_inquiry.inquiry_status import CLOSED, get_codes
+
+ARCHIVE_DOCTYPE = "Archived Supplier Inquiry"
+BATCH_SIZE = 500
+MAX_BATCHES = 200  # per run, so a large backlog is spread over several nights
+DEFAULT_PAUSE = 1.0
+
+# Copied as they are
+COLUMNS = [
+	"name",
+	"docstatus",
+	"amended_from",
+	"creation",
+	"modified",
+	"owner",
+	"modified_by",
+	"supplier_link",
+	"topic_category",
+	"inquiry_description",
+	"inquiry_context",
+	"insured_id_number",
+	"insured_full_name",
+	"attachments",
+	"inquiry_status",
+	"status_code",
+	"assigned_role",
+	"assigned_employee_id",
+	"response_text",
+	"response_attachments",
+]
+
+
+# Records that point at an inquiry: (DocType, doctype column, name column)
+REFERENCES = [
+	("Version", "ref_doctype", "docname"),
+	("Comment", "reference_doctype", "reference_name"),
+	("Communication", "reference_doctype", "reference_name"),
+	("Communication Link", "link_doctype", "link_name"),
+]
+
+
+def scheduled_archive():
+	"""Daily scheduler entry point; does nothing unless enabled in site config."""
+	after_days = cint(frappe.conf.get("siud_inquiry_archive_after_days"))
+	if after_days > 0:
+		archive_inquiries(after_days, pause=flt(frappe.conf.get("siud_inquiry_archive_pause", DEFAULT_PAUSE)))
+
+
+def archive_inquiries(after_days, batch_size=BATCH_SIZE, max_batches=MAX_BATCHES, pause=DEFAULT_PAUSE):
+	"""
+	Move closed inquiries not modified for after_days into the archive.
+
+	Args:
+		after_days: Minimum age of the last modification, in days
+		batch_size: Inquiries moved per transaction
+		max_batches: Stop after this many batches (the rest waits for the next run)
+		pause: Seconds to sleep between batches
+
+	Returns:
+		int: Number of inquiries archived
+	"""
+	cutoff = add_days(now_datetime(), -cint(after_days))
+	archived = 0
+	for _batch in range(cint(max_batches)):
+		names = frappe.db.sql_list(
+			"""select name from `tabSupplier Inquiry`
+			where status_code in %s and modified < %s
+			order by modified
+			limit %s""",
+			(get_codes(CLOSED), cutoff, cint(batch_size)),
+		)
+		if not names:
+			break
+
+		archive_batch(names)
+		archived += len(names)
+		if len(names) < cint(batch_size):
+			break
+		time.sleep(pause)
+
+	return archived
+
+
+def archive_batch(names):
+	"""Copy, re-link and delete one batch of inquiries in a single transaction."""
+	suppliers = frappe.db.sql_list(
+		"select distinct supplier_link from `tabSupplier Inquiry` where name in %s", (names,)
+	)
+	quoted = ", ".join(f"`{column}`" for column in COLUMNS)
+	timestamp, user = now(), frappe.session.user
+
+	frappe.db.sql(
+		f"""insert into `tab{ARCHIVE_DOCTYPE}` ({quoted}, `archived_on`)
+		select {quoted}, %s from `tabSupplier Inquiry` where name in %s""",
+		(timestamp, names),
+	)
+	frappe.db.sql(
+		"""update `tabFile` set attached_to_doctype = %s, modified = %s, modified_by = %s
+		where attached_to_doctype = 'Supplier Inquiry' and attached_to_name in %s""",
+		(ARCHIVE_DOCTYPE, timestamp, user, names),
+	)
+	for doctype, doctype_column, name_column in REFERENCES:
+		frappe.db.sql(
+			f"""update `tab{doctype}` set `{doctype_column}` = %s
+			where `{doctype_column}` = 'Supplier Inquiry' and `{name_column}` in %s""",
+			(ARCHIVE_DOCTYPE, names),
+		)
+	add_deleted_documents(names, timestamp, user)
+	frappe.db.sql("delete from `tabSupplier Inquiry` where name in %s", (names,))
+	frappe.db.commit()
+
+	invalidate_inquiry_caches(suppliers)
+
+
+def add_deleted_documents(names, timestamp, user):
+	"""Record the removal of the live rows, as frappe.delete_doc would."""
+	frappe.db.bulk_insert(
+		"Deleted Document",
+		["name", "deleted_doctype", "deleted_name", "data", "creation", "modified", "owner", "modified_by"],
+		[
+			[
+				frappe.generate_hash(length=10),
+				"Supplier Inquiry",
+				name,
+				json.dumps({"archived_to": ARCHIVE_DOCTYPE, "name": name}),
+				timestamp,
+				timestamp,
+				user,
+				user,
+			]
+			for name in names
+		],
+	)
+
+
+def invalidate_inquiry_caches(suppliers):
+	from siud.api.supplier_portal import get_inquiry_facets, get_inquiry_stats
+
+	for supplier in suppliers:
+		if supplier:
+			get_inquiry_stats.invalidate(supplier)
+			get_inquiry_facets.invalidate(supplier)
@@ -0,0 +1,309 @@
+# Copyright (c) 2025, Tzvi and contributors
+# For license information, please see license.txt
+
+"""
+Daily Inquiry Rollups
+
+Inquiry Daily Rollup keeps one row per (day, supplier, topic, status code):
+
+- created_count: inquiries created that day, counted under the initial status
+- transitioned_count: status changes into the status that day
+- closed_count: changes from an open status into a closed one
+- time_to_close_seconds: sum, over those closings, of the time since the
+  inquiry was created (avg = time_to_close_seconds / closed_count)
+
+Creations are read from tabSupplier Inquiry (and its archive, see
+siud.utils.inquiry_archive) and status changes from the Version records
+frappe writes for it (track_changes). A scheduled job folds everything after
+a high-water mark into the rollups, one slice of at most a day per
+transaction that also moves the mark, so an interrupted run never counts
+anything twice. The mark trails the clock by SETTLE so rows written by
+transactions that were still open are not skipped.
+
+Supplier and topic are the inquiry's values at the time the rollup is built.
+Report endpoints read only the rollups, never tabSupplier Inquiry.
+
+Usage:
+	from siud.utils.inquiry_rollup import get_inquiry_volume
+
+	get_inquiry_volume("2026-01-01", "2026-06-30", group_by=["supplier_link"], interval="month")
+
+	# Rebuild everything from the inquiries and their Version history
+	bench --site <site> execute siud.utils.inquiry_rollup.rebuild
+"""
+
+import datetime
+import hashlib
+
+import frappe
+from frappe import _
+from frappe.utils import get_datetime, getdate, now, now_datetime
+from frappe.utils.synchronization import filelock
+
+from siud.siud.doctype.supplier_inquiry.inquiry_status import CLOSED, DEFAULT, get_code, get_codes, to_code
+from siud.utils.inquiry_archive import ARCHIVE_DOCTYPE
+
+GLOBAL_KEY = "siud_inquiry_rollup"
+ROLLUP_DOCTYPE = "Inquiry Daily Rollup"
+SETTLE = datetime.timedelta(minutes=5)
+SLICE = datetime.timedelta(days=1)
+BATCH_SIZE = 500
+
+COUNTERS = ("created_count", "transitioned_count", "closed_count", "time_to_close_seconds")
+INQUIRY_DOCTYPES = ("Supplier Inquiry", ARCHIVE_DOCTYPE)
+GROUP_FIELDS = ("supplier_link", "topic_category", "status_code")
+INTERVALS = {
+	"day": "rollup_date",
+	"month": "date_format(rollup_date, '%%Y-%%m')",
+	"year": "year(rollup_date)",
+}
+
+
+# =============================================================================
+# Incremental Update
+# =============================================================================
+
+
+def update_rollups(until=None):
+	"""
+	Scheduler entry point: fold inquiries and status changes created after the
+	high-water mark (up to until, default now - SETTLE) into the rollups.
+
+	Returns:
+		int: Number of slices committed
+	"""
+	with filelock(GLOBAL_KEY):
+		until = get_datetime(until) if until else now_datetime() - SETTLE
+		since = get_high_water_mark() or get_first_event()
+		slices = 0
+		while since and since < until:
+			end = min(since + SLICE, until)
+			rollup_window(since, end)
+			# The mark moves in the same transaction as the counts it covers
+			frappe.db.set_global(GLOBAL_KEY, str(end))
+			frappe.db.commit()
+			since = end
+			slices += 1
+		return slices
+
+
+def rebuild():
+	"""Drop all rollups and rebuild them from the start of the inquiry history."""
+	with filelock(GLOBAL_KEY):
+		frappe.db.delete(ROLLUP_DOCTYPE)
+		frappe.db.set_global(GLOBAL_KEY, "")
+		frappe.db.commit()
+	return update_rollups()
+
+
+def get_high_water_mark():
+	mark = frappe.db.get_global(GLOBAL_KEY)
+	return get_datetime(mark) if mark else None
+
+
+def get_first_event():
+	"""Just before the oldest inquiry or inquiry Version, or None if there are none."""
+	first = frappe.db.sql(
+		f"""select min(creation) from (
+			select min(creation) as creation from `tabSupplier Inquiry`
+			union all
+			select min(creation) from `tab{ARCHIVE_DOCTYPE}`
+			union all
+			select min(creation) from `tabVersion` where ref_doctype in %s
+		) firsts""",
+		(INQUIRY_DOCTYPES,),
+	)[0][0]
+	return get_datetime(first) - datetime.timedelta(microseconds=1) if first else None
+
+
+def rollup_window(since, until):
+	"""Add the creations and status changes in (since, until] to the rollups."""
+	created, versions = [], []
+	# Archiving re-points an inquiry's Version records at the archive DocType
+	for doctype in INQUIRY_DOCTYPES:
+		created += frappe.db.sql(
+			f"""select date(creation) as day, supplier_link, topic_category, count(*) as count
+			from `tab{doctype}`
+			where creation > %s and creation <= %s
+			group by day, supplier_link, topic_category""",
+			(since, until),
+			as_dict=True,
+		)
+		versions += frappe.db.sql(
+			f"""select v.creation, v.data, si.creation as inquiry_creation, si.supplier_link, si.topic_category
+			from `tabVersion` v
+			join `tab{doctype}` si on si.name = v.docname
+			where v.ref_doctype = %s and v.creation > %s and v.creation <= %s
+				and v.data like '%%inquiry_status%%'""",
+			(doctype, since, until),
+			as_dict=True,
+		)
+	upsert_rollups(aggregate(created, versions))
+
+
+def aggregate(created, versions):
+	"""
+	Args:
+		created: Rows of (day, supplier_link, topic_category, count)
+		versions: Version rows with creation, data and the inquiry's
+			inquiry_creation, supplier_link and topic_category
+
+	Returns:
+		dict: {(day, supplier_link, topic_category, status_code): {counter: value}}
+	"""
+	closed_codes = set(get_codes(CLOSED))
+	rollups = {}
+
+	def add(key, **counts):
+		row = rollups.setdefault(key, dict.fromkeys(COUNTERS, 0))
+		for counter, value in counts.items():
+			row[counter] += value
+
+	for row in created:
+		add((getdate(row.day), row.supplier_link, row.topic_category, DEFAULT), created_count=row.count)
+
+	for version in versions:
+		change = get_status_change(version.data)
+		if not change:
+			continue
+		old_code, new_code = change
+		key = (get_datetime(version.creation).date(), version.supplier_link, version.topic_category, new_code)
+		if new_code in closed_codes and old_code not in closed_codes:
+			seconds = (
+				get_datetime(version.creation) - get_datetime(version.inquiry_creation)
+			).total_seconds()
+			add(key, transitioned_count=1, closed_count=1, time_to_close_seconds=seconds)
+		else:
+			add(key, transitioned_count=1)
+
+	return rollups
+
+
+def get_status_change(data):
+	"""
+	Returns:
+		tuple: (old code, new code) of the inquiry_status change in a Version's
+			data, or None if it has none (or the new label is unknown)
+	"""
+	for change in (frappe.parse_json(data) or {}).get("changed") or []:
+		field, old, new = change[:3]
+		if field == "inquiry_status" and old != new and get_code(new):
+			return get_code(old), get_code(new)
+	return None
+
+
+def upsert_rollups(rollups):
+	"""Add counters to existing rollup rows, inserting the missing ones."""
+	timestamp = now()
+	rows = [
+		[
+			get_rollup_name(*key),
+			timestamp,
+			timestamp,
+			"Administrator",
+			"Administrator",
+			*key,
+			*(counts[c] for c in COUNTERS),
+		]
+		for key, counts in rollups.items()
+	]
+	columns = [
+		"name",
+		"creation",
+		"modified",
+		"owner",
+		"modified_by",
+		"rollup_date",
+		*GROUP_FIELDS,
+		*COUNTERS,
+	]
+	quoted = ", ".join(f"`{column}`" for column in columns)
+	updates = ", ".join(f"`{counter}` = `{counter}` + values(`{counter}`)" for counter in COUNTERS)
+
+	for start in range(0, len(rows), BATCH_SIZE):
+		batch = rows[start : start + BATCH_SIZE]
+		placeholders = ", ".join(["(" + ", ".join(["%s"] * len(columns)) + ")"] * len(batch))
+		frappe.db.sql(
+			f"""insert into `tab{ROLLUP_DOCTYPE}` ({quoted}) values {placeholders}
+			on duplicate key update `modified` = values(`modified`), {updates}""",
+			[value for row in batch for value in row],
+		)
+
+
+def get_rollup_name(day, supplier_link, topic_category, status_code):
+	"""Deterministic name, so a row's counters are found by primary key."""
+	key = "|".join(str(part or "") for part in (day, supplier_link, topic_category, status_code))
+	return hashlib.sha1(key.encode()).hexdigest()[:20]
+
+
+# =============================================================================
+# Reports
+# =============================================================================
+
+
+@frappe.whitelist()
+def get_inquiry_volume(
+	from_date, to_date, group_by=None, interval=None, supplier_link=None, topic_category=None, status=None
+):
+	"""
+	Inquiry volume for a date range, read from the rollups only.
+
+	Args:
+		from_date: First day (YYYY-MM-DD)
+		to_date: Last day (YYYY-MM-DD)
+		group_by: Any of GROUP_FIELDS (list or JSON list); none gives one total row
+		interval: "day", "month" or "year" to add a period column (optional)
+		supplier_link: Filter by supplier (optional)
+		topic_category: Filter by topic (optional)
+		status: Filter by status code or Hebrew label (optional)
+
+	Returns:
+		dict: {
+			"rows": [{"period"?, <group_by fields>, "created", "transitioned", "closed",
+				"avg_days_to_close"}],
+			"as_of": str  # High-water mark; later changes are not in the rollups yet
+		}
+	"""
+	frappe.has_permission(ROLLUP_DOCTYPE, "read", throw=True)
+
+	if isinstance(group_by, str):
+		group_by = frappe.parse_json(group_by) if group_by.startswith("[") else [group_by]
+	group_by = list(group_by or [])
+	invalid = [field for field in group_by if field not in GROUP_FIELDS]
+	if invalid or (interval and interval not in INTERVALS):
+		frappe.throw(_("Invalid grouping: {0}").format(", ".join(invalid) or interval))
+
+	conditions = ["rollup_date between %(from_date)s and %(to_date)s"]
+	values = {"from_date": getdate(from_date), "to_date": getdate(to_date)}
+	for field, value in (
+		("supplier_link", supplier_link),
+		("topic_category", topic_category),
+		("status_code", (to_code(status) or "") if status else None),
+	):
+		if value is not None:
+			conditions.append(f"{field} = %({field})s")
+			values[field] = value
+
+	columns = ([f"{INTERVALS[interval]} as period"] if interval else []) + group_by
+	keys = (["period"] if interval else []) + group_by
+	select = "".join(f"{column}, " for column in columns)
+	group = f"group by {', '.join(keys)} order by {', '.join(keys)}" if keys else ""
+
+	rows = frappe.db.sql(
+		f"""select {select}sum(created_count) as created, sum(transitioned_count) as transitioned,
+			sum(closed_count) as closed, sum(time_to_close_seconds) as time_to_close_seconds
+		from `tab{ROLLUP_DOCTYPE}`
+		where {" and ".join(conditions)}
+		{group}""",
+		values,
+		as_dict=True,
+	)
+
+	for row in rows:
+		seconds = row.pop("time_to_close_seconds") or 0
+		for counter in ("created", "transitioned", "closed"):
+			row[counter] = int(row[counter] or 0)
+		row["avg_days_to_close"] = round(seconds / row.closed / 86400, 2) if row.closed else None
+
+	mark = get_high_water_mark()
+	return {"rows": rows, "as_of": str(mark) if mark else None}
@@ -0,0 +1,177 @@
+# Copyright (c) 2025, Tzvi and contributors
+# For license information, please see license.txt
+
+"""
+Application Metrics
+
+Counters and histograms are recorded into a per-thread shard, so the hot path
+never takes a lock. Each thread periodically flushes its own shard into a Redis
+hash with a single pipeline (after jobs: immediately, since RQ work-horses exit),
+and the scrape endpoint in siud.api.metrics renders the aggregated hash in the
+Prometheus text exposition format.
+"""
+
+import re
+import threading
+import time
+from collections import defaultdict
+
+import frappe
+
+FLUSH_INTERVAL = 10  # seconds
+REDIS_KEY = "siud_metrics"
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+JOB_BUCKETS = (0.1, 0.5, 1, 5, 15, 30, 60, 120, 300, 600, 1800)
+
+# name: (type, help, buckets)
+METRICS = {
+	"siud_request_duration_seconds": (
+		"histogram",
+		"Latency of siud whitelisted API methods",
+		REQUEST_BUCKETS,
+	),
+	"siud_cache_requests_total": ("counter", "Cache lookups by cache, tier and result (hit/miss)", None),
+	"siud_job_duration_seconds": (
+		"histogram",
+		"Duration of background jobs by queue and method",
+		JOB_BUCKETS,
+	),
+}
+
+_API_METHOD = re.compile(r"^/api/(?:v\d+/)?method/(siud\.[\w.]+)")
+_local = threading.local()
+
+
+# =============================================================================
+# Recording
+# =============================================================================
+
+
+def _get_shard():
+	shard = getattr(_local, "shard", None)
+	if shard is None:
+		shard = _local.shard = defaultdict(float)
+		_local.last_flush = time.monotonic()
+	return shard
+
+
+def _series(name, labels):
+	return name + "\t" + ",".join(f'{key}="{_escape(value)}"' for key, value in sorted(labels.items()))
+
+
+def _escape(value):
+	return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def inc(name, value=1, **labels):
+	"""Increment a counter series in the current thread's shard."""
+	_get_shard()[_series(name, labels)] += value
+
+
+def observe(name, value, **labels):
+	"""Record a histogram observation in the current thread's shard."""
+	buckets = METRICS[name][2]
+	shard = _get_shard()
+	le = next((str(bound) for bound in buckets if value <= bound), "+Inf")
+	shard[_series(name + "_bucket", {**labels, "le": le})] += 1
+	shard[_series(name + "_sum", labels)] += value
+	shard[_series(name + "_count", labels)] += 1
+
+
+def record_cache_lookup(cache, hit, tier=""):
+	inc("siud_cache_requests_total", cache=cache, result="hit" if hit else "miss", tier=tier)
+
+
+# =============================================================================
+# Flushing
+# =============================================================================
+
+
+def flush(force=False):
+	"""
+	Push the current thread's shard into Redis with HINCRBYFLOAT.
+
+	Args:
+		force: Flush even if FLUSH_INTERVAL has not elapsed
+	"""
+	shard = getattr(_local, "shard", None)
+	if not shard:
+		return
+	if not force and time.monotonic() - _local.last_flush < FLUSH_INTERVAL:
+		return
+
+	_local.shard = defaultdict(float)
+	_local.last_flush = time.monotonic()
+	try:
+		key = frappe.cache.make_key(REDIS_KEY)
+		pipeline = frappe.cache.pipeline()
+		for series, value in shard.items():
+			pipeline.hincrbyfloat(key, series, value)
+		pipeline.execute()
+	except Exception:
+		# Metrics must never break a request; the shard is dropped
+		frappe.logger("siud.metrics", allow_site=True).exception("Failed to flush metrics")
+
+
+def get_aggregated_series():
+	"""
+	Read all flushed series for the current site.
+
+	Returns:
+		dict: {"name\\tlabels": float}
+	"""
+	# RedisWrapper.hgetall unpickles values, so read the raw hash through a pipeline
+	pipeline = frappe.cache.pipeline()
+	pipeline.hgetall(frappe.cache.make_key(REDIS_KEY))
+	raw = pipeline.execute()[0] or {}
+	return {frappe.safe_decode(series): float(value) for series, value in raw.items()}
+
+
+# =============================================================================
+# Request / Job Hooks
+# =============================================================================
+
+
+def before_request():
+	frappe.local.siud_request_start = time.perf_counter()
+
+
+def after_request(response=None, request=None):
+	start = getattr(frappe.local, "siud_request_start", None)
+	match = _API_METHOD.match(request.path) if request else None
+	# Unknown methods (404) are skipped so arbitrary URLs cannot create new series
+	if start is not None and match and (response is None or response.status_code != 404):
+		observe(
+			"siud_request_duration_seconds",
+			time.perf_counter() - start,
+			method=match.group(1),
+			status=response.status_code if response is not None else "",
+		)
+	flush()
+
+
+def before_job(method=None, kwargs=None, transaction_type=None):
+	frappe.local.siud_job_start = time.perf_counter()
+
+
+def after_job(method=None, kwargs=None, result=None):
+	start = getattr(frappe.local, "siud_job_start", None)
+	if start is not None:
+		observe(
+			"siud_job_duration_seconds",
+			time.perf_counter() - start,
+			queue=_get_current_queue(),
+			method=method or "",
+		)
+	flush(force=True)
+
+
+def _get_current_queue():
+	from rq import get_current_job
+
+	job = get_current_job()
+	if not job:
+		return ""
+	# Frappe prefixes queue names with the bench path: "<prefix>:short"
+	return job.origin.rsplit(":", 1)[-1]
@@ -0,0 +1,315 @@
+# Copyright (c) 2025, Tzvi and contributors
+# For license information, please see license.txt
+
+"""
+Bulk Nested Set Operations
+
+frappe.utils.nestedset.NestedSet keeps lft/rgt correct on every single insert
+or move by shifting all following nodes, so loading a hierarchy of n nodes costs
+O(n^2) row updates, and frappe's rebuild_tree runs one query per node.
+
+Here nodes are written with their parent pointer only; lft/rgt are then computed
+for the whole tree in one linear pass over (name, parent) loaded with a single
+query, and only the rows whose bounds changed are written, in batched CASE
+updates. Children are ordered by name, like frappe's rebuild_tree.
+
+Usage:
+	from siud.utils.nestedset import import_tree, move_subtree, rebuild_tree
+
+	import_tree("Inquiry Topic Category", [{"name": "A", "category_code": "A", ...,
+		"parent_inquiry_topic_category": None}, ...])
+	move_subtree("Inquiry Topic Category", "B", new_parent="A")
+
+	# Benchmark (rolled back)
+	bench --site <site> execute siud.utils.nestedset.benchmark --kwargs "{'size': 10000}"
+"""
+
+import time
+from collections import defaultdict
+
+import frappe
+from frappe import _
+from frappe.utils import now
+
+UPDATE_BATCH_SIZE = 1000
+
+
+# =============================================================================
+# Tree Computation
+# =============================================================================
+
+
+def compute_bounds(nodes):
+	"""
+	Compute lft/rgt for a forest in one depth-first pass.
+
+	Args:
+		nodes: Iterable of (name, parent); parent None or "" for roots
+
+	Returns:
+		dict: {name: (lft, rgt)}
+
+	Raises:
+		frappe.ValidationError: On unknown parents or cycles
+	"""
+	children = defaultdict(list)
+	names = set()
+	for name, parent in nodes:
+		names.add(name)
+		children[parent or None].append(name)
+
+	unknown = sorted(parent for parent in children if parent is not None and parent not in names)
+	if unknown:
+		frappe.throw(f"Unknown parent nodes: {', '.join(unknown[:10])}")
+
+	for siblings in children.values():
+		siblings.sort()
+
+	bounds, counter = {}, 0
+	for root in children[None]:
+		counter += 1
+		lft = {root: counter}
+		stack = [(root, iter(children[root]))]
+		while stack:
+			node, remaining = stack[-1]
+			child = next(remaining, None)
+			if child is None:
+				stack.pop()
+				counter += 1
+				bounds[node] = (lft.pop(node), counter)
+			else:
+				counter += 1
+				lft[child] = counter
+				stack.append((child, iter(children[child])))
+
+	if len(bounds) != len(names):
+		# Nodes not reachable from a root are on a parent cycle
+		frappe.throw(f"Parent cycle between nodes: {', '.join(sorted(names - bounds.keys())[:10])}")
+
+	return bounds
+
+
+# =============================================================================
+# Database Operations
+# =============================================================================
+
+
+def rebuild_tree(doctype):
+	"""
+	Recompute lft/rgt of a whole tree DocType from its parent pointers.
+
+	Returns:
+		int: Number of rows whose bounds changed
+	"""
+	parent_field = get_parent_field(doctype)
+	rows = frappe.db.sql(f"select name, `{parent_field}`, lft, rgt from `tab{doctype}`")
+	bounds = compute_bounds((name, parent) for name, parent, lft, rgt in rows)
+
+	changed = [(name, *bounds[name]) for name, parent, lft, rgt in rows if (lft, rgt) != bounds[name]]
+	for start in range(0, len(changed), UPDATE_BATCH_SIZE):
+		update_bounds(doctype, changed[start : start + UPDATE_BATCH_SIZE])
+
+	if frappe.get_meta(doctype).has_field("old_parent"):
+		# NestedSet treats parent != old_parent as a pending move on the next save
+		frappe.db.sql(
+			f"""update `tab{doctype}` set old_parent = `{parent_field}`
+			where ifnull(old_parent, '') != ifnull(`{parent_field}`, '')"""
+		)
+
+	return len(changed)
+
+
+def update_bounds(doctype, rows):
+	"""One UPDATE for a batch of (name, lft, rgt)."""
+	lft_cases = " ".join(["when %s then %s"] * len(rows))
+	values = [value for name, lft, rgt in rows for value in (name, lft)]
+	values += [value for name, lft, rgt in rows for value in (name, rgt)]
+	values.append([name for name, lft, rgt in rows])
+	frappe.db.sql(
+		f"""update `tab{doctype}`
+		set lft = case name {lft_cases} end, rgt = case name {lft_cases} end
+		where name in %s""",
+		values,
+	)
+
+
+def import_tree(doctype, nodes):
+	"""
+	Upsert a whole hierarchy and compute its bounds once.
+
+	Args:
+		nodes: List of row dicts, each with "name" and the DocType's parent field;
+			lft/rgt are ignored
+
+	Returns:
+		dict: {"nodes": int, "bounds_changed": int}
+	"""
+	from siud.utils.incremental_backup import upsert
+
+	parent_field = get_parent_field(doctype)
+	rows = []
+	for node in nodes:
+		if not node.get("name"):
+			frappe.throw("Every node needs a name")
+		row = {key: value for key, value in node.items() if key not in ("lft", "rgt")}
+		row.setdefault(parent_field, None)
+		rows.append(row)
+
+	# Validate the resulting tree before writing anything
+	existing = frappe.db.sql(f"select name, `{parent_field}` from `tab{doctype}`")
+	incoming = {row["name"]: row[parent_field] for row in rows}
+	compute_bounds(
+		[*((name, parent) for name, parent in existing if name not in incoming), *incoming.items()]
+	)
+
+	timestamp, user = now(), frappe.session.user
+	existing_names = {name for name, _parent in existing}
+	groups = defaultdict(list)
+	for row in rows:
+		row.setdefault("modified", timestamp)
+		row.setdefault("modified_by", user)
+		if row["name"] not in existing_names:
+			row.setdefault("creation", timestamp)
+			row.setdefault("owner", user)
+		# upsert writes every column it is given, so rows are grouped by their
+		# columns and existing rows keep the creation and owner they have
+		groups[tuple(sorted(row))].append(row)
+
+	for group in groups.values():
+		for start in range(0, len(group), UPDATE_BATCH_SIZE):
+			upsert(doctype, group[start : start + UPDATE_BATCH_SIZE])
+
+	return {"nodes": len(rows), "bounds_changed": rebuild_tree(doctype)}
+
+
+def move_subtree(doctype, name, new_parent=None):
+	"""
+	Move a node and its descendants under new_parent (None for a root).
+
+	Returns:
+		int: Number of rows whose bounds changed
+	"""
+	parent_field = get_parent_field(doctype)
+	bounds = frappe.db.get_value(doctype, name, ["lft", "rgt"])
+	if not bounds:
+		frappe.throw(f"{doctype} {name} not found")
+
+	if new_parent:
+		parent_bounds = frappe.db.get_value(doctype, new_parent, ["lft", "rgt"])
+		if not parent_bounds:
+			frappe.throw(f"{doctype} {new_parent} not found")
+		if bounds[0] <= parent_bounds[0] <= bounds[1]:
+			frappe.throw(f"Cannot move {name} under its own descendant {new_parent}")
+
+	frappe.db.set_value(doctype, name, parent_field, new_parent or "")
+	return rebuild_tree(doctype)
+
+
+def get_parent_field(doctype):
+	meta = frappe.get_meta(doctype)
+	if not meta.is_tree:
+		frappe.throw(f"{doctype} is not a tree DocType")
+	return meta.nsm_parent_field or f"parent_{frappe.scrub(doctype)}"
+
+
+# =============================================================================
+# API
+# =============================================================================
+
+
+# Tree DocTypes the endpoints may write: rows bypass controllers and hooks, so
+# only trees whose side effects on_tree_change knows about
+API_DOCTYPES = ("Inquiry Topic Category",)
+
+
+@frappe.whitelist()
+def bulk_import_tree(doctype, nodes):
+	"""Whitelisted import_tree; nodes may be a JSON string."""
+	validate_api_access(doctype)
+	result = import_tree(doctype, frappe.parse_json(nodes) if isinstance(nodes, str) else nodes)
+	on_tree_change(doctype)
+	return result
+
+
+@frappe.whitelist()
+def bulk_move_subtree(doctype, name, new_parent=None):
+	"""Whitelisted move_subtree."""
+	validate_api_access(doctype)
+	result = move_subtree(doctype, name, new_parent)
+	on_tree_change(doctype)
+	return {"bounds_changed": result}
+
+
+def validate_api_access(doctype):
+	frappe.only_for("System Manager")
+	if doctype not in API_DOCTYPES:
+		frappe.throw(_("Bulk tree changes are not supported for {0}").format(doctype), frappe.PermissionError)
+
+
+def on_tree_change(doctype):
+	"""Rows were written without document hooks, so drop what the hooks would have."""
+	if doctype == "Inquiry Topic Category":
+		from siud.utils.fixtures import clear_reference_caches
+
+		clear_reference_caches()
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+
+def benchmark(size=10000, fanout=10, doctype="Inquiry Topic Category", compare=False):
+	"""
+	Time a bulk import of a synthetic tree (rolled back afterwards).
+
+	Args:
+		size: Number of nodes
+		fanout: Children per node
+		compare: Also time frappe's per-node rebuild_tree on the same tree
+
+	Returns:
+		dict: Seconds per phase
+	"""
+	size, fanout = int(size), int(fanout)
+	parent_field = get_parent_field(doctype)
+	names = [f"BENCH-{i:06d}" for i in range(size)]
+	nodes = [
+		{
+			"name": name,
+			"category_code": name,
+			"category_name": name,
+			parent_field: names[(i - 1) // fanout] if i else None,
+			"is_group": 1 if i * fanout + 1 < size else 0,
+		}
+		for i, name in enumerate(names)
+	]
+
+	timings = {}
+	start = time.monotonic()
+	compute_bounds((node["name"], node[parent_field]) for node in nodes)
+	timings["compute_bounds"] = round(time.monotonic() - start, 3)
+
+	try:
+		start = time.monotonic()
+		import_tree(doctype, nodes)
+		timings["import_tree"] = round(time.monotonic() - start, 3)
+
+		start = time.monotonic()
+		move_subtree(doctype, names[1], new_parent=names[2])
+		timings["move_subtree"] = round(time.monotonic() - start, 3)
+
+		if compare:
+			from frappe.utils.nestedset import rebuild_tree as frappe_rebuild_tree
+
+			frappe.db.sql(f"update `tab{doctype}` set lft = 0, rgt = 0")
+			start = time.monotonic()
+			frappe_rebuild_tree(doctype)
+			timings["frappe_rebuild_tree"] = round(time.monotonic() - start, 3)
+	finally:
+		frappe.db.rollback()
+
+	print(f"{size} nodes, fanout {fanout}:")
+	for phase, seconds in timings.items():
+		print(f"  {phase:<20} {seconds:>8.3f}s")
+	return timings
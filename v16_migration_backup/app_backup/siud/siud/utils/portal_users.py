@@ -0,0 +1,246 @@
+# Copyright (c) 2025, Tzvi and contributors
+# For license information, please see license.txt
+
+"""
+Bulk Portal User Provisioning
+
+Creates Supplier Portal Users for a list of suppliers without going through
+User.insert()/save() one user at a time:
+
+- User rows and their Has Role rows are written with one bulk INSERT per batch.
+- supplier_link is set for all users (new and existing) with one CASE update
+  per batch, followed by one identity cache invalidation.
+- Welcome emails (with a password reset link) are sent from background jobs.
+
+No initial password is set: users choose their own through the reset link, so
+no plaintext password ever ends up in a request log or job payload.
+
+User document hooks are not run; everything a portal login needs (user type,
+role, supplier_link) is written directly.
+
+Usage:
+	bench --site <site> execute siud.utils.portal_users.bulk_create_portal_users \\
+		--kwargs "{'suppliers': ['SUP-001', 'SUP-002'], 'send_welcome_email': 0}"
+"""
+
+import frappe
+from frappe.utils import cint, now, validate_email_address
+
+from siud.utils import cache
+
+PORTAL_ROLE = "Supplier Portal User"
+BATCH_SIZE = 500
+EMAIL_BATCH_SIZE = 100
+
+
+# =============================================================================
+# API
+# =============================================================================
+
+
+@frappe.whitelist()
+def bulk_create_portal_users(suppliers, send_welcome_email=1):
+	"""
+	Create (or link) one portal user per supplier.
+
+	Args:
+		suppliers: List of Supplier names, or dicts {"supplier", "email", "first_name"};
+			email defaults to the supplier's email, first_name to its supplier_name
+		send_welcome_email: Queue welcome emails with a password reset link
+
+	Returns:
+		dict: {"created": [emails], "linked": [emails], "skipped": [{"supplier", "reason"}]}
+	"""
+	frappe.only_for("System Manager")
+	entries = frappe.parse_json(suppliers) if isinstance(suppliers, str) else suppliers
+	entries = [entry if isinstance(entry, dict) else {"supplier": entry} for entry in entries]
+
+	result = {"created": [], "linked": [], "skipped": []}
+	for start in range(0, len(entries), BATCH_SIZE):
+		provision_batch(entries[start : start + BATCH_SIZE], result)
+		frappe.db.commit()
+
+	cache.invalidate("identity")
+
+	if cint(send_welcome_email) and result["created"]:
+		for start in range(0, len(result["created"]), EMAIL_BATCH_SIZE):
+			frappe.enqueue(
+				send_welcome_emails, queue="long", users=result["created"][start : start + EMAIL_BATCH_SIZE]
+			)
+
+	return result
+
+
+# =============================================================================
+# Provisioning
+# =============================================================================
+
+
+def provision_batch(entries, result):
+	"""Validate a batch, insert new users with their role and link all of them."""
+	supplier_names = [entry.get("supplier") for entry in entries if entry.get("supplier")]
+	suppliers = {}
+	if supplier_names:
+		suppliers = {
+			row.name: row
+			for row in frappe.get_all(
+				"Supplier",
+				filters={"name": ["in", supplier_names]},
+				fields=["name", "supplier_name", "email"],
+			)
+		}
+
+	links = {}
+	for entry in entries:
+		supplier = suppliers.get(entry.get("supplier"))
+		if not supplier:
+			result["skipped"].append({"supplier": entry.get("supplier"), "reason": "Supplier not found"})
+			continue
+
+		email = (entry.get("email") or supplier.email or "").strip().lower()
+		if not email or not validate_email_address(email):
+			result["skipped"].append(
+				{"supplier": supplier.name, "reason": f"No valid email ({email or '-'})"}
+			)
+			continue
+		if email in links:
+			result["skipped"].append({"supplier": supplier.name, "reason": f"Email {email} is used twice"})
+			continue
+
+		links[email] = (supplier.name, entry.get("first_name") or supplier.supplier_name)
+
+	if not links:
+		return
+
+	existing = {
+		row.name: row
+		for row in frappe.get_all(
+			"User", filters={"name": ["in", list(links)]}, fields=["name", "supplier_link", "user_type"]
+		)
+	}
+	for email, user in existing.items():
+		if user.supplier_link and user.supplier_link != links[email][0]:
+			result["skipped"].append(
+				{"supplier": links.pop(email)[0], "reason": f"{email} is linked to {user.supplier_link}"}
+			)
+		elif user.user_type == "System User":
+			result["skipped"].append({"supplier": links.pop(email)[0], "reason": f"{email} is a desk user"})
+
+	new_users = [email for email in links if email not in existing]
+	insert_users({email: links[email][1] for email in new_users})
+	added = add_portal_role(list(links))
+	link_suppliers({email: supplier for email, (supplier, first_name) in links.items()})
+	# frappe caches each user's roles; new users have nothing cached yet
+	for email in added:
+		if email in existing:
+			frappe.clear_cache(user=email)
+
+	result["created"].extend(new_users)
+	result["linked"].extend(email for email in links if email in existing)
+
+
+def insert_users(users):
+	"""Bulk insert Website Users. users: {email: first_name}"""
+	if not users:
+		return
+	timestamp, owner = now(), frappe.session.user
+	frappe.db.bulk_insert(
+		"User",
+		[
+			"name",
+			"email",
+			"first_name",
+			"full_name",
+			"user_type",
+			"enabled",
+			"send_welcome_email",
+			"creation",
+			"modified",
+			"owner",
+			"modified_by",
+		],
+		[
+			[email, email, first_name, first_name, "Website User", 1, 0, timestamp, timestamp, owner, owner]
+			for email, first_name in users.items()
+		],
+	)
+
+
+def add_portal_role(users):
+	"""
+	Add the portal role to users that do not have it yet.
+
+	Returns:
+		list: The users the role was added to
+	"""
+	having = set(
+		frappe.get_all(
+			"Has Role",
+			filters={"parenttype": "User", "parent": ["in", users], "role": PORTAL_ROLE},
+			pluck="parent",
+		)
+	)
+	missing = [user for user in users if user not in having]
+	if not missing:
+		return []
+
+	timestamp, owner = now(), frappe.session.user
+	frappe.db.bulk_insert(
+		"Has Role",
+		[
+			"name",
+			"parent",
+			"parenttype",
+			"parentfield",
+			"idx",
+			"role",
+			"creation",
+			"modified",
+			"owner",
+			"modified_by",
+		],
+		[
+			[
+				frappe.generate_hash(length=10),
+				user,
+				"User",
+				"roles",
+				1,
+				PORTAL_ROLE,
+				timestamp,
+				timestamp,
+				owner,
+				owner,
+			]
+			for user in missing
+		],
+	)
+	return missing
+
+
+def link_suppliers(links):
+	"""Set supplier_link for many users in one statement. links: {email: supplier}"""
+	if not links:
+		return
+	cases = " ".join(["when %s then %s"] * len(links))
+	frappe.db.sql(
+		f"""update `tabUser`
+		set supplier_link = case name {cases} end, modified = %s
+		where name in %s""",
+		[value for pair in links.items() for value in pair] + [now(), list(links)],
+	)
+
+
+# =============================================================================
+# Background Jobs
+# =============================================================================
+
+
+def send_welcome_emails(users):
+	for user in users:
+		try:
+			frappe.get_doc("User", user).send_welcome_mail_to_user()
+			frappe.db.commit()
+		except Exception:
+			frappe.db.rollback()
+			frappe.log_error(title=f"Welcome email to {user} failed")
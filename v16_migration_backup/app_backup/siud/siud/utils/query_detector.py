@@ -0,0 +1,276 @@
+# Copyright (c) 2025, Tzvi and contributors
+# For license information, please see license.txt
+
+"""
+N+1 Query Detector
+
+Fingerprints every SQL statement issued through frappe.db.sql during a request,
+background job or test block, and flags query shapes that repeat more often than
+a threshold together with the Python call sites that issued them.
+
+Enabled per request when developer mode is on, or explicitly with the
+`siud_n_plus_one_detection` site config key. Tests can use detect_n_plus_one()
+or NPlusOneAssertionsMixin directly.
+"""
+
+import os
+import re
+import sys
+from collections import defaultdict
+from contextlib import contextmanager
+
+import frappe
+
+DEFAULT_THRESHOLD = 5
+MAX_CALL_SITES = 5
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\"")
+_PLACEHOLDER = re.compile(r"%\([^)]+\)s|%s")
+_NUMBER = re.compile(r"(?<![\w`])-?\d+(?:\.\d+)?(?![\w`])")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+_THIS_FILE = os.path.abspath(__file__)
+_FRAPPE_DIR = os.path.dirname(os.path.abspath(frappe.__file__)) + os.sep
+
+
+def fingerprint(query):
+	"""
+	Reduce a SQL statement to its shape by masking literals and placeholders.
+
+	Args:
+		query: SQL string (or a query builder object)
+
+	Returns:
+		str: Normalized query shape, e.g.
+			"select `name` from `tabUser` where `name`=? limit ?"
+	"""
+	shape = str(query)
+	shape = _STRING_LITERAL.sub("?", shape)
+	shape = _PLACEHOLDER.sub("?", shape)
+	shape = _NUMBER.sub("?", shape)
+	shape = _VALUE_LIST.sub("(?+)", shape)
+	return _WHITESPACE.sub(" ", shape).strip().lower()
+
+
+def get_call_site():
+	"""
+	Find the innermost stack frame outside Frappe, third-party packages and this module.
+
+	Returns:
+		str: "path/to/file.py:123 in function_name", or "" if none was found
+	"""
+	frame = sys._getframe(2)
+	while frame:
+		filename = frame.f_code.co_filename
+		if (
+			filename != _THIS_FILE
+			and not filename.startswith(_FRAPPE_DIR)
+			and "site-packages" not in filename
+			and not filename.startswith("<")
+		):
+			return f"{_relative_path(filename)}:{frame.f_lineno} in {frame.f_code.co_name}"
+		frame = frame.f_back
+	return ""
+
+
+def _relative_path(filename):
+	marker = os.sep + "apps" + os.sep
+	if marker in filename:
+		return filename.split(marker, 1)[1]
+	return filename
+
+
+# =============================================================================
+# Query Log
+# =============================================================================
+
+
+class QueryLog:
+	"""Collects query fingerprints and reports repeated shapes above a threshold."""
+
+	def __init__(self, threshold=DEFAULT_THRESHOLD):
+		self.threshold = threshold
+		self.total = 0
+		self.counts = defaultdict(int)
+		self.samples = {}
+		self.call_sites = defaultdict(dict)
+
+	def record(self, query, call_site=""):
+		shape = fingerprint(query)
+		self.total += 1
+		self.counts[shape] += 1
+		self.samples.setdefault(shape, str(query))
+
+		sites = self.call_sites[shape]
+		if call_site in sites or len(sites) < MAX_CALL_SITES:
+			sites[call_site] = sites.get(call_site, 0) + 1
+
+	def violations(self):
+		"""
+		Get query shapes that were issued at least `threshold` times.
+
+		Returns:
+			list: [{"fingerprint": str, "count": int, "sample": str, "call_sites": dict}]
+				sorted by count, most repeated first
+		"""
+		return [
+			{
+				"fingerprint": shape,
+				"count": count,
+				"sample": self.samples[shape],
+				"call_sites": dict(self.call_sites[shape]),
+			}
+			for shape, count in sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+			if count >= self.threshold
+		]
+
+	def format_report(self, context=None):
+		violations = self.violations()
+		if not violations:
+			return ""
+
+		lines = [f"Possible N+1 queries{f' in {context}' if context else ''} ({self.total} queries total):"]
+		for violation in violations:
+			lines.append(f"  {violation['count']}x {violation['fingerprint']}")
+			for site, count in violation["call_sites"].items():
+				lines.append(f"      {count}x from {site or '<unknown>'}")
+		return "\n".join(lines)
+
+
+@contextmanager
+def detect_n_plus_one(threshold=DEFAULT_THRESHOLD):
+	"""
+	Record every query issued through frappe.db.sql inside the block.
+
+	Args:
+		threshold: Minimum repetitions of a query shape to count as a violation
+
+	Yields:
+		QueryLog: The log being filled; inspect .violations() after the block
+	"""
+	log = QueryLog(threshold)
+	restore = _install(frappe.db, log)
+	try:
+		yield log
+	finally:
+		restore()
+
+
+def _install(db, log):
+	"""Wrap db.sql on the connection instance only, so other threads/requests are unaffected."""
+	previous = {key: db.__dict__[key] for key in ("sql", "_siud_query_log") if key in db.__dict__}
+	original_sql = db.sql
+
+	def sql(query, *args, **kwargs):
+		log.record(query, get_call_site())
+		return original_sql(query, *args, **kwargs)
+
+	db.sql = sql
+	db._siud_query_log = log
+
+	def restore():
+		for key in ("sql", "_siud_query_log"):
+			db.__dict__.pop(key, None)
+		db.__dict__.update(previous)
+
+	return restore
+
+
+# =============================================================================
+# Request / Job Hooks
+# =============================================================================
+
+
+def is_enabled():
+	"""Detection runs when `siud_n_plus_one_detection` is set, otherwise in developer mode."""
+	setting = frappe.conf.get("siud_n_plus_one_detection")
+	if setting is not None:
+		return bool(setting)
+	return bool(frappe.conf.get("developer_mode"))
+
+
+def get_threshold():
+	return frappe.conf.get("siud_n_plus_one_threshold") or DEFAULT_THRESHOLD
+
+
+def start():
+	db = getattr(frappe.local, "db", None)
+	if not db or not is_enabled():
+		return
+	if getattr(db, "_siud_query_log", None) is None:
+		frappe.local.siud_query_log_restore = _install(db, QueryLog(get_threshold()))
+
+
+def stop(context=None):
+	"""
+	Stop recording and log any violations.
+
+	Returns:
+		QueryLog: The finished log, or None if detection was not running
+	"""
+	db = getattr(frappe.local, "db", None)
+	restore = getattr(frappe.local, "siud_query_log_restore", None)
+	if not db or not restore:
+		return None
+
+	log = db._siud_query_log
+	restore()
+	frappe.local.siud_query_log_restore = None
+	report = log.format_report(context)
+	if report:
+		frappe.logger("siud.n_plus_one", allow_site=True).warning(report)
+	return log
+
+
+def before_request():
+	start()
+
+
+def after_request(response=None, request=None):
+	context = frappe.form_dict.get("cmd") or (request.path if request else None)
+	log = stop(context)
+	if log and response is not None:
+		violations = log.violations()
+		if violations:
+			response.headers["X-Siud-N-Plus-One"] = str(len(violations))
+
+
+def before_job(method=None, kwargs=None, transaction_type=None):
+	start()
+
+
+def after_job(method=None, kwargs=None, result=None):
+	stop(method)
+
+
+# =============================================================================
+# Test Helpers
+# =============================================================================
+
+
+class NPlusOneAssertionsMixin:
+	"""
+	Assertions for IntegrationTestCase subclasses.
+
+	Example:
+		class IntegrationTestSupplierPortal(NPlusOneAssertionsMixin, IntegrationTestCase):
+			def test_stats(self):
+				with self.assertNoNPlusOne():
+					get_inquiry_stats()
+	"""
+
+	@contextmanager
+	def assertNoNPlusOne(self, threshold=DEFAULT_THRESHOLD):
+		with detect_n_plus_one(threshold) as log:
+			yield log
+		report = log.format_report()
+		if report:
+			self.fail(report)
+
+	@contextmanager
+	def assertNPlusOne(self, threshold=DEFAULT_THRESHOLD):
+		with detect_n_plus_one(threshold) as log:
+			yield log
+		if not log.violations():
+			self.fail(f"Expected a query shape repeated at least {threshold} times")
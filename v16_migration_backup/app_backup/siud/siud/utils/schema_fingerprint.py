@@ -0,0 +1,119 @@
+# Copyright (c) 2025, Tzvi and contributors
+# For license information, please see license.txt
+
+"""
+Schema Fingerprint
+
+A fingerprint of everything `bench migrate` and provisioning apply to a site:
+installed app versions and patch lists, the siud module JSON and controllers
+(DocTypes, workspaces), fixtures, and the provisioning specs (roles, workflow,
+custom fields such as User.supplier_link, permissions, web form).
+
+The provisioning scripts are not part of the app, so the caller passes their
+directory; its .py files are hashed as they are, without importing them.
+
+The init job compares it with the fingerprint stored after the last successful
+rollout and skips migrate and provisioning when nothing changed:
+
+	bench --site $SITE_NAME siud-schema-check --provisioning $SPECS || {
+		bench --site $SITE_NAME migrate && ... && bench --site $SITE_NAME siud-schema-stamp --provisioning $SPECS
+	}
+"""
+
+import hashlib
+import json
+import os
+
+import frappe
+
+GLOBAL_KEY = "siud_schema_fingerprint"
+APP = "siud"
+
+
+def get_fingerprint(provisioning_path=None):
+	"""
+	Compute the current fingerprint from the installed code.
+
+	Args:
+		provisioning_path: Directory (or file) of the provisioning specs (optional)
+
+	Returns:
+		dict: {component: sha256 hex digest}
+	"""
+	components = {}
+	installed_apps = frappe.get_installed_apps()
+	components["apps"] = _hash_text("\n".join(installed_apps))
+
+	for app in installed_apps:
+		components[f"{app}:version"] = _hash_text(str(frappe.get_attr(f"{app}.__version__")))
+		components[f"{app}:patches"] = _hash_files([frappe.get_app_path(app, "patches.txt")])
+
+	module_path = frappe.get_app_path(APP, frappe.scrub(APP))
+	# Controllers define on_doctype_update indexes; tests do not reach the site
+	module_files = [path for path in _walk(module_path, (".json", ".py")) if not _is_test(path)]
+	components[f"{APP}:modules"] = _hash_files(module_files)
+	components[f"{APP}:fixtures"] = _hash_files(_walk(frappe.get_app_path(APP, "fixtures"), ".json"))
+	components[f"{APP}:hooks"] = _hash_files([frappe.get_app_path(APP, "hooks.py")])
+	if provisioning_path:
+		components[f"{APP}:provisioning"] = _hash_provisioning(provisioning_path)
+
+	return components
+
+
+def get_stored_fingerprint():
+	stored = frappe.db.get_global(GLOBAL_KEY)
+	return json.loads(stored) if stored else {}
+
+
+def get_changes(stored, current):
+	"""
+	Returns:
+		list: Components that were added, removed or changed (sorted)
+	"""
+	return sorted(key for key in stored.keys() | current.keys() if stored.get(key) != current.get(key))
+
+
+def stamp(provisioning_path=None):
+	"""Store the current fingerprint (after a successful migrate and provisioning)."""
+	frappe.db.set_global(GLOBAL_KEY, json.dumps(get_fingerprint(provisioning_path), sort_keys=True))
+	frappe.db.commit()
+
+
+def _hash_provisioning(path):
+	path = os.path.abspath(path)
+	if os.path.isfile(path):
+		return _hash_files([path], root=os.path.dirname(path))
+	if not os.path.isdir(path):
+		raise FileNotFoundError(f"Provisioning specs not found: {path}")
+	return _hash_files(_walk(path, ".py"), root=path)
+
+
+def _is_test(path):
+	return os.path.basename(path).startswith("test_")
+
+
+def _walk(path, extensions):
+	if not os.path.isdir(path):
+		return []
+	files = []
+	for root, dirs, filenames in os.walk(path):
+		dirs[:] = sorted(directory for directory in dirs if directory != "__pycache__")
+		files.extend(os.path.join(root, name) for name in sorted(filenames) if name.endswith(extensions))
+	return files
+
+
+def _hash_files(paths, root=None):
+	root = root or frappe.get_app_path(APP, "..")
+	digest = hashlib.sha256()
+	for path in paths:
+		if not os.path.exists(path):
+			continue
+		# The relative path is part of the hash, so renames and moves count as changes
+		digest.update(os.path.relpath(path, root).encode())
+		with open(path, "rb") as f:
+			digest.update(f.read())
+	return digest.hexdigest()
+
+
+def _hash_text(text):
+	return hashlib.sha256(text.encode()).hexdigest()
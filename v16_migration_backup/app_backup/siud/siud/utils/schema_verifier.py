@@ -0,0 +1,360 @@
+# Copyright (c) 2025, Tzvi and contributors
+# For license information, please see license.txt
+
+"""
+Schema and Data Verifier
+
+Replaces the hand-captured files in v16_migration_backup/schema/ with a
+snapshot taken from a live site, and diffs two snapshots (e.g. v15 before and
+v16 after the migration):
+
+- Columns (type, nullability, default, extra) and indexes from
+  information_schema, one query each for all tables
+- Per-table row counts and checksums computed in primary-key ranges of
+  chunk_size rows, BIT_XOR(CRC32(CONCAT_WS(...))) per range, so no query holds
+  a long lock or scans a whole large table at once. Ranges run in parallel,
+  each worker thread with its own DB connection.
+
+Because BIT_XOR is associative, a table's checksum is the XOR of its range
+checksums and stays comparable when the two snapshots chose different range
+boundaries. Ranges with identical boundaries are compared one by one to locate
+mismatching rows.
+
+Usage:
+	bench --site <site> siud-schema-snapshot before.json [--workers 8] [--chunk-size 10000]
+	bench siud-schema-diff before.json after.json
+"""
+
+import json
+import queue
+import threading
+import time
+import traceback
+
+import frappe
+from frappe.utils import now_datetime
+
+MODULE = "Siud"
+DEFAULT_CHUNK_SIZE = 10000
+DEFAULT_WORKERS = 4
+
+
+# =============================================================================
+# Snapshot
+# =============================================================================
+
+
+def snapshot(tables=None, chunk_size=DEFAULT_CHUNK_SIZE, workers=DEFAULT_WORKERS):
+	"""
+	Snapshot schema, row counts and checksums of the given tables.
+
+	Args:
+		tables: Table names (default: all tables of the siud module's DocTypes)
+		chunk_size: Rows per primary-key range
+		workers: Parallel DB connections
+
+	Returns:
+		dict: {"site", "taken_at", "chunk_size", "tables": {table: {"columns", "indexes", "rows"}}}
+	"""
+	start = time.monotonic()
+	tables = sorted(tables or get_module_tables())
+	existing = set(
+		frappe.db.sql_list("select table_name from information_schema.tables where table_schema = database()")
+	)
+	tables = [table for table in tables if table in existing]
+
+	result = {
+		"site": frappe.local.site,
+		"taken_at": str(now_datetime()),
+		"chunk_size": chunk_size,
+		"tables": {table: {"columns": {}, "indexes": {}, "rows": None} for table in tables},
+	}
+	if not tables:
+		return result
+
+	for column in get_columns(tables):
+		result["tables"][column.pop("table")]["columns"][column.pop("column")] = column
+	for table, indexes in get_indexes(tables).items():
+		result["tables"][table]["indexes"] = indexes
+
+	# Phase 1: range boundaries per table, phase 2: one checksum query per range
+	boundaries = dict(
+		run_parallel([(table, get_boundaries, (table, chunk_size)) for table in tables], workers)
+	)
+	tasks = []
+	for table in tables:
+		columns = sorted(result["tables"][table]["columns"])
+		for lower, upper in boundaries[table]:
+			tasks.append(((table, lower, upper), checksum_range, (table, columns, lower, upper)))
+
+	ranges = {table: [] for table in tables}
+	for (table, lower, upper), (count, checksum) in run_parallel(tasks, workers):
+		ranges[table].append({"from": lower, "to": upper, "count": count, "checksum": checksum})
+
+	for table in tables:
+		table_ranges = sorted(ranges[table], key=lambda r: (r["from"] is not None, r["from"] or ""))
+		total = 0
+		for r in table_ranges:
+			total ^= r["checksum"]
+		result["tables"][table]["rows"] = {
+			"count": sum(r["count"] for r in table_ranges),
+			"checksum": total,
+			"checksum_columns": sorted(result["tables"][table]["columns"]),
+			"ranges": table_ranges,
+		}
+
+	result["duration"] = round(time.monotonic() - start, 2)
+	return result
+
+
+def get_module_tables():
+	return [
+		f"tab{doctype}"
+		for doctype in frappe.get_all(
+			"DocType", filters={"module": MODULE, "issingle": 0, "is_virtual": 0}, pluck="name"
+		)
+	]
+
+
+def get_columns(tables):
+	return frappe.db.sql(
+		"""select table_name as `table`, column_name as `column`, column_type as type,
+			is_nullable as nullable, column_default as `default`, extra
+		from information_schema.columns
+		where table_schema = database() and table_name in %s
+		order by table_name, ordinal_position""",
+		(tables,),
+		as_dict=True,
+	)
+
+
+def get_indexes(tables):
+	"""
+	Returns:
+		dict: {table: {index name: {"unique": bool, "columns": [..]}}}
+	"""
+	indexes = {}
+	for row in frappe.db.sql(
+		"""select table_name, index_name, non_unique, column_name
+		from information_schema.statistics
+		where table_schema = database() and table_name in %s
+		order by table_name, index_name, seq_in_index""",
+		(tables,),
+		as_dict=True,
+	):
+		index = indexes.setdefault(row.table_name, {}).setdefault(
+			row.index_name, {"unique": not row.non_unique, "columns": []}
+		)
+		index["columns"].append(row.column_name)
+	return indexes
+
+
+def get_boundaries(table, chunk_size):
+	"""
+	Split a table into primary-key ranges of chunk_size rows by walking the PK index.
+
+	Returns:
+		list: [(from, to)] with from exclusive and to inclusive; None means unbounded
+	"""
+	boundaries, lower = [], None
+	while True:
+		upper = frappe.db.sql(
+			f"""select name from `{table}`
+			{"where name > %(lower)s" if lower is not None else ""}
+			order by name limit 1 offset {chunk_size - 1}""",
+			{"lower": lower},
+		)
+		if not upper:
+			boundaries.append((lower, None))
+			return boundaries
+		boundaries.append((lower, upper[0][0]))
+		lower = upper[0][0]
+
+
+def checksum_range(table, columns, lower, upper):
+	"""
+	Returns:
+		tuple: (row count, BIT_XOR of the row CRC32s) for lower < name <= upper
+	"""
+	conditions = []
+	if lower is not None:
+		conditions.append("name > %(lower)s")
+	if upper is not None:
+		conditions.append("name <= %(upper)s")
+	row_hash = "concat_ws('#', {})".format(", ".join(f"ifnull(`{column}`, '\\\\N')" for column in columns))
+
+	count, checksum = frappe.db.sql(
+		f"""select count(*), ifnull(bit_xor(crc32({row_hash})), 0) from `{table}`
+		{"where " + " and ".join(conditions) if conditions else ""}""",
+		{"lower": lower, "upper": upper},
+	)[0]
+	return int(count), int(checksum)
+
+
+def run_parallel(tasks, workers):
+	"""
+	Run (key, fn, args) tasks on worker threads, each with its own site init and connection.
+
+	Returns:
+		list: [(key, result)]
+
+	Raises:
+		frappe.ValidationError: If any task failed
+	"""
+	site, sites_path = frappe.local.site, frappe.local.sites_path
+	pending = queue.Queue()
+	for task in tasks:
+		pending.put(task)
+
+	results, errors = [], []
+
+	def work():
+		frappe.init(site=site, sites_path=sites_path)
+		try:
+			frappe.connect()
+			while True:
+				try:
+					key, fn, args = pending.get_nowait()
+				except queue.Empty:
+					return
+				try:
+					results.append((key, fn(*args)))
+				except Exception:
+					errors.append(f"{key}: {traceback.format_exc()}")
+				finally:
+					# Do not keep a read view open between ranges
+					frappe.db.rollback()
+		finally:
+			frappe.destroy()
+
+	threads = [
+		threading.Thread(target=work, name=f"siud-verify-{i}")
+		for i in range(max(1, min(workers, len(tasks))))
+	]
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+
+	if errors:
+		frappe.throw("Snapshot failed:\n" + "\n".join(errors))
+	return results
+
+
+def save(data, path):
+	with open(path, "w") as f:
+		json.dump(data, f, indent=1, ensure_ascii=False, default=str)
+
+
+def load(path):
+	with open(path) as f:
+		return json.load(f)
+
+
+# =============================================================================
+# Diff
+# =============================================================================
+
+
+def diff(before, after):
+	"""
+	Compare two snapshots.
+
+	Returns:
+		dict: {"missing_tables", "extra_tables", "columns", "indexes", "rows"};
+			empty lists/dicts mean no difference
+	"""
+	before_tables, after_tables = before["tables"], after["tables"]
+	result = {
+		"missing_tables": sorted(before_tables.keys() - after_tables.keys()),
+		"extra_tables": sorted(after_tables.keys() - before_tables.keys()),
+		"columns": {},
+		"indexes": {},
+		"rows": {},
+	}
+
+	for table in sorted(before_tables.keys() & after_tables.keys()):
+		old, new = before_tables[table], after_tables[table]
+
+		columns = compare(old["columns"], new["columns"])
+		if columns:
+			result["columns"][table] = columns
+
+		indexes = compare(old["indexes"], new["indexes"])
+		if indexes:
+			result["indexes"][table] = indexes
+
+		rows = compare_rows(old["rows"], new["rows"])
+		if rows:
+			result["rows"][table] = rows
+
+	return result
+
+
+def compare(old, new):
+	"""Missing, extra and changed keys of two {name: definition} dicts."""
+	result = {
+		"missing": sorted(old.keys() - new.keys()),
+		"extra": sorted(new.keys() - old.keys()),
+		"changed": {
+			name: [old[name], new[name]] for name in sorted(old.keys() & new.keys()) if old[name] != new[name]
+		},
+	}
+	return result if any(result.values()) else None
+
+
+def compare_rows(old, new):
+	if not old or not new:
+		return None
+
+	result = {}
+	if old["count"] != new["count"]:
+		result["count"] = [old["count"], new["count"]]
+
+	if old["checksum_columns"] != new["checksum_columns"]:
+		# Row hashes include every column, so they differ whenever the columns do
+		result["checksum"] = "not comparable (columns differ)"
+	elif old["checksum"] != new["checksum"]:
+		result["checksum"] = "mismatch"
+		# Only ranges with the same boundaries in both snapshots can be compared
+		new_ranges = {(r["from"], r["to"]): (r["count"], r["checksum"]) for r in new["ranges"]}
+		result["ranges"] = [
+			[r["from"], r["to"]]
+			for r in old["ranges"]
+			if new_ranges.get((r["from"], r["to"]), (r["count"], r["checksum"]))
+			!= (r["count"], r["checksum"])
+		]
+
+	return result or None
+
+
+def has_differences(result):
+	return any(result.values())
+
+
+def format_diff(result):
+	"""Human-readable report of a diff()."""
+	lines = []
+	for table in result["missing_tables"]:
+		lines.append(f"✗ missing table {table}")
+	for table in result["extra_tables"]:
+		lines.append(f"+ extra table {table}")
+
+	for kind in ("columns", "indexes"):
+		for table, changes in result[kind].items():
+			for name in changes["missing"]:
+				lines.append(f"✗ {table}: missing {kind[:-1] if kind == 'columns' else 'index'} {name}")
+			for name in changes["extra"]:
+				lines.append(f"+ {table}: extra {kind[:-1] if kind == 'columns' else 'index'} {name}")
+			for name, (old, new) in changes["changed"].items():
+				lines.append(f"~ {table}: {name} changed {old} -> {new}")
+
+	for table, rows in result["rows"].items():
+		if "count" in rows:
+			lines.append(f"✗ {table}: {rows['count'][0]} rows -> {rows['count'][1]} rows")
+		if "checksum" in rows:
+			lines.append(f"✗ {table}: checksum {rows['checksum']}")
+		for lower, upper in rows.get("ranges", []):
+			lines.append(f"    differs in name range ({lower}, {upper}]")
+
+	return "\n".join(lines) if lines else "✓ No differences"
@@ -0,0 +1,427 @@
+# Copyright (c) 2025, Tzvi and contributors
+# For license information, please see license.txt
+
+"""
+Bulk Supplier Import
+
+Imports suppliers, their activity domains and contact persons from a CSV or XLSX
+file with one row per contact person (or per supplier without contacts):
+
+	supplier_id, supplier_name, address, phone, email, activity_domains,
+	contact_name, contact_email, contact_mobile, contact_branch,
+	contact_primary_role_type, contact_roles
+
+- The file is read as a stream and processed in chunks of chunk_size rows.
+- Activity domains and contact roles (separated by , ; or |) are resolved by
+  code or name through lookup maps loaded once.
+- Each chunk is validated first, then suppliers, Supplier Activity Domain rows,
+  Contact Persons and Contact Person Role rows are written with one bulk
+  INSERT per table; Contact Person names are reserved from the CP- series as
+  one block per chunk.
+- Invalid rows are skipped and reported with their row number; a supplier
+  whose own columns are invalid is skipped with all its contacts.
+
+Rows of a supplier after the first only need supplier_id and the contact
+columns. Suppliers that existed before the import are not modified.
+
+Usage:
+	bench --site <site> siud-import-suppliers suppliers.xlsx [--dry-run] [--chunk-size 500]
+"""
+
+import csv
+import os
+import re
+
+import frappe
+from frappe.model.naming import _format_autoname, make_autoname
+from frappe.utils import cint, cstr, now, validate_email_address, validate_phone_number
+
+from siud.siud.doctype.contact_person.contact_person import normalize_email, normalize_phone
+from siud.utils.domain_mask import get_mask
+from siud.utils.supplier_search import index_suppliers
+
+DEFAULT_CHUNK_SIZE = 500
+LIST_SEPARATOR = re.compile(r"[,;|\n]")
+CONTACT_COLUMNS = {
+	"contact_name": "contact_name",
+	"contact_email": "email",
+	"contact_mobile": "mobile_phone",
+	"contact_branch": "branch",
+	"contact_primary_role_type": "primary_role_type",
+}
+PRIMARY_ROLE_TYPES = ("ספק", "איש קשר של ספק")
+
+
+# =============================================================================
+# Entry Points
+# =============================================================================
+
+
+def import_suppliers(file_path, chunk_size=DEFAULT_CHUNK_SIZE, dry_run=False):
+	"""
+	Import a supplier file.
+
+	Args:
+		file_path: Path to a .csv or .xlsx file
+		chunk_size: Rows validated and inserted together
+		dry_run: Validate only, write nothing
+
+	Returns:
+		dict: {"rows", "suppliers", "contacts", "errors": [{"row", "supplier_id", "errors"}]}
+	"""
+	importer = SupplierImport(dry_run=dry_run)
+	for chunk in iter_chunks(iter_file(file_path), int(chunk_size)):
+		importer.import_chunk(chunk)
+		if dry_run:
+			frappe.db.rollback()
+		else:
+			frappe.db.commit()
+
+	if importer.report["contacts"] and not dry_run:
+		from siud.utils.fixtures import clear_reference_caches
+
+		clear_reference_caches()
+	return importer.report
+
+
+@frappe.whitelist()
+def enqueue_supplier_import(file_url, dry_run=0):
+	"""
+	Run an import of an uploaded File in a background job.
+
+	The result is published to the calling user as the realtime event
+	"siud_supplier_import".
+	"""
+	frappe.only_for("System Manager")
+	file_path = frappe.get_doc("File", {"file_url": file_url}).get_full_path()
+	job = frappe.enqueue(
+		run_import_job,
+		queue="long",
+		timeout=3600,
+		file_path=file_path,
+		dry_run=bool(cint(dry_run)),
+		user=frappe.session.user,
+	)
+	return {"job_id": job.id if job else None}
+
+
+def run_import_job(file_path, dry_run, user):
+	try:
+		report = import_suppliers(file_path, dry_run=dry_run)
+	except Exception:
+		frappe.db.rollback()
+		frappe.log_error(title="Supplier import failed")
+		report = {"failed": True}
+	frappe.publish_realtime("siud_supplier_import", report, user=user)
+
+
+# =============================================================================
+# Reading
+# =============================================================================
+
+
+def iter_file(file_path):
+	"""
+	Yield (row number, {column: str}) from a CSV or XLSX file, header row excluded.
+
+	Row numbers are as shown in a spreadsheet (the header is row 1).
+	"""
+	extension = os.path.splitext(file_path)[1].lower()
+	if extension == ".csv":
+		# utf-8-sig strips the BOM Excel writes
+		with open(file_path, encoding="utf-8-sig", newline="") as f:
+			reader = csv.reader(f)
+			header = normalize_header(next(reader, []))
+			for row_number, values in enumerate(reader, start=2):
+				# Spreadsheet rows may be shorter or longer than the header: missing
+				# cells are read as empty by the row checks, extra ones are ignored
+				yield row_number, dict(zip(header, (cstr(value).strip() for value in values), strict=False))
+
+	elif extension == ".xlsx":
+		from openpyxl import load_workbook
+
+		# read_only streams the sheet instead of loading it whole
+		workbook = load_workbook(file_path, read_only=True, data_only=True)
+		try:
+			rows = workbook.active.iter_rows(values_only=True)
+			header = normalize_header(next(rows, ()))
+			for row_number, values in enumerate(rows, start=2):
+				yield row_number, dict(zip(header, (format_cell(value) for value in values), strict=False))
+		finally:
+			workbook.close()
+
+	else:
+		frappe.throw(f"Unsupported file type {extension}, expected .csv or .xlsx")
+
+
+def normalize_header(header):
+	return [cstr(column).strip().lower().replace(" ", "_") for column in header]
+
+
+def format_cell(value):
+	# Numeric IDs come back from Excel as floats
+	if isinstance(value, float) and value.is_integer():
+		value = int(value)
+	return cstr(value).strip()
+
+
+def iter_chunks(rows, chunk_size):
+	chunk = []
+	for row in rows:
+		if not any(row[1].values()):
+			continue
+		chunk.append(row)
+		if len(chunk) >= chunk_size:
+			yield chunk
+			chunk = []
+	if chunk:
+		yield chunk
+
+
+def split_list(value):
+	return [item.strip() for item in LIST_SEPARATOR.split(value or "") if item.strip()]
+
+
+# =============================================================================
+# Import
+# =============================================================================
+
+
+class SupplierImport:
+	def __init__(self, dry_run=False):
+		self.dry_run = dry_run
+		self.activity_domains = load_lookup("Activity Domain Category", ["category_code", "category_name"])
+		self.supplier_roles = load_lookup("Supplier Role", ["role_name", "role_title_he"])
+		# supplier_id -> True if created by this import, False if it failed validation
+		self.seen = {}
+		self.report = {"rows": 0, "suppliers": 0, "contacts": 0, "errors": []}
+
+	def import_chunk(self, rows):
+		"""Validate a chunk, then bulk insert everything valid in it."""
+		self.report["rows"] += len(rows)
+		ids = {row.get("supplier_id") for row_number, row in rows if row.get("supplier_id")}
+		existing = (
+			set(frappe.get_all("Supplier", filters={"name": ["in", list(ids)]}, pluck="name"))
+			if ids
+			else set()
+		)
+
+		suppliers, contacts = {}, []
+		for row_number, row in rows:
+			errors = []
+			supplier_id = row.get("supplier_id")
+
+			if not supplier_id:
+				errors.append("supplier_id is required")
+			elif supplier_id in existing and supplier_id not in self.seen:
+				errors.append(f"Supplier {supplier_id} already exists")
+			elif supplier_id not in self.seen and supplier_id not in suppliers:
+				supplier, supplier_errors = self.build_supplier(row)
+				if supplier_errors:
+					self.seen[supplier_id] = False
+					errors.extend(supplier_errors)
+				else:
+					suppliers[supplier_id] = supplier
+			elif self.seen.get(supplier_id) is False:
+				errors.append(f"Supplier {supplier_id} was skipped because of errors in an earlier row")
+
+			if not errors and any(row.get(column) for column in (*CONTACT_COLUMNS, "contact_roles")):
+				contact, contact_errors = self.build_contact(supplier_id, row)
+				if contact_errors:
+					errors.extend(contact_errors)
+				else:
+					contacts.append(contact)
+
+			if errors:
+				self.report["errors"].append(
+					{"row": row_number, "supplier_id": supplier_id, "errors": errors}
+				)
+
+		self.seen.update(dict.fromkeys(suppliers, True))
+		self.insert(suppliers, contacts)
+
+	def build_supplier(self, row):
+		errors = []
+		if not row.get("supplier_name"):
+			errors.append("supplier_name is required")
+		if row.get("email") and not validate_email_address(row["email"]):
+			errors.append(f"Invalid email {row['email']}")
+		if row.get("phone") and not validate_phone_number(row["phone"]):
+			errors.append(f"Invalid phone {row['phone']}")
+
+		domains = []
+		for value in split_list(row.get("activity_domains")):
+			domain = self.activity_domains.get(value.lower())
+			if not domain:
+				errors.append(f"Unknown activity domain {value}")
+			elif domain not in domains:
+				domains.append(domain)
+
+		supplier = {
+			"name": row["supplier_id"],
+			"supplier_id": row["supplier_id"],
+			"supplier_name": row.get("supplier_name"),
+			"address": row.get("address") or None,
+			"phone": row.get("phone") or None,
+			"email": row.get("email") or None,
+			"activity_domains": domains,
+			# Set by Supplier.validate on save; bulk_insert bypasses it
+			"activity_domain_mask": get_mask(domains),
+		}
+		return supplier, errors
+
+	def build_contact(self, supplier_id, row):
+		errors = []
+		contact = {target: row.get(source) or None for source, target in CONTACT_COLUMNS.items()}
+		contact["supplier_link"] = supplier_id
+
+		if not contact["contact_name"]:
+			errors.append("contact_name is required for a contact person")
+		if contact["email"] and not validate_email_address(contact["email"]):
+			errors.append(f"Invalid contact email {contact['email']}")
+		if contact["mobile_phone"] and not validate_phone_number(contact["mobile_phone"]):
+			errors.append(f"Invalid contact mobile {contact['mobile_phone']}")
+		if contact["primary_role_type"] and contact["primary_role_type"] not in PRIMARY_ROLE_TYPES:
+			errors.append(f"Invalid primary role type {contact['primary_role_type']}")
+
+		roles = []
+		for value in split_list(row.get("contact_roles")):
+			role = self.supplier_roles.get(value.lower())
+			if not role:
+				errors.append(f"Unknown supplier role {value}")
+			elif role not in roles:
+				roles.append(role)
+		contact["assigned_roles"] = roles
+
+		# Set by ContactPerson.validate on save; bulk_insert bypasses it
+		contact["email_normalized"] = normalize_email(contact["email"])
+		contact["phone_normalized"] = normalize_phone(contact["mobile_phone"])
+
+		return contact, errors
+
+	def insert(self, suppliers, contacts):
+		"""One bulk INSERT per table for the chunk."""
+		self.report["suppliers"] += len(suppliers)
+		self.report["contacts"] += len(contacts)
+		if self.dry_run or not (suppliers or contacts):
+			return
+
+		standard = {
+			"creation": now(),
+			"modified": now(),
+			"owner": frappe.session.user,
+			"modified_by": frappe.session.user,
+		}
+
+		bulk_insert(
+			"Supplier",
+			[
+				{**standard, **{key: value for key, value in supplier.items() if key != "activity_domains"}}
+				for supplier in suppliers.values()
+			],
+		)
+		bulk_insert(
+			"Supplier Activity Domain",
+			[
+				child_row(
+					standard,
+					"Supplier",
+					supplier["name"],
+					"activity_domains",
+					idx,
+					{"activity_domain_category": domain},
+				)
+				for supplier in suppliers.values()
+				for idx, domain in enumerate(supplier["activity_domains"], start=1)
+			],
+		)
+
+		names = reserve_names("Contact Person", len(contacts))
+		for contact, name in zip(contacts, names, strict=True):
+			contact["name"] = name
+		bulk_insert(
+			"Contact Person",
+			[
+				{**standard, **{key: value for key, value in contact.items() if key != "assigned_roles"}}
+				for contact in contacts
+			],
+		)
+		bulk_insert(
+			"Contact Person Role",
+			[
+				child_row(standard, "Contact Person", contact["name"], "assigned_roles", idx, {"role": role})
+				for contact in contacts
+				for idx, role in enumerate(contact["assigned_roles"], start=1)
+			],
+		)
+		index_suppliers(suppliers)
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+
+def load_lookup(doctype, fields):
+	"""Map each lowercased value of fields (and the name) to the document name."""
+	lookup = {}
+	for row in frappe.get_all(doctype, fields=["name", *fields]):
+		for value in (row.name, *(row.get(field) for field in fields)):
+			if value:
+				lookup.setdefault(cstr(value).strip().lower(), row.name)
+	return lookup
+
+
+def child_row(standard, parenttype, parent, parentfield, idx, values):
+	return {
+		**standard,
+		"name": frappe.generate_hash(length=10),
+		"parent": parent,
+		"parenttype": parenttype,
+		"parentfield": parentfield,
+		"idx": idx,
+		**values,
+	}
+
+
+def bulk_insert(doctype, rows):
+	if not rows:
+		return
+	fields = list(rows[0])
+	frappe.db.bulk_insert(doctype, fields, [[row.get(field) for field in fields] for row in rows])
+
+
+def reserve_names(doctype, count):
+	"""
+	Reserve count consecutive names of a DocType's naming series with one counter update.
+
+	The first name comes from frappe's own autoname, which locks the series row
+	(SELECT ... FOR UPDATE) until commit; the rest of the block is then added to
+	the same row. Falls back to one autoname per document if the series row
+	cannot be identified.
+	"""
+	if not count:
+		return []
+
+	autoname = frappe.get_meta(doctype).autoname
+	first = next_name(doctype, autoname)
+	match = re.match(r"^(.*?)(\d+)$", first)
+	if count == 1 or not match:
+		return [first, *(next_name(doctype, autoname) for _ in range(count - 1))]
+
+	prefix, number = match.group(1), match.group(2)
+	start = int(number)
+	for key in (prefix, ""):
+		if frappe.db.sql("select 1 from `tabSeries` where name = %s and current = %s", (key, start)):
+			frappe.db.sql("update `tabSeries` set current = current + %s where name = %s", (count - 1, key))
+			return [f"{prefix}{str(start + offset).zfill(len(number))}" for offset in range(count)]
+
+	return [first, *(next_name(doctype, autoname) for _ in range(count - 1))]
+
+
+def next_name(doctype, autoname):
+	"""One name from a naming series ("CP-.#####") or format ("format:CP-{#####}") autoname."""
+	if autoname.startswith("format:"):
+		# make_autoname only understands naming series
+		return _format_autoname(autoname, frappe.new_doc(doctype))
+	return make_autoname(autoname, doctype)
@@ -0,0 +1,381 @@
+# Copyright (c) 2025, Tzvi and contributors
+# For license information, please see license.txt
+
+"""
+Supplier Directory Search
+
+Every supplier is indexed as normalized tokens in Supplier Search Token, one
+row per token: the words of supplier_name and supplier_id, the phone digits
+and the parts of the email address. A query is split into words the same way
+and each word has to be a prefix of one of the supplier's tokens, so every
+word is a range scan on the (token, supplier) index instead of a
+LIKE '%...%' scan over tabSupplier. A query that is a formatted phone number
+("050-1234567") is searched as one word of its normalized digits.
+
+Hebrew-aware normalization: niqqud and cantillation marks are removed, final
+letters (ך ם ן ף ץ) are folded to their regular forms and geresh, gershayim
+and quotes are dropped, so "צה״ל", 'צה"ל' and "צהל" give the same token.
+Name words starting with the article ה or the conjunction ו are indexed with
+and without that letter.
+
+Facet counts per Activity Domain Category are computed over the text matches
+in the same call.
+
+Usage:
+	from siud.utils.supplier_search import search
+
+	search("חשמל חיפה", domains=["ELEC"])
+
+	# Build the index for all suppliers
+	bench --site <site> execute siud.utils.supplier_search.rebuild_index
+
+	# Benchmark on synthetic suppliers (rolled back)
+	bench --site <site> execute siud.utils.supplier_search.benchmark --kwargs "{'size': 100000}"
+"""
+
+import random
+import re
+import statistics
+import time
+import unicodedata
+
+import frappe
+from frappe.utils import cint, now
+
+from siud.siud.doctype.contact_person.contact_person import normalize_phone
+from siud.utils import cache
+from siud.utils.domain_mask import get_mask, mask_condition
+
+TOKEN_DOCTYPE = "Supplier Search Token"
+INDEXED_FIELDS = ["name", "supplier_id", "supplier_name", "phone", "email"]
+MAX_TOKEN_LENGTH = 140
+MAX_QUERY_WORDS = 5
+MAX_LIMIT = 100
+BATCH_SIZE = 1000
+
+FINAL_LETTERS = str.maketrans("ךםןףץ", "כמנפצ")
+QUOTES = re.compile(r"[\"'`׳״‘’“”]")
+WORDS = re.compile(r"[^\W_]+")
+PHONE_QUERY = re.compile(r"^\+?[\d\s().-]+$")
+MIN_PHONE_DIGITS = 7
+HEBREW_PREFIXES = ("ה", "ו")
+
+
+# =============================================================================
+# Normalization
+# =============================================================================
+
+
+def normalize(text):
+	"""Lowercase, strip marks (niqqud, accents) and quotes, fold Hebrew final letters."""
+	text = unicodedata.normalize("NFKD", text or "")
+	text = "".join(char for char in text if unicodedata.category(char) != "Mn")
+	return QUOTES.sub("", text).translate(FINAL_LETTERS).lower()
+
+
+def tokenize(text):
+	return WORDS.findall(normalize(text))
+
+
+def get_query_words(query):
+	"""
+	Words of a search query; a formatted phone number ("050-123 4567") is one
+	word of its normalized digits, as phones are indexed.
+	"""
+	query = (query or "").strip()
+	if PHONE_QUERY.match(query) and len(re.sub(r"\D", "", query)) >= MIN_PHONE_DIGITS:
+		return [normalize_phone(query)]
+	return tokenize(query)[:MAX_QUERY_WORDS]
+
+
+def get_tokens(supplier):
+	"""
+	Index tokens of one supplier.
+
+	Args:
+		supplier: dict with INDEXED_FIELDS
+
+	Returns:
+		set: Normalized tokens
+	"""
+	tokens = set()
+	for word in tokenize(supplier.get("supplier_name")):
+		tokens.add(word)
+		if len(word) >= 4 and word.startswith(HEBREW_PREFIXES):
+			tokens.add(word[1:])
+
+	supplier_id = tokenize(supplier.get("supplier_id"))
+	tokens.update(supplier_id)
+	if len(supplier_id) > 1:
+		# "SUP-001" is also found as "sup001"
+		tokens.add("".join(supplier_id))
+
+	tokens.update(tokenize(supplier.get("email")))
+	phone = normalize_phone(supplier.get("phone"))
+	if phone:
+		tokens.add(phone)
+
+	return {token[:MAX_TOKEN_LENGTH] for token in tokens}
+
+
+# =============================================================================
+# Indexing
+# =============================================================================
+
+
+def index_suppliers(names):
+	"""Replace the index tokens of the given suppliers (deleted suppliers lose theirs)."""
+	names = list(names)
+	if not names:
+		return
+
+	frappe.db.delete(TOKEN_DOCTYPE, {"supplier": ["in", names]})
+	suppliers = frappe.get_all("Supplier", filters={"name": ["in", names]}, fields=INDEXED_FIELDS)
+
+	timestamp = now()
+	rows = [
+		[frappe.generate_hash(length=12), token, supplier.name, timestamp, timestamp]
+		for supplier in suppliers
+		for token in sorted(get_tokens(supplier))
+	]
+	frappe.db.bulk_insert(
+		TOKEN_DOCTYPE, ["name", "token", "supplier", "creation", "modified"], rows, chunk_size=5000
+	)
+
+
+def rebuild_index():
+	"""Re-index every supplier in batches, committing after each."""
+	frappe.db.delete(TOKEN_DOCTYPE)
+	last = ""
+	count = 0
+	while True:
+		names = frappe.db.sql_list(
+			"select name from `tabSupplier` where name > %s order by name limit %s", (last, BATCH_SIZE)
+		)
+		if not names:
+			break
+		index_suppliers(names)
+		frappe.db.commit()
+		count += len(names)
+		last = names[-1]
+	return count
+
+
+def on_supplier_change(doc, method=None, *args):
+	index_suppliers([doc.name])
+
+
+def on_supplier_trash(doc, method=None, *args):
+	# Runs before frappe's link check, which the token rows would fail
+	frappe.db.delete(TOKEN_DOCTYPE, {"supplier": doc.name})
+
+
+# =============================================================================
+# Search
+# =============================================================================
+
+
+@frappe.whitelist()
+def search_suppliers(query="", domains=None, limit=20, start=0):
+	"""Whitelisted search for the back office; domains may be a JSON list."""
+	frappe.has_permission("Supplier", "read", throw=True)
+	if isinstance(domains, str):
+		domains = frappe.parse_json(domains)
+	return search(query, domains, limit, start)
+
+
+def search(query="", domains=None, limit=20, start=0):
+	"""
+	Find suppliers whose tokens start with every word of the query.
+
+	Args:
+		query: Free text; the first MAX_QUERY_WORDS words are used
+		domains: Activity Domain Category names; results must have at least one
+		limit: Page size (at most MAX_LIMIT)
+		start: Offset
+
+	Returns:
+		dict: {
+			"results": [{"name", "supplier_id", "supplier_name", "phone", "email"}],
+			"total": int,   # Matches including the domain filter
+			"facets": [{"activity_domain_category", "category_name", "count"}]
+				# Over the text matches, ignoring the domain filter, largest first
+		}
+	"""
+	# Words are letters and digits only, so they need no LIKE escaping
+	words = get_query_words(query)
+	values = {f"word{index}": f"{word}%" for index, word in enumerate(words)}
+	values.update({"limit": max(1, min(cint(limit) or 20, MAX_LIMIT)), "start": max(0, cint(start))})
+
+	text_condition = "1 = 1"
+	if words:
+		matches = " union all ".join(
+			f"select distinct supplier, {index} as word from `tab{TOKEN_DOCTYPE}` where token like %(word{index})s"
+			for index in range(len(words))
+		)
+		text_condition = f"""s.name in (
+			select supplier from ({matches}) matches
+			group by supplier having count(*) = {len(words)})"""
+
+	condition = text_condition
+	if domains:
+		condition += " and " + mask_condition(domains, column="s.activity_domain_mask")
+
+	results = frappe.db.sql(
+		f"""select s.name, s.supplier_id, s.supplier_name, s.phone, s.email
+		from `tabSupplier` s
+		where {condition}
+		order by s.supplier_name, s.name
+		limit %(limit)s offset %(start)s""",
+		values,
+		as_dict=True,
+	)
+	total = frappe.db.sql(f"select count(*) from `tabSupplier` s where {condition}", values)[0][0]
+	facets = frappe.db.sql(
+		f"""select ad.activity_domain_category, adc.category_name, count(distinct ad.parent) as count
+		from `tabSupplier Activity Domain` ad
+		join `tabSupplier` s on s.name = ad.parent
+		left join `tabActivity Domain Category` adc on adc.name = ad.activity_domain_category
+		where ad.parenttype = 'Supplier' and {text_condition}
+		group by ad.activity_domain_category, adc.category_name
+		order by count desc, adc.category_name""",
+		values,
+		as_dict=True,
+	)
+
+	return {"results": results, "total": total, "facets": facets}
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+STANDARD_FIELDS = ["creation", "modified", "owner", "modified_by"]
+BENCHMARK_WORDS = [
+	"חשמל",
+	"אינסטלציה",
+	"בניין",
+	"הנדסה",
+	"שירותים",
+	"מערכות",
+	"ייעוץ",
+	"תחזוקה",
+	"ניקיון",
+	"הובלות",
+]
+BENCHMARK_CITIES = ["חיפה", "ירושלים", "תל אביב", "באר שבע", "נתניה", "אשדוד", "עכו", "אילת"]
+
+
+def benchmark(size=100000, runs=20, budget_ms=50):
+	"""
+	Time searches over size synthetic suppliers (rolled back afterwards).
+
+	Returns:
+		dict: {query: {"p50_ms", "p95_ms", "total"}}
+	"""
+	size, runs = int(size), int(runs)
+	rng = random.Random(size)
+	domains = [f"BENCH-D{i}" for i in range(10)]
+	timestamp = now()
+	standard = [timestamp, timestamp, "Administrator", "Administrator"]
+
+	try:
+		start = time.monotonic()
+		for domain in domains:
+			frappe.get_doc(
+				{
+					"doctype": "Activity Domain Category",
+					"category_code": domain,
+					"category_name": f"תחום {domain}",
+				}
+			).insert(ignore_permissions=True)
+		names = [f"BENCH-{i:06d}" for i in range(size)]
+		supplier_domains = {name: rng.sample(domains, 2) for name in names}
+		frappe.db.bulk_insert(
+			"Supplier",
+			[
+				"name",
+				"supplier_id",
+				"supplier_name",
+				"phone",
+				"email",
+				"activity_domain_mask",
+				*STANDARD_FIELDS,
+			],
+			[
+				[
+					name,
+					name,
+					f"{rng.choice(BENCHMARK_WORDS)} {rng.choice(BENCHMARK_WORDS)} {rng.choice(BENCHMARK_CITIES)} {i}",
+					f"05{rng.randrange(10**8):08d}",
+					f"supplier{i}@example.com",
+					get_mask(supplier_domains[name]),
+					*standard,
+				]
+				for i, name in enumerate(names)
+			],
+			chunk_size=5000,
+		)
+		frappe.db.bulk_insert(
+			"Supplier Activity Domain",
+			[
+				"name",
+				"parent",
+				"parenttype",
+				"parentfield",
+				"idx",
+				"activity_domain_category",
+				*STANDARD_FIELDS,
+			],
+			[
+				[
+					frappe.generate_hash(length=12),
+					name,
+					"Supplier",
+					"activity_domains",
+					idx,
+					domain,
+					*standard,
+				]
+				for name in names
+				for idx, domain in enumerate(supplier_domains[name], start=1)
+			],
+			chunk_size=5000,
+		)
+		for offset in range(0, size, BATCH_SIZE):
+			index_suppliers(names[offset : offset + BATCH_SIZE])
+		print(f"Indexed {size} suppliers in {time.monotonic() - start:.1f}s")
+
+		queries = [
+			("חשמל", None),
+			("חשמל חיפה", None),
+			("הנדסה", [domains[0]]),
+			("BENCH-0999", None),
+			("supplier123", None),
+			("05", None),
+		]
+		timings = {}
+		for query, domain_filter in queries:
+			samples = []
+			for _run in range(runs):
+				started = time.monotonic()
+				result = search(query, domain_filter)
+				samples.append((time.monotonic() - started) * 1000)
+			samples.sort()
+			timings[query] = {
+				"p50_ms": round(statistics.median(samples), 1),
+				"p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 1),
+				"total": result["total"],
+			}
+	finally:
+		frappe.db.rollback()
+		# The benchmark categories' bits were cached before the rollback
+		cache.invalidate("reference")
+
+	print(f"{size} suppliers, {runs} runs per query, budget {budget_ms}ms:")
+	for query, timing in timings.items():
+		verdict = "ok" if timing["p95_ms"] <= budget_ms else "SLOW"
+		print(
+			f"  {query:<14} p50 {timing['p50_ms']:>7.1f}ms  p95 {timing['p95_ms']:>7.1f}ms  {timing['total']:>7} matches  {verdict}"
+		)
+	return timings
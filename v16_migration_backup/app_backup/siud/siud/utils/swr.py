@@ -0,0 +1,217 @@
+# Copyright (c) 2025, Tzvi and contributors
+# For license information, please see license.txt
+
+"""
+Stale-While-Revalidate for Whitelisted Methods
+
+	@frappe.whitelist()
+	@stale_while_revalidate(ttl=60, max_stale=600, scope="supplier")
+	def get_inquiry_stats():
+		...
+
+- Fresh (age < ttl): the cached result is returned.
+- Stale (ttl <= age < ttl + max_stale): the stale result is returned and one
+  background job (short queue) recomputes it.
+- Missing or too old: the result is computed synchronously, but only by one
+  caller at a time (single-flight via a Redis lock); concurrent callers wait
+  briefly for that result instead of recomputing it.
+
+Invalidation does not scan Redis: each method keeps a version counter, and
+one per supplier/user, that are part of the cache key. invalidate() increments
+a counter, so later lookups miss and the old entries simply expire.
+
+Per-method TTLs can be overridden in site_config.json:
+
+	"siud_swr": {"siud.api.supplier_portal.get_inquiry_stats": {"ttl": 30, "max_stale": 300}}
+"""
+
+import functools
+import hashlib
+import json
+import time
+
+import frappe
+
+from siud.siud.doctype.supplier.supplier import get_user_identity
+from siud.utils import cache
+from siud.utils.metrics import record_cache_lookup
+
+LOCK_TIMEOUT = 60  # seconds a computation may hold the single-flight lock
+WAIT_TIMEOUT = 5  # seconds a caller waits for another caller's computation
+WAIT_INTERVAL = 0.05
+
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+	return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+SCOPES = {
+	"global": lambda: "*",
+	"user": lambda: frappe.session.user,
+	"supplier": lambda: get_user_identity(frappe.session.user).get("supplier_link"),
+}
+
+# method path: (function, ttl, max_stale, scope)
+_registry = {}
+
+
+def stale_while_revalidate(ttl=60, max_stale=300, scope="supplier"):
+	"""
+	Decorate a whitelisted method with stale-while-revalidate caching.
+
+	Args:
+		ttl: Seconds a result is served as fresh
+		max_stale: Further seconds a result may be served while it is refreshed
+		scope: "supplier", "user" or "global" - whose results are shared
+
+	The decorated function gets an `invalidate(scope_value=None)` attribute that
+	drops all cached results (optionally only for one supplier/user).
+	"""
+
+	def decorator(fn):
+		method = f"{fn.__module__}.{fn.__name__}"
+		_registry[method] = (fn, ttl, max_stale, scope)
+
+		@functools.wraps(fn)
+		def wrapper(*args, **kwargs):
+			scope_value = SCOPES[scope]()
+			if not scope_value:
+				# Let the method raise its own authentication/permission error
+				return fn(*args, **kwargs)
+			return _get_or_compute(method, scope_value, args, kwargs)
+
+		def invalidate(scope_value=None):
+			_bump_version(method, scope_value)
+			if getattr(frappe.local, "db", None):
+				# Again after commit, as a concurrent request may have cached pre-commit data
+				frappe.db.after_commit.add(lambda: _bump_version(method, scope_value))
+
+		wrapper.invalidate = invalidate
+		return wrapper
+
+	return decorator
+
+
+def get_config(method):
+	_fn, ttl, max_stale, _scope = _registry[method]
+	override = (frappe.conf.get("siud_swr") or {}).get(method) or {}
+	return override.get("ttl", ttl), override.get("max_stale", max_stale)
+
+
+def _make_key(method, scope_value, args, kwargs):
+	arguments = json.dumps([args, kwargs], sort_keys=True, default=str)
+	version = ".".join(_get_versions(method, scope_value))
+	return f"{method}|{scope_value}|{version}|{hashlib.sha1(arguments.encode()).hexdigest()}"
+
+
+# =============================================================================
+# Invalidation Versions
+# =============================================================================
+
+
+def _version_key(method, scope_value=None):
+	return frappe.cache.make_key(f"siud_swr_version|{method}|{scope_value or ''}")
+
+
+def _get_versions(method, scope_value):
+	"""
+	Returns:
+		list: The method-wide and the per-scope version (str, "0" if never bumped)
+	"""
+	versions = frappe.cache.mget([_version_key(method), _version_key(method, scope_value)])
+	return [frappe.safe_decode(version) if version else "0" for version in versions]
+
+
+def _bump_version(method, scope_value=None):
+	frappe.cache.incr(_version_key(method, scope_value))
+
+
+def _get_or_compute(method, scope_value, args, kwargs):
+	ttl, max_stale = get_config(method)
+	key = _make_key(method, scope_value, args, kwargs)
+	label = method.rsplit(".", 1)[-1]
+
+	envelope = cache.get("swr", key)
+	if envelope:
+		age = time.time() - envelope["computed_at"]
+		if age < ttl:
+			record_cache_lookup(label, True, tier="fresh")
+			return envelope["value"]
+		if age < ttl + max_stale:
+			record_cache_lookup(label, True, tier="stale")
+			token = _acquire_lock(key)
+			if token:
+				frappe.enqueue(
+					"siud.utils.swr.refresh",
+					queue="short",
+					method_path=method,
+					args=args,
+					kwargs=kwargs,
+					key=key,
+					token=token,
+				)
+			return envelope["value"]
+
+	record_cache_lookup(label, False)
+	token = _acquire_lock(key)
+	if not token:
+		envelope = _wait_for_result(key, ttl)
+		if envelope:
+			return envelope["value"]
+
+	try:
+		return _compute(method, args, kwargs, key)
+	finally:
+		if token:
+			_release_lock(key, token)
+
+
+def _compute(method, args, kwargs, key):
+	fn = _registry[method][0]
+	ttl, max_stale = get_config(method)
+	value = fn(*args, **kwargs)
+	cache.set_value("swr", key, {"value": value, "computed_at": time.time()}, ttl=ttl + max_stale)
+	return value
+
+
+def _wait_for_result(key, ttl):
+	"""Poll for a result computed by the lock holder."""
+	deadline = time.monotonic() + WAIT_TIMEOUT
+	while time.monotonic() < deadline:
+		time.sleep(WAIT_INTERVAL)
+		envelope = cache.get("swr", key)
+		if envelope and time.time() - envelope["computed_at"] < ttl:
+			return envelope
+	return None
+
+
+def refresh(method_path, args, kwargs, key, token):
+	"""Background job: recompute a stale result (runs as the user who enqueued it)."""
+	try:
+		# Importing the method's module registers it in this worker process
+		frappe.get_attr(method_path)
+		_compute(method_path, args, kwargs, key)
+	finally:
+		_release_lock(key, token)
+
+
+# =============================================================================
+# Single-Flight Lock
+# =============================================================================
+
+
+def _lock_key(key):
+	return frappe.cache.make_key(f"siud_swr_lock|{key}")
+
+
+def _acquire_lock(key):
+	token = frappe.generate_hash(length=16)
+	if frappe.cache.set(_lock_key(key), token, nx=True, ex=LOCK_TIMEOUT):
+		return token
+	return None
+
+
+def _release_lock(key, token):
+	frappe.cache.eval(_RELEASE_SCRIPT, 1, _lock_key(key), token)
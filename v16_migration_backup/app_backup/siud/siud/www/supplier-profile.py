@@ -1,6 +1,13 @@
 import frappe
 from frappe import _
 
+from siud.siud.doctype.supplier.supplier import (
+	get_supplier_profile,
+	get_user_identity,
+	patch_supplier_profile,
+)
+
+
 def get_context(context):
 	"""Portal page context for supplier profile"""
 
@@ -9,8 +16,8 @@ def get_context(context):
 		frappe.throw(_("Please log in to access this page"), frappe.PermissionError)
 
 	# Get current user's supplier link
-	user = frappe.get_doc("User", frappe.session.user)
-	supplier_link = user.get("supplier_link")
+	user = frappe._dict(get_user_identity(frappe.session.user))
+	supplier_link = user.supplier_link
 
 	# Add user info for header menu
 	context["user_name"] = user.full_name or user.first_name or frappe.session.user
@@ -27,24 +34,19 @@ def get_context(context):
 	context["user_initials"] = context["user_initials"].upper()
 
 	if not supplier_link:
-		frappe.throw(_("No supplier linked to your account. Please contact the administrator."), frappe.PermissionError)
+		frappe.throw(
+			_("No supplier linked to your account. Please contact the administrator."), frappe.PermissionError
+		)
 
-	# Get supplier details
-	try:
-		supplier = frappe.get_doc("Supplier", supplier_link)
-
-		# Pass supplier data to template
-		context.supplier = {
-			"name": supplier.name,
-			"supplier_id": supplier.supplier_id,
-			"supplier_name": supplier.supplier_name or "",
-			"phone": supplier.phone or "",
-			"email": supplier.email or "",
-			"address": supplier.address or "",
-		}
+	# Get supplier details (cached profile, see get_supplier_profile)
+	supplier = get_supplier_profile(supplier_link)
+	if not supplier:
+		frappe.throw(
+			_("Supplier record not found. Please contact the administrator."), frappe.PermissionError
+		)
 
-	except frappe.DoesNotExistError:
-		frappe.throw(_("Supplier record not found. Please contact the administrator."), frappe.PermissionError)
+	# Pass supplier data to template
+	context.supplier = supplier
 
 	# Page metadata
 	context.title = "פרופיל הספק"
@@ -54,16 +56,15 @@ def get_context(context):
 
 
 @frappe.whitelist()
-def update_supplier_profile(supplier_name, name, phone, email, address):
-	"""Update supplier profile fields via AJAX"""
+def update_supplier_profile(supplier_name, name, phone, email, address, modified=None):
+	"""Update changed supplier profile fields via AJAX; modified is the timestamp the page was rendered with"""
 
 	# Ensure user is logged in
 	if frappe.session.user == "Guest":
 		frappe.throw(_("Please log in to perform this action"), frappe.PermissionError)
 
 	# Get current user's supplier link
-	user = frappe.get_doc("User", frappe.session.user)
-	supplier_link = user.get("supplier_link")
+	supplier_link = get_user_identity(frappe.session.user).get("supplier_link")
 
 	if not supplier_link:
 		frappe.throw(_("No supplier linked to your account"), frappe.PermissionError)
@@ -72,27 +73,25 @@ def update_supplier_profile(supplier_name, name, phone, email, address):
 	if name != supplier_link:
 		frappe.throw(_("You are not authorized to update this supplier profile"), frappe.PermissionError)
 
-	# Get and update supplier
+	# Write only the fields that changed
 	try:
-		supplier = frappe.get_doc("Supplier", name)
-
-		# Update allowed fields only
-		supplier.supplier_name = supplier_name
-		supplier.phone = phone
-		supplier.email = email
-		supplier.address = address
-
-		# Save with permissions check
-		supplier.save(ignore_permissions=False)
+		result = patch_supplier_profile(
+			name,
+			{"supplier_name": supplier_name, "phone": phone, "email": email, "address": address},
+			modified,
+		)
 		frappe.db.commit()
 
 		return {
 			"success": True,
-			"message": _("Profile updated successfully")
+			"message": _("Profile updated successfully"),
+			"modified": result["modified"],
 		}
 
 	except frappe.PermissionError:
 		frappe.throw(_("You do not have permission to update this profile"), frappe.PermissionError)
+	except frappe.ValidationError:
+		raise
 	except Exception as e:
-		frappe.log_error(f"Error updating supplier profile: {str(e)}")
+		frappe.log_error(f"Error updating supplier profile: {e!s}")
 		frappe.throw(_("An error occurred while updating the profile. Please try again."))
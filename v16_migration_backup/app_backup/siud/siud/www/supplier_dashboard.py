@@ -1,6 +1,10 @@
 import frappe
 from frappe import _
 
+from siud.siud.doctype.supplier.supplier import get_user_identity
+from siud.siud.doctype.supplier_inquiry.inquiry_status import CLOSED, OPEN, get_codes
+
+
 def get_context(context):
 	"""Portal page context for supplier dashboard"""
 
@@ -10,8 +14,8 @@ def get_context(context):
 		raise frappe.Redirect()
 
 	# Get current user's supplier link
-	user = frappe.get_doc("User", frappe.session.user)
-	supplier_link = user.get("supplier_link")
+	user = frappe._dict(get_user_identity(frappe.session.user))
+	supplier_link = user.supplier_link
 
 	# Add user info for header menu
 	context["user_name"] = user.full_name or user.first_name or frappe.session.user
@@ -48,21 +52,21 @@ def get_context(context):
 		context["title"] = "Error - Supplier Portal"
 		return
 
-	# Get inquiry statistics
-	total_inquiries = frappe.db.count("Supplier Inquiry", {"supplier_link": supplier_link})
-
-	# Count by status
-	open_statuses = ["פתוחה", "בטיפול", "ממתינה לתגובת ספק"]
-	open_inquiries = frappe.db.count("Supplier Inquiry", {
-		"supplier_link": supplier_link,
-		"inquiry_status": ["in", open_statuses]
-	})
-
-	closed_statuses = ["טופלה", "נסגרה", "נדחתה"]
-	closed_inquiries = frappe.db.count("Supplier Inquiry", {
-		"supplier_link": supplier_link,
-		"inquiry_status": ["in", closed_statuses]
-	})
+	# Get inquiry statistics (one grouped query over the status_code index)
+	counts = dict(
+		frappe.db.sql(
+			"""
+		select status_code, count(*)
+		from `tabSupplier Inquiry`
+		where supplier_link = %s
+		group by status_code
+		""",
+			supplier_link,
+		)
+	)
+	total_inquiries = sum(counts.values())
+	open_inquiries = sum(counts.get(code, 0) for code in get_codes(OPEN))
+	closed_inquiries = sum(counts.get(code, 0) for code in get_codes(CLOSED))
 
 	context["total_inquiries"] = total_inquiries
 	context["open_inquiries"] = open_inquiries
@@ -72,12 +76,13 @@ def get_context(context):
 	recent_inquiries = frappe.get_all(
 		"Supplier Inquiry",
 		filters={"supplier_link": supplier_link},
-		fields=["name", "topic_category", "inquiry_status", "creation", "modified"],
+		fields=["name", "topic_category", "inquiry_status", "status_code", "creation", "modified"],
 		order_by="creation desc",
-		limit=5
+		limit=5,
 	)
 
 	context["recent_inquiries"] = recent_inquiries
+	context["open_status_codes"] = get_codes(OPEN)
 
 	# Page metadata
 	context["title"] = "דף הבית - פורטל ספקים"